@@ -0,0 +1,149 @@
+"""
+Vectorized performance metrics for positions reports.
+
+Money columns (`"-1.24 USD"`) are parsed once with Arrow string kernels; every
+metric after that is NumPy/pandas arithmetic on float columns. All functions
+take an optional `by` column (usually `run_id`, as returned by
+`ResultsStore.load("positions")`) and then compute one row per group, so
+hundreds of runs are summarized in one pass.
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+TRADING_DAYS = 252
+
+
+def parse_money(values: pd.Series) -> pd.Series:
+    """Parse `"1,234.56 USD"`-style strings (or plain numbers) into float64."""
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype("float64")
+    # Arrow compute kernels run in C++; pandas `.str` methods loop in Python
+    strings = pa.array(values, type=pa.string(), from_pandas=True)
+    amounts = pc.list_element(pc.split_pattern(strings, " ", max_splits=1), 0)
+    amounts = pc.replace_substring(pc.replace_substring(amounts, ",", ""), "_", "")
+    return pd.Series(pc.cast(amounts, pa.float64()).to_numpy(zero_copy_only=False), index=values.index)
+
+
+def _group_keys(df: pd.DataFrame, by: str | None):
+    return df[by] if by else np.zeros(len(df), dtype=np.int8)
+
+
+def _unwrap(frame: pd.DataFrame, by: str | None):
+    return frame.iloc[0] if by is None else frame
+
+
+def trade_stats(positions: pd.DataFrame, by: str | None = None) -> pd.DataFrame | pd.Series:
+    """
+    Per-trade aggregates: counts, win rate (%), PnL totals and extremes,
+    average win/loss, profit factor and risk/reward.
+    """
+    pnl = parse_money(positions["realized_pnl"])
+    frame = pd.DataFrame({
+        "pnl": pnl,
+        "win": pnl > 0,
+        "loss": pnl < 0,
+        "gross_profit": pnl.clip(lower=0),
+        "gross_loss": -pnl.clip(upper=0),
+    })
+    grouped = frame.groupby(_group_keys(positions, by))
+    stats = grouped.agg(
+        trades=("pnl", "size"),
+        wins=("win", "sum"),
+        losses=("loss", "sum"),
+        total_pnl=("pnl", "sum"),
+        avg_pnl=("pnl", "mean"),
+        best_trade=("pnl", "max"),
+        worst_trade=("pnl", "min"),
+        gross_profit=("gross_profit", "sum"),
+        gross_loss=("gross_loss", "sum"),
+    )
+    stats["win_rate"] = stats["wins"] / stats["trades"] * 100
+    stats["avg_win"] = stats["gross_profit"] / stats["wins"].replace(0, np.nan)
+    stats["avg_loss"] = stats["gross_loss"] / stats["losses"].replace(0, np.nan)
+    stats["profit_factor"] = stats["gross_profit"] / stats["gross_loss"].replace(0, np.nan)
+    stats["risk_reward"] = stats["avg_win"] / stats["avg_loss"]
+    return _unwrap(stats, by)
+
+
+def activity_stats(positions: pd.DataFrame, starting_balance: float, by: str | None = None) -> pd.DataFrame | pd.Series:
+    """
+    Exposure: share of the traded period with an open position.
+    Turnover: traded notional (open + close legs) over the starting balance.
+    """
+    opened = pd.to_datetime(positions["ts_opened"], utc=True).astype("int64")
+    closed = pd.to_datetime(positions["ts_closed"], utc=True)
+    closed = closed.fillna(closed.max()).astype("int64")
+    qty = parse_money(positions["peak_qty"])
+    frame = pd.DataFrame({
+        "opened": opened,
+        "closed": closed,
+        "held": closed - opened,
+        "notional": qty * (positions["avg_px_open"].astype("float64") + positions["avg_px_close"].fillna(0).astype("float64")),
+    })
+    grouped = frame.groupby(_group_keys(positions, by))
+    stats = grouped.agg(start=("opened", "min"), end=("closed", "max"), held=("held", "sum"), notional=("notional", "sum"))
+    span = (stats["end"] - stats["start"]).replace(0, np.nan)
+    stats = pd.DataFrame({
+        "exposure": (stats["held"] / span).clip(upper=1.0),
+        "turnover": stats["notional"] / starting_balance,
+    })
+    return _unwrap(stats, by)
+
+
+def equity_curve(positions: pd.DataFrame, starting_balance: float, by: str | None = None) -> pd.DataFrame:
+    """Realized equity after every position close, as `[by,] ts, equity` rows."""
+    closed = positions[positions["ts_closed"].notna()]
+    curve = pd.DataFrame({
+        "ts": pd.to_datetime(closed["ts_closed"], utc=True),
+        "pnl": parse_money(closed["realized_pnl"]),
+    })
+    if by:
+        curve.insert(0, by, closed[by])
+    curve = curve.sort_values([by, "ts"] if by else "ts", kind="stable")
+    keys = curve[by] if by else np.zeros(len(curve), dtype=np.int8)
+    curve["equity"] = starting_balance + curve["pnl"].groupby(keys).cumsum()
+    return curve.drop(columns="pnl").reset_index(drop=True)
+
+
+def equity_stats(equity: pd.Series, starting_balance: float | None = None, periods: int = TRADING_DAYS) -> pd.Series:
+    """
+    Sharpe, Sortino (annualized from daily returns), max drawdown and total
+    return of an equity series indexed by timestamp. `starting_balance`, if
+    given, is the equity before the first point.
+    """
+    daily = equity.resample("1D").last().ffill().to_numpy()
+    values = equity.to_numpy()
+    if starting_balance is not None:
+        daily = np.concatenate([[starting_balance], daily])
+        values = np.concatenate([[starting_balance], values])
+    if len(values) == 0:
+        return pd.Series({"sharpe": np.nan, "sortino": np.nan, "max_drawdown": np.nan, "total_return": np.nan})
+
+    returns = np.diff(daily) / daily[:-1]
+    mean = returns.mean() if len(returns) else np.nan
+    std = returns.std(ddof=1) if len(returns) > 1 else np.nan
+    downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2)) if len(returns) else np.nan
+    drawdown = values / np.maximum.accumulate(values) - 1
+    return pd.Series({
+        "sharpe": mean / std * np.sqrt(periods) if std else np.nan,
+        "sortino": mean / downside * np.sqrt(periods) if downside else np.nan,
+        "max_drawdown": drawdown.min(),
+        "total_return": values[-1] / values[0] - 1,
+    })
+
+
+def run_metrics(positions: pd.DataFrame, starting_balance: float, by: str | None = None) -> pd.DataFrame | pd.Series:
+    """Trade, activity and equity-curve metrics, one row per `by` group."""
+    trades = trade_stats(positions, by)
+    activity = activity_stats(positions, starting_balance, by)
+
+    curve = equity_curve(positions, starting_balance, by)
+    if by:
+        equity = curve.groupby(by)[["ts", "equity"]].apply(
+            lambda g: equity_stats(g.set_index("ts")["equity"], starting_balance)
+        )
+        return pd.concat([trades, activity, equity], axis=1)
+    equity = equity_stats(curve.set_index("ts")["equity"], starting_balance)
+    return pd.concat([trades, activity, equity])
@@ -0,0 +1,197 @@
+"""
+Append-only store for backtest reports and statistics.
+
+Each run appends its reports to one parquet dataset per report type, hive
+partitioned by the hash of the strategy config and tagged with the run id:
+
+    <root>/positions/config_hash=<hash>/<run_id>.parquet
+    <root>/fills/...
+    <root>/stats/...
+    <root>/index.parquet      one row per run
+
+Comparing many runs is a single dataset scan, optionally filtered by
+`config_hash` or `run_id`, instead of reopening per-run folders.
+"""
+import hashlib
+import json
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from nautilus_trader.backtest.config import BacktestRunConfig
+from nautilus_trader.backtest.engine import BacktestEngine
+from nautilus_trader.backtest.results import BacktestResult
+from nautilus_trader.model import Venue
+
+try:
+    import fcntl
+except ImportError:  # Windows: the index then assumes a single writer
+    fcntl = None
+
+INDEX_NAME = "index.parquet"
+
+
+def config_hash(config: BacktestRunConfig) -> str:
+    """Stable short hash of the strategy part of a run config."""
+    strategies = [json.loads(s.json()) for s in config.engine.strategies]
+    payload = json.dumps(strategies, sort_keys=True).encode()
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def _to_cell(value):
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return ", ".join(map(str, value))
+    return str(value)
+
+
+def normalize_report(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Make a nautilus report parquet-friendly.
+
+    The index (if any) becomes a column and object columns (which mix strings, lists of
+    money strings and dicts) become plain strings, so every run has the same
+    schema for the same report.
+    """
+    if df.index.name is not None or not isinstance(df.index, pd.RangeIndex):
+        df = df.reset_index(names=df.index.name or "ts_event")
+    for column in df.columns[df.dtypes == object]:
+        df[column] = df[column].map(_to_cell).astype("string")
+    return df
+
+
+def flatten_stats(result: BacktestResult, general: dict | None = None) -> dict:
+    """One flat row from the per-currency PnL stats, return stats and general stats."""
+    row = {}
+    for currency, stats in result.stats_pnls.items():
+        row.update({f"{currency} {name}": value for name, value in stats.items()})
+    row.update(result.stats_returns)
+    row.update(general or {})
+    return row
+
+
+def generate_reports(engine: BacktestEngine, venue: Venue = Venue("SIM")) -> dict[str, pd.DataFrame]:
+    """All trader reports of a finished engine, by store dataset name."""
+    trader = engine.trader
+    return {
+        "positions": trader.generate_positions_report(),
+        "order_fills": trader.generate_order_fills_report(),
+        "fills": trader.generate_fills_report(),
+        "orders": trader.generate_orders_report(),
+        "account": trader.generate_account_report(venue),
+    }
+
+
+@contextmanager
+def _locked(path: Path):
+    with open(path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+
+class ResultsStore:
+    """Partitioned parquet datasets of run reports with a compact run index."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / INDEX_NAME
+
+    def write_run(
+        self,
+        config: BacktestRunConfig,
+        engine: BacktestEngine,
+        result: BacktestResult,
+        venue: Venue = Venue("SIM"),
+    ) -> str:
+        """Append all reports and stats of a finished run; returns its run id."""
+        stats = flatten_stats(result, engine.portfolio.analyzer.get_performance_stats_general())
+        return self.append(config, result, generate_reports(engine, venue), stats)
+
+    def append(self, config: BacktestRunConfig, result: BacktestResult, reports: dict[str, pd.DataFrame], stats: dict) -> str:
+        """Append already generated reports and a flat stats row for one run."""
+        run_id = str(result.run_id)
+        chash = config_hash(config)
+
+        for name, df in reports.items():
+            if not df.empty:
+                self._write(name, normalize_report(df), run_id, chash)
+        self._write("stats", pd.DataFrame([stats]), run_id, chash)
+
+        strategy = config.engine.strategies[0]
+        self._append_index({
+            "run_id": run_id,
+            "config_hash": chash,
+            "run_config_id": config.id,
+            "strategy_path": strategy.strategy_path,
+            "strategy_config": json.dumps(json.loads(strategy.json())["config"], sort_keys=True),
+            "backtest_start": pd.Timestamp(result.backtest_start, tz="UTC") if result.backtest_start else pd.NaT,
+            "backtest_end": pd.Timestamp(result.backtest_end, tz="UTC") if result.backtest_end else pd.NaT,
+            "run_started": pd.Timestamp(result.run_started, tz="UTC") if result.run_started else pd.NaT,
+            "iterations": result.iterations,
+            "total_orders": result.total_orders,
+            "total_positions": result.total_positions,
+        })
+        return run_id
+
+    def _write(self, name: str, df: pd.DataFrame, run_id: str, chash: str):
+        df = df.assign(run_id=run_id)
+        directory = self.root / name / f"config_hash={chash}"
+        directory.mkdir(parents=True, exist_ok=True)
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), directory / f"{run_id}.parquet")
+
+    def _append_index(self, row: dict):
+        with _locked(self.root / ".index.lock"):
+            index = pd.concat([self.index(), pd.DataFrame([row])], ignore_index=True)
+            tmp = self.index_path.with_suffix(".tmp")
+            index.to_parquet(tmp, index=False)
+            tmp.replace(self.index_path)
+
+    def index(self) -> pd.DataFrame:
+        """All recorded runs, one row each."""
+        if not self.index_path.exists():
+            return pd.DataFrame()
+        return pd.read_parquet(self.index_path)
+
+    def load(
+        self,
+        name: str,
+        config_hash: str | list[str] | None = None,
+        run_ids: list[str] | None = None,
+        columns: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Scan one report (or `stats`) across runs.
+
+        Filters are pushed down to the partition and row-group level, so only
+        the matching files are read.
+        """
+        path = self.root / name
+        if not path.exists():
+            return pd.DataFrame()
+
+        dataset = ds.dataset(path, format="parquet", partitioning="hive")
+        # Runs may differ in columns (e.g. extra currencies in stats)
+        schema = pa.unify_schemas(
+            [f.physical_schema for f in dataset.get_fragments()] + [pa.schema([("config_hash", pa.string())])],
+            promote_options="permissive",
+        )
+        dataset = ds.dataset(path, schema=schema, format="parquet", partitioning="hive")
+
+        flt = None
+        if config_hash is not None:
+            hashes = [config_hash] if isinstance(config_hash, str) else config_hash
+            flt = ds.field("config_hash").isin(hashes)
+        if run_ids is not None:
+            by_run = ds.field("run_id").isin(run_ids)
+            flt = by_run if flt is None else flt & by_run
+        return dataset.to_table(columns=columns, filter=flt).to_pandas()
@@ -0,0 +1,356 @@
+"""
+Backtest throughput benchmarks with regression tracking.
+
+Generates a synthetic EUR/USD quote-tick and 1-minute bar catalog of the
+requested size (once, under `parquet_in/benchmark-<ticks>t-<bars>b`) and times:
+
+    macd_node       MACDStrategy on ticks through BacktestNode (catalog -> engine)
+    macd_node_exec  macd_node with the execution models installed (see
+                    backtests.execution) but a zero `EXEC_PROFILE`, so both
+                    cases send the same orders and differ only in model cost
+    macd_node_vps   macd_node with the `VPS_PROFILE` execution profile: sampled
+                    latency, queue and slippage all active, so its order count
+                    is reported next to its throughput
+    macd_engine     MACDStrategy on ticks through a bare BacktestEngine
+    sma_engine      SMACross on bars through a bare BacktestEngine
+
+Every case runs in a fresh process so peak RSS is its own. Reported per case:
+wall time, catalog read time, data points (ticks or bars) per second of engine
+run time and peak RSS. The fastest of `--repeat` runs is kept.
+
+Results are written as JSON. With `--baseline` the run is compared against an
+earlier result file and the command exits non-zero if any metric regressed by
+more than `--tolerance`:
+
+    python -m backtests.benchmark --ticks 1000000 --bars 100000 --output bench.json
+    python -m backtests.benchmark --baseline bench.json --output bench-new.json
+"""
+import argparse
+import json
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+
+import nautilus_trader
+from nautilus_trader.backtest.config import BacktestDataConfig
+from nautilus_trader.backtest.engine import BacktestEngine
+from nautilus_trader.backtest.engine import BacktestEngineConfig
+from nautilus_trader.backtest.node import BacktestNode
+from nautilus_trader.config import LoggingConfig
+from nautilus_trader.model import QuoteTick
+from nautilus_trader.model.currencies import USD
+from nautilus_trader.model.data import Bar
+from nautilus_trader.model.enums import AccountType
+from nautilus_trader.model.enums import OmsType
+from nautilus_trader.model.identifiers import Venue
+from nautilus_trader.model.objects import Money
+from nautilus_trader.persistence.catalog.types import CatalogDataResult
+from nautilus_trader.persistence.wranglers import BarDataWrangler
+from nautilus_trader.persistence.wranglers import QuoteTickDataWrangler
+
+from catalog.bars import bar_type
+from catalog.ingest import CHUNK_SIZE, fx_instrument
+from configs.backtest import get_backtest_config
+from configs.execution import EXECUTION_PROFILES, ExecutionProfile
+from configs.macd import MACDConfig
+from configs.parquet_data import ParquetConfig, PARQUET_DATA
+from strategies.macd import MACDStrategy
+from strategies.sma_cross import SMACross
+
+BENCH_LOGGING = LoggingConfig(log_level="ERROR")
+SYMBOL = "EURUSD"
+START = "2020-01-01"
+TOLERANCE = 0.10
+# Lower is better for all metrics except throughput
+METRICS = {"ticks_per_sec": 1, "wall_s": -1, "catalog_read_s": -1, "peak_rss_mb": -1}
+# Timing differences below this are noise, whatever the relative change
+MIN_SECONDS = 0.05
+# Profile of the macd_node_exec case: no latency, queue or slippage, so the
+# order flow matches macd_node and only the models' own cost shows
+EXEC_PROFILE = ExecutionProfile()
+# Profile of the macd_node_vps case: every model does work on each order
+VPS_PROFILE = "vps"
+
+
+def _random_walk(rng: np.random.Generator, n: int, start: float) -> np.ndarray:
+    return start + np.round(np.cumsum(rng.normal(0, 0.00003, n)), 5)
+
+
+def make_catalog(ticks: int, bars: int, seed: int = 42) -> ParquetConfig:
+    """Create (or reuse) a synthetic catalog with `ticks` quotes and `bars` 1-minute MID bars."""
+    data = ParquetConfig(PARQUET_DATA, f"benchmark-{ticks}t-{bars}b")
+    instrument = fx_instrument(SYMBOL)
+    bt = bar_type(instrument.id, "1m")
+    if data.catalog.get_intervals(QuoteTick, str(instrument.id)) and data.catalog.get_intervals(Bar, str(bt)):
+        return data
+
+    data.catalog.write_data([instrument])
+    rng = np.random.default_rng(seed)
+    wrangler = QuoteTickDataWrangler(instrument)
+    # Written in chunks so generating a large catalog stays in bounded memory
+    last = 1.12
+    for offset in range(0, ticks, CHUNK_SIZE):
+        n = min(CHUNK_SIZE, ticks - offset)
+        mid = _random_walk(rng, n, last)
+        last = mid[-1]
+        index = pd.date_range(START, periods=n, freq="1s", tz="UTC") + pd.Timedelta(seconds=offset)
+        df = pd.DataFrame({"bid_price": mid - 0.00001, "ask_price": mid + 0.00001, "size": 1_000_000.0}, index=index)
+        data.catalog.write_data(wrangler.process(df))
+
+    close = _random_walk(rng, bars, 1.12)
+    spread = np.abs(rng.normal(0, 0.0001, bars))
+    open_ = np.r_[close[0], close[:-1]]
+    df = pd.DataFrame(
+        {
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": 1_000_000.0,
+        },
+        index=pd.date_range(START, periods=bars, freq="1min", tz="UTC") + pd.Timedelta(minutes=1),
+    )
+    data.catalog.write_data(BarDataWrangler(bt, instrument).process(df))
+    return data
+
+
+class TimedNode(BacktestNode):
+    """BacktestNode that records how long loading its data configs from the catalog took."""
+
+    read_seconds = 0.0
+
+    @classmethod
+    def load_data_config(
+        cls,
+        config: BacktestDataConfig,
+        start: str | int | None = None,
+        end: str | int | None = None,
+    ) -> CatalogDataResult:
+        t0 = time.perf_counter()
+        result = super().load_data_config(config, start, end)
+        cls.read_seconds += time.perf_counter() - t0
+        return result
+
+
+def _engine() -> BacktestEngine:
+    engine = BacktestEngine(BacktestEngineConfig(logging=BENCH_LOGGING))
+    engine.add_venue(
+        venue=Venue("SIM"),
+        oms_type=OmsType.NETTING,
+        account_type=AccountType.MARGIN,
+        starting_balances=[Money(1_000_000, USD)],
+        base_currency=USD,
+    )
+    return engine
+
+
+def _macd_node(data: ParquetConfig, execution=None) -> dict:
+    instrument = fx_instrument(SYMBOL)
+    config = get_backtest_config(
+        data, data, instrument_id=instrument.id, end_time=None, logging=BENCH_LOGGING, execution=execution
+    )
+    node = TimedNode(configs=[config])
+    result = node.run()[0]
+    node.dispose()
+    return {
+        "iterations": result.iterations,
+        "total_orders": result.total_orders,
+        "catalog_read_s": TimedNode.read_seconds,
+    }
+
+
+def _macd_node_exec(data: ParquetConfig) -> dict:
+    return _macd_node(data, EXEC_PROFILE)
+
+
+def _macd_node_vps(data: ParquetConfig) -> dict:
+    return _macd_node(data, EXECUTION_PROFILES[VPS_PROFILE])
+
+
+def _macd_engine(data: ParquetConfig) -> dict:
+    instrument = fx_instrument(SYMBOL)
+    t0 = time.perf_counter()
+    ticks = data.catalog.query(QuoteTick, identifiers=[str(instrument.id)])
+    read = time.perf_counter() - t0
+
+    engine = _engine()
+    engine.add_instrument(instrument)
+    engine.add_data(ticks)
+    engine.add_strategy(MACDStrategy(MACDConfig(instrument_id=instrument.id)))
+    engine.run()
+    result = engine.get_result()
+    engine.dispose()
+    return {"iterations": result.iterations, "catalog_read_s": read}
+
+
+def _sma_engine(data: ParquetConfig) -> dict:
+    instrument = fx_instrument(SYMBOL)
+    bt = bar_type(instrument.id, "1m")
+    t0 = time.perf_counter()
+    bars = data.catalog.query(Bar, identifiers=[str(bt)])
+    read = time.perf_counter() - t0
+
+    engine = _engine()
+    engine.add_instrument(instrument)
+    engine.add_data(bars)
+    engine.add_strategy(SMACross(bt))
+    engine.run()
+    result = engine.get_result()
+    engine.dispose()
+    return {"iterations": result.iterations, "catalog_read_s": read}
+
+
+CASES = {
+    "macd_node": _macd_node,
+    "macd_node_exec": _macd_node_exec,
+    "macd_node_vps": _macd_node_vps,
+    "macd_engine": _macd_engine,
+    "sma_engine": _sma_engine,
+}
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss survives fork + exec, so a spawned worker would report its
+    # parent's peak; VmHWM belongs to this address space only
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return rss / 1024**2 if sys.platform == "darwin" else rss / 1024
+
+
+def run_case(name: str, catalog_path: str) -> dict:
+    """Run one benchmark case in the current process and return its metrics."""
+    data = ParquetConfig(*catalog_path.rsplit("/", 1))
+    t0 = time.perf_counter()
+    try:
+        row = CASES[name](data)
+    except Exception as e:
+        return {"error": repr(e)}
+    wall = time.perf_counter() - t0
+
+    run = wall - row["catalog_read_s"]
+    return {
+        **row,
+        "wall_s": wall,
+        "run_s": run,
+        "ticks_per_sec": row["iterations"] / run if run > 0 else None,
+        "peak_rss_mb": _peak_rss_mb(),
+        "error": None,
+    }
+
+
+def run_benchmarks(data: ParquetConfig, cases: list[str], repeat: int = 1) -> dict[str, dict]:
+    """Run every case `repeat` times, each in a fresh process, keeping the fastest run."""
+    results = {}
+    for name in cases:
+        runs = []
+        for _ in range(repeat):
+            # A new spawned process per run: isolated RSS and no warm caches
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                runs.append(pool.submit(run_case, name, str(data.path)).result())
+        ok = [r for r in runs if r["error"] is None]
+        if not ok:
+            results[name] = runs[-1]
+            continue
+        best = min(ok, key=lambda r: r["wall_s"])
+        results[name] = {**best, "peak_rss_mb": max(r["peak_rss_mb"] for r in ok), "runs": len(ok)}
+    return results
+
+
+def compare(current: dict, baseline: dict, tolerance: float = TOLERANCE) -> list[str]:
+    """Describe every metric of `current` that is worse than `baseline` by more than `tolerance`."""
+    regressions = []
+    for name, base in baseline["cases"].items():
+        now = current["cases"].get(name)
+        if now is None or base.get("error"):
+            continue
+        if now.get("error"):
+            regressions.append(f"{name}: failed ({now['error']})")
+            continue
+        for metric, direction in METRICS.items():
+            old, new = base.get(metric), now.get(metric)
+            if not old or new is None:
+                continue
+            if metric.endswith("_s") and abs(new - old) < MIN_SECONDS:
+                continue
+            change = (new - old) / old * direction
+            if change < -tolerance:
+                regressions.append(f"{name}: {metric} {old:.4g} -> {new:.4g} ({change:+.1%})")
+    return regressions
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Backtest throughput benchmarks")
+    parser.add_argument("--ticks", type=int, default=1_000_000, help="synthetic quote ticks")
+    parser.add_argument("--bars", type=int, default=100_000, help="synthetic 1-minute bars")
+    parser.add_argument("--cases", nargs="+", default=list(CASES), choices=list(CASES))
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--baseline", help="earlier result file to compare against")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="allowed relative slowdown, e.g. 0.1")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    data = make_catalog(args.ticks, args.bars)
+    print(f"Catalog {data.path} ready in {time.perf_counter() - t0:.1f}s")
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "ticks": args.ticks,
+            "bars": args.bars,
+            "python": platform.python_version(),
+            "nautilus_trader": nautilus_trader.__version__,
+            "machine": platform.platform(),
+        },
+        "cases": run_benchmarks(data, args.cases, args.repeat),
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(pd.DataFrame(report["cases"]).T.to_string())
+    plain = report["cases"].get("macd_node")
+    if plain and not plain["error"]:
+        print()
+        for name, label in (("macd_node_exec", "Execution models"), ("macd_node_vps", f"Profile {VPS_PROFILE!r}")):
+            case = report["cases"].get(name)
+            if not case or case["error"]:
+                continue
+            change = case["ticks_per_sec"] / plain["ticks_per_sec"] - 1
+            print(
+                f"{label}: {change:+.1%} ticks/sec against macd_node, "
+                f"{case['total_orders']} orders against {plain['total_orders']}"
+            )
+    print(f"\nResults written to {args.output}")
+
+    failed = [name for name, case in report["cases"].items() if case["error"]]
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if (baseline["meta"]["ticks"], baseline["meta"]["bars"]) != (args.ticks, args.bars):
+            sys.exit(f"Baseline {args.baseline} was recorded with different --ticks/--bars")
+        regressions = compare(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    if failed:
+        sys.exit(f"Failed cases: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Content-addressed cache of finished backtests.
+
+The key is the hash of the serialized `BacktestRunConfig` combined with a
+fingerprint of the catalog files the run reads: every parquet file of the
+configured data type and instruments whose time range intersects the data
+config window, identified by name, size and mtime. If neither changed, the
+stored reports and stats are returned without building an engine.
+
+Entries live in `<root>/<key>/`. Hits refresh the entry's mtime; when the
+cache grows past `max_bytes` the least recently used entries are deleted.
+"""
+import dataclasses
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from nautilus_trader.backtest.config import BacktestDataConfig
+from nautilus_trader.backtest.config import BacktestRunConfig
+from nautilus_trader.backtest.node import BacktestNode
+from nautilus_trader.backtest.node import get_instrument_ids
+from nautilus_trader.backtest.results import BacktestResult
+from nautilus_trader.core.datetime import dt_to_unix_nanos
+from nautilus_trader.model import Venue
+from nautilus_trader.persistence.funcs import class_to_filename
+from nautilus_trader.persistence.funcs import urisafe_identifier
+
+from analytics.results import flatten_stats, generate_reports, normalize_report
+
+MAX_BYTES = 2 * 1024**3
+RESULT_FILE = "result.json"
+STATS_FILE = "stats.json"
+
+
+@dataclass
+class CachedRun:
+    result: BacktestResult
+    reports: dict[str, pd.DataFrame]
+    stats: dict
+    hit: bool = False
+
+
+def _file_interval(path: Path) -> tuple[int, int] | None:
+    # Catalog files are named `<start>_<end>.parquet`, e.g. 2020-01-01T00-00-00-000000000Z
+    try:
+        start, end = path.stem.split("_")
+        return tuple(
+            pd.Timestamp(f"{ts[:10]}T{ts[11:19].replace('-', ':')}.{ts[20:29]}", tz="UTC").value
+            for ts in (start, end)
+        )
+    except ValueError:
+        return None
+
+
+def _identifiers(config: BacktestDataConfig) -> list[str]:
+    if config.bar_types:
+        return [str(b) for b in config.bar_types]
+    if config.bar_spec:
+        return [f"{i}-{config.bar_spec}-EXTERNAL" for i in get_instrument_ids(config)]
+    return [str(i) for i in get_instrument_ids(config)]
+
+
+def _stat_line(path: Path, root: Path) -> bytes:
+    stat = path.stat()
+    return f"{path.relative_to(root)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode()
+
+
+def data_fingerprint(config: BacktestRunConfig) -> str:
+    """Hash of name, size and mtime of every catalog file the run's data configs touch."""
+    digest = hashlib.sha256()
+    for data_config in config.data:
+        # Instrument definitions (fees, precisions) affect results too
+        data_root = Path(data_config.catalog_path) / "data"
+        for instrument_id in get_instrument_ids(data_config):
+            for path in sorted(data_root.glob(f"*/{urisafe_identifier(str(instrument_id))}/*.parquet")):
+                if path.parent.parent.name != class_to_filename(data_config.data_type):
+                    digest.update(_stat_line(path, data_root))
+
+        start = dt_to_unix_nanos(data_config.start_time) if data_config.start_time else None
+        end = dt_to_unix_nanos(data_config.end_time) if data_config.end_time else None
+
+        root = data_root / class_to_filename(data_config.data_type)
+        directories = [root / urisafe_identifier(i) for i in _identifiers(data_config)] or [root]
+        for directory in directories:
+            for path in sorted(directory.rglob("*.parquet")):
+                interval = _file_interval(path)
+                if interval is not None:
+                    if (start is not None and interval[1] < start) or (end is not None and interval[0] > end):
+                        continue
+                digest.update(_stat_line(path, data_root))
+    return digest.hexdigest()
+
+
+def cache_key(config: BacktestRunConfig) -> str:
+    return hashlib.sha256(f"{config.id}:{data_fingerprint(config)}".encode()).hexdigest()
+
+
+class ResultCache:
+    """On-disk LRU cache of run results keyed by `cache_key`."""
+
+    def __init__(self, root: str | Path, max_bytes: int = MAX_BYTES):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def get(self, key: str) -> CachedRun | None:
+        entry = self.root / key
+        if not (entry / RESULT_FILE).exists():
+            return None
+
+        result = BacktestResult(**json.loads((entry / RESULT_FILE).read_text()))
+        stats = json.loads((entry / STATS_FILE).read_text())
+        reports = {path.stem: pd.read_parquet(path) for path in entry.glob("*.parquet")}
+        # Touch on access: eviction drops the least recently used entries
+        os.utime(entry)
+        return CachedRun(result=result, reports=reports, stats=stats, hit=True)
+
+    def put(self, key: str, run: CachedRun):
+        # Build the entry next to its final place and rename, so readers never see half of it
+        tmp = self.root / f".{key}.{uuid.uuid4().hex}"
+        tmp.mkdir()
+        (tmp / RESULT_FILE).write_text(json.dumps(dataclasses.asdict(run.result)))
+        (tmp / STATS_FILE).write_text(json.dumps(run.stats))
+        for name, df in run.reports.items():
+            df.to_parquet(tmp / f"{name}.parquet", index=False)
+
+        try:
+            tmp.rename(self.root / key)
+        except OSError:
+            # Another process cached the same run first
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.evict()
+
+    def size(self) -> int:
+        return sum(f.stat().st_size for f in self.root.rglob("*") if f.is_file())
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits `max_bytes`."""
+        entries = []
+        for entry in self.root.iterdir():
+            if entry.is_dir() and not entry.name.startswith("."):
+                size = sum(f.stat().st_size for f in entry.iterdir())
+                entries.append((entry.stat().st_mtime_ns, size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+
+def collect_run(engine, result: BacktestResult, venue: Venue = Venue("SIM")) -> CachedRun:
+    """Generate the (normalized) reports and stats of a finished engine."""
+    reports = {name: normalize_report(df) for name, df in generate_reports(engine, venue).items()}
+    stats = flatten_stats(result, engine.portfolio.analyzer.get_performance_stats_general())
+    return CachedRun(result=result, reports=reports, stats=stats)
+
+
+def run_cached(
+    config: BacktestRunConfig,
+    cache: ResultCache | None,
+    node_cls: type[BacktestNode] = BacktestNode,
+) -> CachedRun:
+    """Return the cached run for `config`, or run it with `node_cls` and cache it."""
+    key = cache_key(config) if cache is not None else None
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    node = node_cls(configs=[config])
+    results = node.run()
+    if not results:
+        node.dispose()
+        raise RuntimeError(f"Backtest {config.id} produced no result")
+    run = collect_run(node.get_engine(config.id), results[0])
+    node.dispose()
+
+    if cache is not None:
+        cache.put(key, run)
+    return run
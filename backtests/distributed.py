@@ -0,0 +1,444 @@
+"""
+Parameter sweeps spread over several hosts.
+
+A coordinator splits the sweep into shards of `--shard-size` runs and serves
+them over TCP (one JSON object per line, as in `backtests.jobserver`). Workers
+pull a shard, run it against their own copy of the catalog
+(`parquet_in/<catalog>` on the worker host), push back one summary row per run
+and pull the next shard. Only requests and summary rows cross the network.
+
+A worker leases its shard. If its connection drops (process or host died) or
+the lease expires, the shard goes back to the queue and another worker runs
+it, up to `--attempts` times. After that its runs are reported with an error.
+A late push of a shard that was already completed elsewhere is ignored.
+
+    # on the coordinator host
+    python -m backtests.distributed coordinate --strategy sma --lhs 400 \\
+        --range fast_period=4:30 --range slow_period=10:120 --host 0.0.0.0
+    # on every backtest server, with the catalog synced beforehand
+    python -m backtests.distributed work --host coordinator.lan --processes 8
+
+With `--local-workers N` the coordinator starts N workers on localhost
+itself, which stands in for the servers on a single box.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import socket
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import pandas as pd
+
+from backtests.jobserver import build_config, normalize_request
+from backtests.sweep import _parse_ranges, _parse_values, _run_point, grid, latin_hypercube, random_sample, valid_periods
+
+HOST = "127.0.0.1"
+PORT = 8766
+SHARD_SIZE = 8
+MAX_ATTEMPTS = 3
+# Covers hung workers and hosts lost without a connection reset
+LEASE_SECONDS = 1800.0
+POLL_SECONDS = 1.0
+CONNECT_SECONDS = 30.0
+
+STRATEGIES = {
+    "macd": ("strategies.macd:MACDStrategy", "configs.macd:MACDConfig"),
+    "sma": ("strategies.sma_cross:SMACross", "configs.sma:SMACrossConfig"),
+}
+
+
+def sweep_requests(
+    points: list[dict],
+    strategy: str = "macd",
+    catalog: str = "data",
+    instrument_id: str | None = None,
+    start: str | None = None,
+    end: str | None = "2020-01-10",
+) -> list[dict]:
+    """One job server style request per parameter point."""
+    strategy_path, config_path = STRATEGIES[strategy]
+    return [
+        normalize_request({
+            "strategy_path": strategy_path,
+            "config_path": config_path,
+            "config": point,
+            "catalog": catalog,
+            "instrument_id": instrument_id,
+            "start": start,
+            "end": end,
+        })
+        for point in points
+    ]
+
+
+class ShardBook:
+    """Shards of one sweep with their leases, attempts and results."""
+
+    def __init__(self, size: int, shard_size: int = SHARD_SIZE, max_attempts: int = MAX_ATTEMPTS):
+        self.shards = {n: list(range(lo, min(lo + shard_size, size))) for n, lo in enumerate(range(0, size, shard_size))}
+        self.max_attempts = max_attempts
+        self.pending = deque(self.shards)
+        # Shard id -> (worker, lease deadline)
+        self.leases: dict[int, tuple[str, float]] = {}
+        self.attempts = dict.fromkeys(self.shards, 0)
+        self.rows: dict[int, list[dict]] = {}
+        self.failed: dict[int, str] = {}
+
+    @property
+    def done(self) -> bool:
+        return len(self.rows) + len(self.failed) == len(self.shards)
+
+    def lease(self, worker: str, seconds: float = LEASE_SECONDS) -> int | None:
+        """Hand the next pending shard to `worker`; None if there is none right now."""
+        if not self.pending:
+            return None
+        shard = self.pending.popleft()
+        self.leases[shard] = (worker, time.monotonic() + seconds)
+        self.attempts[shard] += 1
+        return shard
+
+    def complete(self, shard: int, rows: list[dict]) -> bool:
+        """Store a shard's rows; False for a shard that is already finished."""
+        if shard in self.rows or shard in self.failed:
+            return False
+        self.rows[shard] = rows
+        self.leases.pop(shard, None)
+        if shard in self.pending:
+            self.pending.remove(shard)
+        return True
+
+    def _retry(self, shard: int, reason: str):
+        del self.leases[shard]
+        if self.attempts[shard] < self.max_attempts:
+            self.pending.append(shard)
+        else:
+            self.failed[shard] = f"{reason} ({self.attempts[shard]} attempts)"
+
+    def release(self, worker: str, reason: str) -> list[int]:
+        """Requeue the shards leased to a worker that went away."""
+        shards = [shard for shard, (owner, _) in self.leases.items() if owner == worker]
+        for shard in shards:
+            self._retry(shard, reason)
+        return shards
+
+    def expire(self) -> list[int]:
+        """Requeue the shards whose lease ran out."""
+        now = time.monotonic()
+        shards = [shard for shard, (_, deadline) in self.leases.items() if deadline < now]
+        for shard in shards:
+            self._retry(shard, "lease expired")
+        return shards
+
+
+class Coordinator:
+    """Serves the shards of a sweep to pulling workers and collects their rows."""
+
+    def __init__(
+        self,
+        requests: list[dict],
+        shard_size: int = SHARD_SIZE,
+        max_attempts: int = MAX_ATTEMPTS,
+        lease_seconds: float = LEASE_SECONDS,
+        host: str = HOST,
+        port: int = PORT,
+    ):
+        self.requests = requests
+        self.book = ShardBook(len(requests), shard_size, max_attempts)
+        self.lease_seconds = lease_seconds
+        self.host = host
+        self.port = port
+        self._server: asyncio.Server | None = None
+        self._expiry: asyncio.Task | None = None
+        self._finished = asyncio.Event()
+        self._clients: dict[asyncio.StreamWriter, asyncio.Task] = {}
+
+    async def start(self):
+        """Listen for workers; `port=0` picks a free port."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._expiry = asyncio.create_task(self._expire())
+        if self.book.done:
+            self._finished.set()
+
+    async def close(self):
+        """Stop listening and hang up on the connected workers."""
+        self._expiry.cancel()
+        self._server.close()
+        # Idle workers pull at least every POLL_SECONDS; give them time to hear `done`
+        if self._clients:
+            await asyncio.wait(list(self._clients.values()), timeout=2 * POLL_SECONDS)
+        clients = list(self._clients.items())
+        for writer, _ in clients:
+            writer.close()
+        # Handlers see end of stream and return; leases are released as usual
+        await asyncio.gather(*(task for _, task in clients), return_exceptions=True)
+        await self._server.wait_closed()
+
+    async def wait(self) -> list[dict]:
+        """Wait until every shard is finished; one row per request, in request order."""
+        await self._finished.wait()
+        rows = []
+        for shard, items in self.book.shards.items():
+            if shard in self.book.rows:
+                rows.extend(self.book.rows[shard])
+            else:
+                error = f"shard {shard} failed: {self.book.failed[shard]}"
+                rows.extend({**self.requests[i]["config"], "error": error} for i in items)
+        return rows
+
+    async def _expire(self):
+        while True:
+            await asyncio.sleep(POLL_SECONDS)
+            for shard in self.book.expire():
+                print(f"Shard {shard}: lease expired, requeued")
+            self._check_done()
+
+    def _check_done(self):
+        if self.book.done:
+            self._finished.set()
+
+    def _reply(self, worker: str, message: dict) -> dict:
+        op = message.get("op")
+        if op == "pull":
+            shard = self.book.lease(worker, self.lease_seconds)
+            if shard is not None:
+                requests = [self.requests[i] for i in self.book.shards[shard]]
+                return {"shard": shard, "requests": requests}
+            return {"done": True} if self.book.done else {"wait": POLL_SECONDS}
+        if op == "push":
+            shard = message["shard"]
+            rows = [{**row, "worker": worker.split("#")[0]} for row in message["rows"]]
+            if len(rows) != len(self.book.shards[shard]):
+                raise ValueError(f"shard {shard} has {len(self.book.shards[shard])} runs, got {len(rows)} rows")
+            accepted = self.book.complete(shard, rows)
+            self._check_done()
+            return {"accepted": accepted}
+        return {"error": f"Unknown op {op!r}"}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        peer = writer.get_extra_info("peername")
+        worker = f"{peer[0]}:{peer[1]}#{uuid.uuid4().hex[:8]}"
+        self._clients[writer] = asyncio.current_task()
+        try:
+            while line := await reader.readline():
+                try:
+                    message = json.loads(line)
+                    if message.get("op") == "hello":
+                        worker = f"{message['worker']}#{uuid.uuid4().hex[:8]}"
+                        reply = {"ok": True}
+                    else:
+                        reply = self._reply(worker, message)
+                except (ValueError, KeyError) as e:
+                    reply = {"error": repr(e)}
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for shard in self.book.release(worker, f"worker {worker} disconnected"):
+                print(f"Shard {shard}: worker {worker} went away, requeued")
+            self._check_done()
+            self._clients.pop(writer, None)
+            writer.close()
+
+
+def _run_request(request: dict, tick_cache: bool = False) -> dict:
+    try:
+        config = build_config(request)
+    except Exception as e:
+        return {**request["config"], "error": repr(e)}
+    return _run_point(request["config"], config, tick_cache=tick_cache)
+
+
+def _connect(host: str, port: int, timeout: float) -> socket.socket:
+    # Workers may come up before the coordinator
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return socket.create_connection((host, port))
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(POLL_SECONDS)
+
+
+def run_worker(
+    host: str = HOST,
+    port: int = PORT,
+    processes: int = 1,
+    name: str | None = None,
+    tick_cache: bool = False,
+    connect_timeout: float = CONNECT_SECONDS,
+) -> int:
+    """
+    Pull and run shards until the coordinator has none left; returns the shard count.
+
+    With `processes > 1` a shard's runs go to a warm pool that lives as long
+    as the worker; otherwise they run in this process.
+    """
+    name = name or f"{socket.gethostname()}-{os.getpid()}"
+    pool = None
+    if processes > 1:
+        # Spawn, not fork: the Rust runtime inside nautilus is not fork-safe
+        pool = ProcessPoolExecutor(max_workers=processes, mp_context=get_context("spawn"))
+    shards = 0
+    try:
+        with _connect(host, port, connect_timeout) as sock, sock.makefile("rwb") as stream:
+
+            def call(message: dict) -> dict:
+                stream.write(json.dumps(message).encode() + b"\n")
+                stream.flush()
+                line = stream.readline()
+                if not line:
+                    raise ConnectionError("coordinator closed the connection")
+                reply = json.loads(line)
+                if "error" in reply:
+                    raise RuntimeError(reply["error"])
+                return reply
+
+            call({"op": "hello", "worker": name})
+            while True:
+                try:
+                    reply = call({"op": "pull"})
+                except ConnectionError:
+                    print(f"{name}: coordinator went away")
+                    return shards
+                if reply.get("done"):
+                    return shards
+                if "wait" in reply:
+                    time.sleep(reply["wait"])
+                    continue
+                requests = reply["requests"]
+                if pool is not None:
+                    rows = list(pool.map(_run_request, requests, itertools.repeat(tick_cache)))
+                else:
+                    rows = [_run_request(r, tick_cache) for r in requests]
+                try:
+                    call({"op": "push", "shard": reply["shard"], "rows": rows})
+                except ConnectionError:
+                    print(f"{name}: coordinator went away before shard {reply['shard']} was stored")
+                    return shards
+                shards += 1
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def run_distributed(
+    requests: list[dict],
+    local_workers: int = 0,
+    processes: int = 1,
+    shard_size: int = SHARD_SIZE,
+    max_attempts: int = MAX_ATTEMPTS,
+    lease_seconds: float = LEASE_SECONDS,
+    host: str = HOST,
+    port: int = PORT,
+    tick_cache: bool = False,
+) -> pd.DataFrame:
+    """
+    Coordinate a sweep until every shard is finished; one summary row per request.
+
+    Remote workers connect by themselves; `local_workers` more are started on
+    this host with `processes` each. The table is indexed by the swept
+    parameter names, with the `worker` that ran each row.
+    """
+
+    async def coordinate():
+        coordinator = Coordinator(requests, shard_size, max_attempts, lease_seconds, host, port)
+        await coordinator.start()
+        print(f"Coordinating {len(requests)} runs in {len(coordinator.book.shards)} shards on {host}:{coordinator.port}")
+        context = get_context("spawn")
+        workers = [
+            context.Process(
+                target=run_worker,
+                args=(HOST, coordinator.port, processes, f"local-{i}", tick_cache),
+                daemon=True,
+            )
+            for i in range(local_workers)
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            return await coordinator.wait()
+        finally:
+            await coordinator.close()
+            for worker in workers:
+                worker.join(timeout=POLL_SECONDS * 5)
+                if worker.is_alive():
+                    worker.terminate()
+
+    rows = asyncio.run(coordinate())
+    summary = pd.DataFrame(rows)
+    names = list(requests[0]["config"]) if requests else []
+    return summary.set_index(names) if names else summary
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Parameter sweeps over several hosts")
+    parser.add_argument("--host", default=HOST, help="coordinator address (to bind, or to connect to)")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--processes", type=int, default=1, help="parallel runs per worker")
+    parser.add_argument("--tick-cache", action="store_true", help="workers stream quotes from their tick cache")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    coordinate = commands.add_parser("coordinate", help="split a sweep into shards and serve them")
+    coordinate.add_argument("--strategy", default="macd", choices=sorted(STRATEGIES))
+    coordinate.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2,...")
+    coordinate.add_argument("--range", action="append", default=[], metavar="NAME=LO:HI")
+    coordinate.add_argument("--random", type=int, metavar="N", help="sample N points uniformly from --range")
+    coordinate.add_argument("--lhs", type=int, metavar="N", help="sample N Latin-hypercube points from --range")
+    coordinate.add_argument("--seed", type=int)
+    coordinate.add_argument("--catalog", default="data", help="catalog name under parquet_in/ on the workers")
+    coordinate.add_argument("--instrument", help="instrument id; default: the first catalog instrument")
+    coordinate.add_argument("--start")
+    coordinate.add_argument("--end", default="2020-01-10")
+    coordinate.add_argument("--shard-size", type=int, default=SHARD_SIZE)
+    coordinate.add_argument("--attempts", type=int, default=MAX_ATTEMPTS, help="runs of a shard before giving up")
+    coordinate.add_argument("--lease", type=float, default=LEASE_SECONDS, help="seconds a worker may hold a shard")
+    coordinate.add_argument("--local-workers", type=int, default=0, help="also start N workers on this host")
+    coordinate.add_argument("--output", default="sweep.parquet")
+
+    work = commands.add_parser("work", help="run shards pulled from a coordinator")
+    work.add_argument("--name", help="worker name in the results; default: host-pid")
+    args = parser.parse_args(argv)
+
+    if args.command == "work":
+        shards = run_worker(args.host, args.port, args.processes, args.name, args.tick_cache)
+        print(f"Ran {shards} shards")
+        return
+
+    if args.lhs:
+        points = latin_hypercube(_parse_ranges(args.range), args.lhs, args.seed)
+    elif args.random:
+        points = random_sample(_parse_ranges(args.range), args.random, args.seed)
+    else:
+        points = grid(_parse_values(args.grid))
+    points = [p for p in points if valid_periods(p)]
+    requests = sweep_requests(points, args.strategy, args.catalog, args.instrument, args.start, args.end)
+
+    summary = run_distributed(
+        requests,
+        args.local_workers,
+        args.processes,
+        args.shard_size,
+        args.attempts,
+        args.lease,
+        args.host,
+        args.port,
+        args.tick_cache,
+    )
+    summary.to_parquet(args.output)
+    if "USD PnL (total)" in summary:
+        summary = summary.sort_values("USD PnL (total)", ascending=False)
+    print(summary.head(20).to_string())
+    print(f"\nSummary written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Execution simulation for the SIM venue: order latency, queue position and slippage.
+
+An `ExecutionProfile` (see `configs.execution`) passed to `get_backtest_config`
+installs two venue models:
+
+    ExecutionModule         orders reach the venue `latency_ms` after they are
+                            sent, plus an exponential delay with mean
+                            `jitter_ms` drawn per order; they are matched
+                            against the first quote at or after arrival
+    QueueSlippageFillModel  market orders only take the part of the displayed
+                            touch size not queued ahead of them (`queue_ahead`)
+                            and fill `spread_slippage` current spreads beyond
+                            the touch; the rest fills one spread deeper.
+                            Resting limit orders at the touch fill with
+                            probability 1 - `queue_ahead`
+
+Both only do work when an order is sent or matched. `python -m
+backtests.benchmark --cases macd_node macd_node_exec macd_node_vps` measures
+their cost at identical order flow, and with the `vps` profile sampling a
+latency and slipping every order. Latency below the spacing of the quotes is rounded up to the
+next quote.
+
+How sensitive the MACD zero-cross strategy is to order latency:
+
+    python -m backtests.execution --latency 0 10 20 50 100
+    python -m backtests.execution --latency 0 25 50 --profile vps --start 2020-01-02
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+from msgspec import structs
+
+from nautilus_trader.backtest.models import FillModel
+from nautilus_trader.backtest.models import LatencyModel
+from nautilus_trader.backtest.modules import SimulationModule
+from nautilus_trader.model.book import OrderBook
+from nautilus_trader.model.data import BookOrder
+from nautilus_trader.model.enums import BookType
+from nautilus_trader.model.enums import OrderSide
+from nautilus_trader.model.enums import OrderType
+from nautilus_trader.model.events import OrderPendingCancel
+from nautilus_trader.model.events import OrderPendingUpdate
+from nautilus_trader.model.events import OrderSubmitted
+from nautilus_trader.model.objects import Price
+from nautilus_trader.model.objects import Quantity
+
+from configs.execution import EXECUTION_PROFILES, ExecutionModuleConfig, ExecutionProfile, QueueSlippageFillModelConfig
+from configs.parquet_data import ParquetConfig, PARQUET_DATA, PARQUET_RESULTS
+
+NANOS_PER_MS = 1_000_000
+# Order events published right before their command is sent to the venue
+_SENDING = (OrderSubmitted, OrderPendingUpdate, OrderPendingCancel)
+
+
+class ExecutionModule(SimulationModule):
+    """
+    Venue module that delays every order command by a sampled latency.
+
+    The exchange reads its latency model when a command is sent, so a new
+    delay is drawn on the order event that precedes each command. The module
+    also lets a `QueueSlippageFillModel` read the venue's latest quotes.
+    """
+
+    def __init__(self, config: ExecutionModuleConfig):
+        super().__init__(config)
+        self.latency_ms = config.latency_ms
+        self.jitter_ms = config.jitter_ms
+        self.seed = config.seed
+        self._rng = np.random.default_rng(self.seed)
+        self.delays = 0
+        self._delay_ns = 0
+
+    def register_venue(self, exchange):
+        super().register_venue(exchange)
+        if isinstance(exchange.fill_model, QueueSlippageFillModel):
+            exchange.fill_model.cache = exchange.cache
+        if self.jitter_ms > 0:
+            exchange.msgbus.subscribe("events.order.*", self._on_order_event)
+        self.reset()
+
+    def _on_order_event(self, event):
+        if isinstance(event, _SENDING):
+            self._sample()
+
+    def _sample(self):
+        latency = self.latency_ms
+        if self.jitter_ms > 0:
+            latency += self._rng.exponential(self.jitter_ms)
+        ns = round(latency * NANOS_PER_MS)
+        self.exchange.set_latency_model(LatencyModel(base_latency_nanos=ns))
+        self.delays += 1
+        self._delay_ns += ns
+
+    def process(self, ts_now: int):
+        pass
+
+    def reset(self):
+        self._rng = np.random.default_rng(self.seed)
+        self.delays = 0
+        self._delay_ns = 0
+        if self.latency_ms > 0 or self.jitter_ms > 0:
+            self._sample()
+
+    def log_diagnostics(self, logger):
+        if self.delays:
+            logger.info(f"Sampled {self.delays} order latencies, mean {self._delay_ns / self.delays / NANOS_PER_MS:.2f} ms")
+
+
+class QueueSlippageFillModel(FillModel):
+    """
+    Fill model for market orders with a queue ahead at the touch and spread-dependent slippage.
+
+    The touch size is read from the venue's latest quote (bound by
+    `ExecutionModule`); without one the whole order is available at the
+    slipped touch price.
+    """
+
+    def __init__(self, config: QueueSlippageFillModelConfig | None = None):
+        config = config or QueueSlippageFillModelConfig()
+        if config.spread_slippage < 0:
+            raise ValueError(f"spread_slippage must not be negative, was {config.spread_slippage}")
+        if not 0 <= config.queue_ahead <= 1:
+            raise ValueError(f"queue_ahead must be between 0 and 1, was {config.queue_ahead}")
+        # A resting order at the touch fills once the queue ahead of it is done
+        super().__init__(
+            prob_fill_on_limit=1.0 - config.queue_ahead,
+            prob_fill_on_stop=config.prob_fill_on_stop,
+            prob_slippage=config.prob_slippage,
+            random_seed=config.random_seed,
+        )
+        self.queue_ahead = config.queue_ahead
+        self.spread_slippage = config.spread_slippage
+        self.cache = None
+
+    def get_orderbook_for_fill_simulation(self, instrument, order, best_bid, best_ask) -> OrderBook | None:
+        if order.order_type != OrderType.MARKET:
+            return None
+
+        tick = instrument.price_increment.raw
+        spread = best_ask.raw - best_bid.raw
+        quote = self.cache.quote_tick(instrument.id) if self.cache is not None else None
+        if order.side == OrderSide.BUY:
+            side, touch, sign = OrderSide.SELL, best_ask.raw, 1
+            displayed = quote.ask_size if quote is not None else None
+        else:
+            side, touch, sign = OrderSide.BUY, best_bid.raw, -1
+            displayed = quote.bid_size if quote is not None else None
+
+        price = touch + sign * round(self.spread_slippage * spread / tick) * tick
+        if displayed is None:
+            available = order.quantity
+        else:
+            available = Quantity(displayed.as_double() * (1.0 - self.queue_ahead), instrument.size_precision)
+
+        book = OrderBook(instrument_id=instrument.id, book_type=BookType.L2_MBP)
+        if available.raw > 0:
+            book.add(BookOrder(side, Price.from_raw(price, instrument.price_precision), available, 1), 0, 0)
+        if available < order.quantity:
+            # The rest of the order walks one spread deeper
+            deeper = Price.from_raw(price + sign * max(spread, tick), instrument.price_precision)
+            book.add(BookOrder(side, deeper, order.quantity, 2), 0, 0)
+        return book
+
+
+def latency_sensitivity(
+    data: ParquetConfig,
+    results: ParquetConfig,
+    latencies_ms: list[float],
+    profile: ExecutionProfile | None = None,
+    processes: int | None = None,
+    cache_dir: str | None = None,
+    **config_kwargs,
+) -> pd.DataFrame:
+    """
+    Run the MACD backtest once per order latency, other profile fields fixed.
+
+    Returns the sweep summary (see `backtests.sweep.run_sweep`) indexed by
+    `latency_ms`, with each run's PnL change against the first latency.
+    """
+    from backtests.sweep import SWEEP_LOGGING, run_sweep
+    from configs.backtest import get_backtest_config
+
+    profile = profile or ExecutionProfile()
+    config_kwargs.setdefault("logging", SWEEP_LOGGING)
+    points = [{"latency_ms": latency} for latency in latencies_ms]
+    configs = [
+        get_backtest_config(data, results, execution=structs.replace(profile, **point), **config_kwargs)
+        for point in points
+    ]
+    summary = run_sweep(configs, points, processes, cache_dir)
+    pnl = [c for c in summary.columns if c.endswith(" PnL (total)")]
+    if pnl and summary["error"].isna().all():
+        summary["pnl_change"] = summary[pnl[0]] - summary[pnl[0]].iloc[0]
+    return summary
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="MACD backtest PnL as a function of order latency")
+    parser.add_argument("--latency", type=float, nargs="+", default=[0, 10, 20, 50, 100], help="latencies in ms")
+    parser.add_argument("--profile", choices=list(EXECUTION_PROFILES), help="queue, slippage and jitter of a named profile")
+    parser.add_argument("--name", default="data", help="catalog name under parquet_in/")
+    parser.add_argument("--start", help="first timestamp of the catalog slice")
+    parser.add_argument("--end", default="2020-01-10", help="last timestamp of the catalog slice")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--cache", metavar="DIR", help="reuse results of identical earlier runs from this cache")
+    args = parser.parse_args(argv)
+
+    summary = latency_sensitivity(
+        ParquetConfig(PARQUET_DATA, args.name),
+        ParquetConfig(PARQUET_RESULTS, "execution"),
+        args.latency,
+        EXECUTION_PROFILES[args.profile] if args.profile else None,
+        args.processes,
+        args.cache,
+        start_time=args.start,
+        end_time=args.end,
+    )
+    columns = [c for c in summary.columns if c in ("total_orders", "pnl_change", "error") or c.endswith(" PnL (total)")]
+    print(summary[columns].to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,521 @@
+"""
+Local batch job server for queued backtests.
+
+Run requests are queued in SQLite (`parquet_out/jobs.sqlite`), so queued work
+survives restarts and needs no external broker. An asyncio server takes
+requests over a local socket (one JSON object per line) and dispatches queued
+jobs to a pool of warm worker processes. Workers import nautilus and the
+strategies once and keep recently used catalog data decoded between jobs, so
+a job pays neither the interpreter start nor the catalog read again. Results
+are appended to the results store (`parquet_out/runs`) by the worker.
+
+A request names the strategy, its config overrides and the data window:
+
+    {"strategy_path": "strategies.macd:MACDStrategy", "config_path": "configs.macd:MACDConfig",
+     "config": {"fast_period": 8}, "catalog": "data", "instrument_id": null,
+     "start": "2020-01-02", "end": "2020-01-05"}
+
+Socket operations: `submit` (-> job id), `status`, `list`, `cancel` and `watch`,
+which streams the job's stage changes until it finishes:
+
+    python -m backtests.jobserver serve --workers 4
+    python -m backtests.jobserver submit --param fast_period=8 --start 2020-01-02 --wait
+    python -m backtests.jobserver status
+"""
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from pathlib import Path
+
+from nautilus_trader.backtest.config import BacktestDataConfig
+from nautilus_trader.backtest.config import BacktestRunConfig
+from nautilus_trader.config import LoggingConfig
+from nautilus_trader.model.identifiers import InstrumentId
+from nautilus_trader.persistence.catalog.types import CatalogDataResult
+
+from analytics.results import ResultsStore
+from backtests.cache import run_cached
+from backtests.sweep import CachedDataNode, summarize
+from configs.backtest import get_backtest_config
+from configs.parquet_data import ParquetConfig, PARQUET_DATA, PARQUET_RESULTS
+
+HOST = "127.0.0.1"
+PORT = 8765
+JOBS_DB = os.path.join(PARQUET_RESULTS, "jobs.sqlite")
+# Workers log to stdout only: they must not truncate the same log file
+JOB_LOGGING = LoggingConfig(log_level="ERROR")
+# Catalog slices each worker keeps decoded between jobs
+WARM_DATA = 4
+POLL_SECONDS = 1.0
+WATCH_SECONDS = 0.2
+TERMINAL = ("done", "failed", "cancelled")
+
+REQUEST_DEFAULTS = {
+    "strategy_path": "strategies.macd:MACDStrategy",
+    "config_path": "configs.macd:MACDConfig",
+    "config": {},
+    "catalog": "data",
+    "instrument_id": None,
+    "start": None,
+    "end": None,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    stage TEXT,
+    request TEXT NOT NULL,
+    submitted REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    run_id TEXT,
+    summary TEXT,
+    error TEXT
+)
+"""
+
+
+def normalize_request(request: dict) -> dict:
+    """Fill in defaults; unknown fields are rejected instead of silently ignored."""
+    unknown = set(request) - set(REQUEST_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown request fields: {', '.join(sorted(unknown))}")
+    return {**REQUEST_DEFAULTS, **request}
+
+
+def build_config(request: dict) -> BacktestRunConfig:
+    """The run config of a (normalized) request."""
+    data = ParquetConfig(PARQUET_DATA, request["catalog"])
+    instrument_id = InstrumentId.from_str(request["instrument_id"]) if request["instrument_id"] else None
+    return get_backtest_config(
+        data,
+        data,
+        strategy_config=request["config"],
+        instrument_id=instrument_id,
+        start_time=request["start"],
+        end_time=request["end"],
+        logging=JOB_LOGGING,
+        strategy_path=request["strategy_path"],
+        config_path=request["config_path"],
+    )
+
+
+class JobQueue:
+    """SQLite-backed job queue; safe to share between processes."""
+
+    def __init__(self, path: str | Path = JOBS_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit; `claim` opens its own write transaction. The server calls
+        # it from one database thread, not the thread that opened it
+        self._db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(SCHEMA)
+
+    def submit(self, request: dict) -> str:
+        job_id = uuid.uuid4().hex[:12]
+        self._db.execute(
+            "INSERT INTO jobs (id, status, stage, request, submitted) VALUES (?, 'queued', 'queued', ?, ?)",
+            (job_id, json.dumps(normalize_request(request)), time.time()),
+        )
+        return job_id
+
+    def claim(self) -> tuple[str, dict] | None:
+        """Mark the oldest queued job as running and return it."""
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._db.execute(
+                "SELECT id, request FROM jobs WHERE status = 'queued' ORDER BY submitted, rowid LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                self._db.execute(
+                    "UPDATE jobs SET status = 'running', stage = 'starting', started = ? WHERE id = ?",
+                    (time.time(), row["id"]),
+                )
+        finally:
+            self._db.execute("COMMIT")
+        return None if row is None else (row["id"], json.loads(row["request"]))
+
+    def set_stage(self, job_id: str, stage: str):
+        self._db.execute("UPDATE jobs SET stage = ? WHERE id = ?", (stage, job_id))
+
+    def finish(self, job_id: str, run_id: str, summary: dict):
+        self._db.execute(
+            "UPDATE jobs SET status = 'done', stage = 'done', finished = ?, run_id = ?, summary = ? WHERE id = ?",
+            (time.time(), run_id, json.dumps(summary), job_id),
+        )
+
+    def fail(self, job_id: str, error: str):
+        self._db.execute(
+            "UPDATE jobs SET status = 'failed', stage = 'failed', finished = ?, error = ? WHERE id = ?",
+            (time.time(), error, job_id),
+        )
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued job; running jobs are not interrupted."""
+        cursor = self._db.execute(
+            "UPDATE jobs SET status = 'cancelled', stage = 'cancelled', finished = ? WHERE id = ? AND status = 'queued'",
+            (time.time(), job_id),
+        )
+        return cursor.rowcount == 1
+
+    def requeue_running(self) -> int:
+        """Put jobs left running by a stopped server back in the queue."""
+        cursor = self._db.execute(
+            "UPDATE jobs SET status = 'queued', stage = 'queued', started = NULL WHERE status = 'running'"
+        )
+        return cursor.rowcount
+
+    def get(self, job_id: str) -> dict | None:
+        row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return None if row is None else self._as_dict(row)
+
+    def jobs(self, status: str | None = None, limit: int = 50) -> list[dict]:
+        """The most recently submitted jobs, newest first."""
+        query = "SELECT * FROM jobs" + (" WHERE status = ?" if status else "") + " ORDER BY submitted DESC LIMIT ?"
+        rows = self._db.execute(query, (status, limit) if status else (limit,)).fetchall()
+        return [self._as_dict(row) for row in rows]
+
+    @staticmethod
+    def _as_dict(row: sqlite3.Row) -> dict:
+        job = dict(row)
+        job["request"] = json.loads(job["request"])
+        job["summary"] = json.loads(job["summary"]) if job["summary"] else None
+        return job
+
+
+# Per worker process: the queue connection and the job being run
+_queue: JobQueue | None = None
+_job_id: str | None = None
+
+
+def _stage(stage: str):
+    if _queue is not None and _job_id is not None:
+        _queue.set_stage(_job_id, stage)
+
+
+def _init_worker(db_path: str):
+    global _queue
+    _queue = JobQueue(db_path)
+    # Pay for the strategy imports once per worker instead of in the first job
+    import strategies.macd  # noqa: F401
+    import strategies.macd_portfolio  # noqa: F401
+
+
+class WarmNode(CachedDataNode):
+    """CachedDataNode that reports job stages and keeps at most `WARM_DATA` slices decoded."""
+
+    max_cached = WARM_DATA
+
+    @classmethod
+    def load_data_config(
+        cls,
+        config: BacktestDataConfig,
+        start: str | int | None = None,
+        end: str | int | None = None,
+    ) -> CatalogDataResult:
+        _stage("loading data")
+        result = super().load_data_config(config, start, end)
+        _stage("running")
+        return result
+
+
+def run_job(job_id: str, request: dict, results_root: str) -> dict:
+    """Run one job in a worker and append its results to the store."""
+    global _job_id
+    _job_id = job_id
+    try:
+        config = build_config(request)
+        run = run_cached(config, None, node_cls=WarmNode)
+        _stage("storing results")
+        run_id = ResultsStore(results_root).append(config, run.result, run.reports, run.stats)
+        return {"run_id": run_id, "summary": summarize(run.result)}
+    finally:
+        _job_id = None
+
+
+class JobServer:
+    """Dispatches queued jobs to a warm worker pool and serves the socket API."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        workers: int = 1,
+        results_root: str | Path | None = None,
+        host: str = HOST,
+        port: int = PORT,
+    ):
+        self.queue = queue
+        self.workers = workers
+        self.results_root = str(results_root or ParquetConfig(PARQUET_RESULTS, "runs").path)
+        self.host = host
+        self.port = port
+        self._pool: ProcessPoolExecutor | None = None
+        self._server: asyncio.Server | None = None
+        self._dispatcher: asyncio.Task | None = None
+        self._jobs: set[asyncio.Task] = set()
+        # Queue calls may wait on the sqlite lock: keep them off the event loop, one at a time
+        self._db_thread = ThreadPoolExecutor(max_workers=1)
+        self._wakeup = asyncio.Event()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # Spawn, not fork: the Rust runtime inside nautilus is not fork-safe
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(str(self.queue.path),),
+        )
+
+    async def start(self):
+        """Requeue interrupted jobs, start the workers and listen; `port=0` picks a free port."""
+        requeued = await self._db(self.queue.requeue_running)
+        if requeued:
+            print(f"Requeued {requeued} interrupted jobs")
+        self._pool = self._new_pool()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def close(self):
+        """Stop taking jobs and wait for the running ones."""
+        self._dispatcher.cancel()
+        self._server.close()
+        await self._server.wait_closed()
+        await asyncio.gather(*self._jobs, return_exceptions=True)
+        await asyncio.get_running_loop().run_in_executor(None, self._pool.shutdown)
+        self._db_thread.shutdown()
+
+    async def _db(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._db_thread, func, *args)
+
+    async def serve(self):
+        await self.start()
+        print(f"Serving on {self.host}:{self.port} with {self.workers} workers, queue {self.queue.path}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.close()
+
+    async def _dispatch(self):
+        slots = asyncio.Semaphore(self.workers)
+        while True:
+            await slots.acquire()
+            job = await self._db(self.queue.claim)
+            while job is None:
+                # Submits over the socket wake us up; the poll catches jobs queued directly in the db
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                job = await self._db(self.queue.claim)
+            task = asyncio.create_task(self._execute(*job))
+            self._jobs.add(task)
+            task.add_done_callback(self._jobs.discard)
+            task.add_done_callback(lambda _: slots.release())
+
+    async def _execute(self, job_id: str, request: dict):
+        pool = self._pool
+        try:
+            output = await asyncio.get_running_loop().run_in_executor(
+                pool, run_job, job_id, request, self.results_root
+            )
+        except BrokenProcessPool as e:
+            await self._db(self.queue.fail, job_id, f"worker died: {e!r}")
+            if self._pool is pool:
+                self._pool = self._new_pool()
+        except Exception as e:
+            await self._db(self.queue.fail, job_id, repr(e))
+        else:
+            await self._db(self.queue.finish, job_id, output["run_id"], output["summary"])
+
+    async def _watch(self, job_id: str):
+        last = None
+        while True:
+            job = await self._db(self.queue.get, job_id)
+            if job is None:
+                yield {"error": f"Unknown job {job_id}"}
+                return
+            if (job["status"], job["stage"]) != last:
+                last = job["status"], job["stage"]
+                yield {"job": job}
+            if job["status"] in TERMINAL:
+                return
+            await asyncio.sleep(WATCH_SECONDS)
+
+    async def _reply(self, message: dict) -> dict:
+        op = message.get("op")
+        if op == "submit":
+            job_id = await self._db(self.queue.submit, message["request"])
+            self._wakeup.set()
+            return {"job_id": job_id}
+        if op == "status":
+            job = await self._db(self.queue.get, message["job_id"])
+            return {"job": job} if job else {"error": f"Unknown job {message['job_id']}"}
+        if op == "list":
+            return {"jobs": await self._db(self.queue.jobs, message.get("status"))}
+        if op == "cancel":
+            return {"cancelled": await self._db(self.queue.cancel, message["job_id"])}
+        return {"error": f"Unknown op {op!r}"}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while line := await reader.readline():
+                try:
+                    message = json.loads(line)
+                    if message.get("op") == "watch":
+                        async for update in self._watch(message["job_id"]):
+                            await _send(writer, update)
+                        continue
+                    reply = await self._reply(message)
+                except (ValueError, KeyError) as e:
+                    reply = {"error": repr(e)}
+                await _send(writer, reply)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def _send(writer: asyncio.StreamWriter, message: dict):
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+
+
+async def request(message: dict, host: str = HOST, port: int = PORT) -> dict:
+    """Send one operation to a running server and return its reply."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        await _send(writer, message)
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+
+
+async def watch(job_id: str, host: str = HOST, port: int = PORT):
+    """Yield the job's state on every stage change until it finishes."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        await _send(writer, {"op": "watch", "job_id": job_id})
+        while line := await reader.readline():
+            update = json.loads(line)
+            if "error" in update:
+                raise RuntimeError(update["error"])
+            yield update["job"]
+            if update["job"]["status"] in TERMINAL:
+                return
+    finally:
+        writer.close()
+
+
+def _parse_params(items: list[str]) -> dict:
+    params = {}
+    for name, value in (i.split("=", 1) for i in items):
+        try:
+            params[name] = json.loads(value)
+        except ValueError:
+            params[name] = value
+    return params
+
+
+def _print_job(job: dict):
+    elapsed = (job["finished"] or time.time()) - job["started"] if job["started"] else 0.0
+    detail = job["error"] or job["run_id"] or ""
+    print(f"{job['id']}  {job['status']:<9} {job['stage']:<15} {elapsed:7.1f}s  {detail}")
+
+
+async def _submit(args) -> int:
+    req = {
+        "strategy_path": args.strategy,
+        "config_path": args.config_path,
+        "config": _parse_params(args.param),
+        "catalog": args.catalog,
+        "instrument_id": args.instrument,
+        "start": args.start,
+        "end": args.end,
+    }
+    try:
+        reply = await request({"op": "submit", "request": req}, args.host, args.port)
+    except ConnectionError:
+        if args.wait:
+            sys.exit(f"No server on {args.host}:{args.port}")
+        job_id = JobQueue(args.db).submit(req)
+        print(f"{job_id} queued in {args.db}; it runs once a server is started")
+        return 0
+    if "error" in reply:
+        sys.exit(reply["error"])
+    print(f"{reply['job_id']} submitted")
+    if not args.wait:
+        return 0
+
+    async for job in watch(reply["job_id"], args.host, args.port):
+        _print_job(job)
+    if job["summary"]:
+        print(json.dumps(job["summary"], indent=2))
+    return 0 if job["status"] == "done" else 1
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Local batch job server for queued backtests")
+    parser.add_argument("--db", default=JOBS_DB, help="SQLite job queue")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="run the server")
+    serve.add_argument("--workers", type=int, default=os.cpu_count())
+
+    submit = commands.add_parser("submit", help="queue a backtest")
+    submit.add_argument("--strategy", default=REQUEST_DEFAULTS["strategy_path"], help="module:Strategy")
+    submit.add_argument("--config-path", default=REQUEST_DEFAULTS["config_path"], help="module:StrategyConfig")
+    submit.add_argument("--param", action="append", default=[], metavar="NAME=VALUE", help="strategy config value (JSON)")
+    submit.add_argument("--catalog", default=REQUEST_DEFAULTS["catalog"], help=f"catalog name under {PARQUET_DATA}/")
+    submit.add_argument("--instrument", help="instrument id; default: the first catalog instrument")
+    submit.add_argument("--start")
+    submit.add_argument("--end")
+    submit.add_argument("--wait", action="store_true", help="stream the job's progress until it finishes")
+
+    status = commands.add_parser("status", help="show recent jobs or one job")
+    status.add_argument("job_id", nargs="?")
+    status.add_argument("--status", choices=["queued", "running", *TERMINAL])
+
+    cancel = commands.add_parser("cancel", help="cancel a queued job")
+    cancel.add_argument("job_id")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        try:
+            asyncio.run(JobServer(JobQueue(args.db), args.workers, host=args.host, port=args.port).serve())
+        except KeyboardInterrupt:
+            pass
+    elif args.command == "submit":
+        sys.exit(asyncio.run(_submit(args)))
+    elif args.command == "status":
+        # Read straight from the queue: works whether or not a server is running
+        queue = JobQueue(args.db)
+        if args.job_id:
+            job = queue.get(args.job_id)
+            if job is None:
+                sys.exit(f"Unknown job {args.job_id}")
+            print(json.dumps(job, indent=2))
+        else:
+            for job in queue.jobs(args.status):
+                _print_job(job)
+    elif args.command == "cancel":
+        print("cancelled" if JobQueue(args.db).cancel(args.job_id) else "not cancelled: job is not queued")
+
+
+if __name__ == "__main__":
+    main()
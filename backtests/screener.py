@@ -0,0 +1,239 @@
+"""
+Vectorized MACD zero-line screener.
+
+Re-implements the `MACDStrategy` signal logic over whole NumPy arrays read
+straight from the catalog's quote-tick parquet files, so thousands of
+`fast_period`/`slow_period` combinations can be ranked before the best ones are
+sent to a full `BacktestNode` run.
+
+Matches the event-driven strategy as it actually trades:
+
+- MID price is `(bid + ask) / 2` rounded to `price_precision + 1`, like
+  `QuoteTick.extract_price(PriceType.MID)`.
+- EMAs start from the first price with `alpha = 2 / (period + 1)`; MACD is
+  initialized once `slow_period` ticks were seen and the first initialized
+  reading only seeds the above/below-zero state.
+- Market orders fill on the signal tick at the touch. Position events arrive
+  after `go_long`/`go_short` check `is_flat`, so a crossover either opens a
+  position in the direction of the first crossover or closes it - the
+  strategy never reverses in one step.
+
+    python -m backtests.screener --grid fast_period=4,8,12,16 --grid slow_period=20,26,40 --top 10
+    python -m backtests.screener --verify --grid fast_period=12 --grid slow_period=26
+"""
+import argparse
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+
+from nautilus_trader.core.datetime import dt_to_unix_nanos
+from nautilus_trader.model.objects import FIXED_SCALAR
+from nautilus_trader.persistence.funcs import urisafe_identifier
+
+from backtests.sweep import grid, make_configs, run_sweep, valid_periods, _parse_values
+from configs.parquet_data import ParquetConfig, PARQUET_DATA, PARQUET_RESULTS
+
+
+def decode_fixed(column) -> np.ndarray:
+    """Decode a nautilus fixed-point (int128 little-endian) parquet column to float64."""
+    column = column.combine_chunks() if hasattr(column, "combine_chunks") else column
+    words = np.frombuffer(column.buffers()[1], dtype="<i8")
+    words = words[column.offset * 2:(column.offset + len(column)) * 2].reshape(-1, 2)
+    return (words[:, 1].astype(np.float64) * 2.0**64 + words[:, 0].view(np.uint64).astype(np.float64)) / FIXED_SCALAR
+
+
+def load_quotes(catalog_path: str | Path, instrument_id, start=None, end=None, sizes: bool = False) -> pd.DataFrame:
+    """
+    Read bid/ask quotes for one instrument directly from the catalog parquet files.
+
+    Returns a DataFrame with `ts_init` (int ns), `bid` and `ask` columns (plus
+    `bid_size` and `ask_size` with `sizes=True`), sorted the way the backtest
+    engine replays them. `end` is inclusive.
+    """
+    directory = Path(catalog_path) / "data" / "quote_tick" / urisafe_identifier(str(instrument_id))
+    dataset = ds.dataset(sorted(str(f) for f in directory.glob("*.parquet")), format="parquet")
+
+    ts = ds.field("ts_init")
+    flt = None
+    if start is not None:
+        flt = ts >= dt_to_unix_nanos(start)
+    if end is not None:
+        upper = ts <= dt_to_unix_nanos(end)
+        flt = upper if flt is None else flt & upper
+
+    columns = ["bid_price", "ask_price", "ts_init"] + (["bid_size", "ask_size"] if sizes else [])
+    table = dataset.to_table(columns=columns, filter=flt)
+    quotes = pd.DataFrame({
+        "ts_init": table.column("ts_init").to_numpy(),
+        "bid": decode_fixed(table.column("bid_price")),
+        "ask": decode_fixed(table.column("ask_price")),
+    })
+    if sizes:
+        quotes["bid_size"] = decode_fixed(table.column("bid_size"))
+        quotes["ask_size"] = decode_fixed(table.column("ask_size"))
+    quotes = quotes.sort_values("ts_init", kind="stable", ignore_index=True)
+    quotes.attrs["price_precision"] = int(dataset.schema.metadata[b"price_precision"])
+    return quotes
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    """EMA seeded with the first value, same recursion as nautilus `ExponentialMovingAverage`."""
+    return pd.Series(values).ewm(alpha=2.0 / (period + 1.0), adjust=False).mean().to_numpy()
+
+
+def crossovers(macd: np.ndarray, slow_period: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return (tick indices, directions) of the MACD zero-line crossovers.
+
+    Direction is +1 for a cross above zero and -1 for a cross below.
+    """
+    above = macd[slow_period - 1:] > 0
+    idx = np.flatnonzero(above[1:] != above[:-1]) + slow_period
+    return idx, np.where(above[idx - slow_period + 1], 1, -1)
+
+
+class MACDScreener:
+    """
+    Screens MACD parameter sets over one array of quotes.
+
+    EMAs are cached per period, so a grid of F fast and S slow periods costs
+    F + S EMA passes plus one cheap crossover pass per combination.
+    """
+
+    def __init__(self, quotes: pd.DataFrame, trade_size: int = 10000, fee_rate: float = 0.00002, max_cached: int = 64):
+        precision = quotes.attrs.get("price_precision", 5)
+        self.ts = quotes["ts_init"].to_numpy()
+        self.bid = quotes["bid"].to_numpy()
+        self.ask = quotes["ask"].to_numpy()
+        self.mid = np.round((self.bid + self.ask) / 2, precision + 1)
+        self.trade_size = trade_size
+        self.fee_rate = fee_rate
+        self.max_cached = max_cached
+        self._ema_cache: dict[int, np.ndarray] = {}
+
+    def _ema(self, period: int) -> np.ndarray:
+        if period not in self._ema_cache:
+            if len(self._ema_cache) >= self.max_cached:
+                self._ema_cache.pop(next(iter(self._ema_cache)))
+            self._ema_cache[period] = ema(self.mid, period)
+        return self._ema_cache[period]
+
+    def signals(self, fast_period: int, slow_period: int) -> pd.DataFrame:
+        """Return the crossover ticks and the orders the strategy would submit on them."""
+        if len(self.mid) <= slow_period:
+            return pd.DataFrame({"ts_init": [], "direction": [], "side": [], "price": []})
+
+        idx, direction = crossovers(self._ema(fast_period) - self._ema(slow_period), slow_period)
+        # The first crossover fixes the only direction ever traded; even crossovers
+        # open a position in it, odd ones close it
+        side = direction if len(direction) == 0 else np.where(np.arange(len(idx)) % 2 == 0, direction[0], -direction[0])
+        price = np.where(side > 0, self.ask[idx], self.bid[idx])
+        return pd.DataFrame({"ts_init": self.ts[idx], "direction": direction, "side": side, "price": price})
+
+    def evaluate(self, fast_period: int, slow_period: int) -> dict:
+        """Approximate PnL and trade count for one parameter set."""
+        signals = self.signals(fast_period, slow_period)
+        side = signals["side"].to_numpy()
+        price = signals["price"].to_numpy()
+
+        # `on_stop` closes whatever is still open at the last tick
+        if len(side) % 2 == 1:
+            side = np.append(side, -side[0])
+            price = np.append(price, self.ask[-1] if side[0] < 0 else self.bid[-1])
+
+        gross = -np.sum(side * price) * self.trade_size
+        # Commissions are charged per fill in cents
+        fees = np.sum(np.round(price * self.trade_size * self.fee_rate, 2))
+        return {
+            "fast_period": fast_period,
+            "slow_period": slow_period,
+            "orders": len(side),
+            "trades": len(side) // 2,
+            "pnl": gross - fees,
+        }
+
+    def screen(self, points: list[dict]) -> pd.DataFrame:
+        """Evaluate every point and return them sorted by approximate PnL, best first."""
+        # Group by period so each EMA is computed once even with a bounded cache
+        points = sorted(points, key=lambda p: (p["slow_period"], p["fast_period"]))
+        rows = [self.evaluate(p["fast_period"], p["slow_period"]) for p in points]
+        return pd.DataFrame(rows).sort_values("pnl", ascending=False, ignore_index=True)
+
+
+def verify_signals(data: ParquetConfig, fast_period: int, slow_period: int, end_time: str | None = "2020-01-10") -> pd.DataFrame:
+    """
+    Run the event-driven `MACDStrategy` and compare its orders with the screener signals.
+
+    Returns the rows whose timestamp or side disagree; an empty frame means the
+    two implementations produced identical order streams.
+    """
+    from nautilus_trader.backtest.node import BacktestNode
+    from configs.backtest import get_backtest_config
+    from backtests.sweep import SWEEP_LOGGING
+
+    instrument = data.catalog.instruments()[0]
+    config = get_backtest_config(
+        data,
+        data,
+        strategy_config={"fast_period": fast_period, "slow_period": slow_period},
+        instrument_id=instrument.id,
+        end_time=end_time,
+        logging=SWEEP_LOGGING,
+    )
+    node = BacktestNode(configs=[config])
+    node.run()
+    fills = node.get_engine(config.id).trader.generate_order_fills_report()
+    node.dispose()
+
+    engine = pd.DataFrame({
+        "ts_init": pd.to_datetime(fills["ts_init"]).astype("int64").to_numpy() if not fills.empty else [],
+        "side": np.where(fills["side"] == "BUY", 1, -1) if not fills.empty else [],
+    })
+
+    quotes = load_quotes(data.path, instrument.id, end=end_time)
+    screened = MACDScreener(quotes).signals(fast_period, slow_period)[["ts_init", "side"]]
+
+    # `on_stop` closing order is not a signal
+    if len(engine) == len(screened) + 1:
+        engine = engine.iloc[:-1]
+    merged = engine.merge(screened, how="outer", on=["ts_init", "side"], indicator=True)
+    return merged[merged["_merge"] != "both"]
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Vectorized MACD parameter screener")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2,...")
+    parser.add_argument("--end-time", default="2020-01-10")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--run-top", action="store_true", help="send the top-N sets to a full BacktestNode sweep")
+    parser.add_argument("--verify", action="store_true", help="check signal timestamps against MACDStrategy")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    data = ParquetConfig(PARQUET_DATA, "data")
+    points = [p for p in grid(_parse_values(args.grid)) if valid_periods(p)]
+
+    if args.verify:
+        for p in points:
+            mismatches = verify_signals(data, p["fast_period"], p["slow_period"], args.end_time)
+            status = "OK" if mismatches.empty else f"{len(mismatches)} mismatched orders"
+            print(f"fast={p['fast_period']} slow={p['slow_period']}: {status}")
+        return
+
+    instrument = data.catalog.instruments()[0]
+    quotes = load_quotes(data.path, instrument.id, end=args.end_time)
+    screener = MACDScreener(quotes, fee_rate=float(instrument.taker_fee))
+    ranked = screener.screen(points)
+    print(ranked.head(args.top).to_string())
+
+    if args.run_top:
+        top = ranked.head(args.top)[["fast_period", "slow_period"]].to_dict("records")
+        configs = make_configs(data, ParquetConfig(PARQUET_RESULTS, "sweep"), top)
+        print(run_sweep(configs, top, args.processes).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""
+Streaming replay: results written while a long backtest runs.
+
+With `streaming_config` in the engine config (`get_backtest_config(...,
+streaming=...)`) the engine writes every fill, position event and account
+state to Arrow stream files in the results catalog as they happen, flushing
+every `flush_interval_ms` of simulated time:
+
+    <results>/backtest/<instance id>/order_filled_0.feather
+                                     position_closed_0.feather
+                                     account_state_0.feather ...
+
+`StreamingNode` replays the quotes from the tick cache in batches and purges
+closed orders, closed positions and old account events from the engine cache
+after each batch, so the engine's state no longer grows with the run length.
+The end-of-run reports and stats of the engine then only cover what is left in
+the cache; `run_streaming` builds them from the stream instead, in the schema
+of the engine reports so streamed and regular runs share the results store. A
+dashboard follows a running backtest by reading the same files:
+
+    python run_backtest.py --stream --start 2020-01-01 --end 2023-01-01
+    python -m backtests.streaming parquet_out/runs/backtest/<instance id>
+"""
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from nautilus_trader.backtest.config import BacktestRunConfig
+from nautilus_trader.backtest.engine import BacktestEngine
+from nautilus_trader.model.events import AccountState
+from nautilus_trader.model.events import OrderFilled
+from nautilus_trader.model.events import PositionChanged
+from nautilus_trader.model.events import PositionClosed
+from nautilus_trader.model.events import PositionOpened
+from nautilus_trader.model.objects import Currency
+from nautilus_trader.persistence.config import StreamingConfig
+from nautilus_trader.persistence.funcs import class_to_filename
+
+from analytics.metrics import parse_money, run_metrics
+from backtests.cache import CachedRun
+from catalog.tickcache import TickCacheNode
+
+STREAM_TYPES = [OrderFilled, PositionOpened, PositionChanged, PositionClosed, AccountState]
+# Report names, as in the results store, of the streamed event tables
+STREAM_REPORTS = {
+    "fills": OrderFilled,
+    "positions_opened": PositionOpened,
+    "positions_changed": PositionChanged,
+    "positions": PositionClosed,
+    "account": AccountState,
+}
+# Simulated time between flushes
+FLUSH_MS = 3_600_000
+# Account events kept in the engine cache
+ACCOUNT_LOOKBACK_SECS = 3600
+FOLLOW_SECONDS = 5.0
+# Columns of the engine reports (`analytics.results.generate_reports`) rebuilt from the stream
+FILLS_COLUMNS = [
+    "client_order_id", "trader_id", "strategy_id", "instrument_id", "venue_order_id", "account_id", "trade_id",
+    "position_id", "order_side", "order_type", "last_qty", "last_px", "currency", "commission", "liquidity_side",
+    "event_id", "ts_event", "ts_init", "info", "reconciliation",
+]
+ORDER_FILLS_COLUMNS = [
+    "client_order_id", "trader_id", "strategy_id", "instrument_id", "venue_order_id", "position_id", "account_id",
+    "last_trade_id", "type", "side", "quantity", "time_in_force", "is_reduce_only", "is_quote_quantity",
+    "filled_qty", "liquidity_side", "avg_px", "slippage", "commissions", "emulation_trigger", "status",
+    "contingency_type", "order_list_id", "linked_order_ids", "parent_order_id", "exec_algorithm_id",
+    "exec_algorithm_params", "exec_spawn_id", "tags", "init_id", "ts_init", "ts_last",
+]
+POSITIONS_COLUMNS = [
+    "position_id", "trader_id", "strategy_id", "instrument_id", "account_id", "opening_order_id",
+    "closing_order_id", "entry", "side", "quantity", "peak_qty", "ts_init", "ts_opened", "ts_last", "ts_closed",
+    "duration_ns", "avg_px_open", "avg_px_close", "commissions", "realized_return", "realized_pnl", "is_snapshot",
+]
+ACCOUNT_COLUMNS = [
+    "ts_event", "total", "locked", "free", "currency", "account_id", "account_type", "base_currency", "margins",
+    "reported", "info",
+]
+# Report columns the stream has no value for, by type
+_BOOL_COLUMNS = {"is_reduce_only", "is_quote_quantity"}
+_FLOAT_COLUMNS = {"slippage"}
+
+
+def streaming_config(results_path: str | Path, flush_interval_ms: int = FLUSH_MS) -> StreamingConfig:
+    """Write fills, position events and account states under `<results_path>/backtest/`."""
+    return StreamingConfig(
+        catalog_path=str(results_path),
+        flush_interval_ms=flush_interval_ms,
+        include_types=STREAM_TYPES,
+    )
+
+
+def _read_table(files: list[Path]) -> pa.Table | None:
+    batches = []
+    for path in files:
+        with pa.OSFile(str(path)) as source:
+            try:
+                reader = pa.ipc.open_stream(source)
+                # A file being written ends in a partial batch: stop before it
+                while True:
+                    batches.append(reader.read_next_batch())
+            except (StopIteration, pa.ArrowInvalid):
+                pass
+    return pa.Table.from_batches(batches) if batches else None
+
+
+def read_stream(path: str | Path) -> dict[str, pd.DataFrame]:
+    """
+    The events streamed so far by a running or finished backtest, by report name.
+
+    Fills and account states are published on more than one topic, so they
+    are written more than once; duplicates are dropped by event id.
+    """
+    path = Path(path)
+    reports = {}
+    for name, cls in STREAM_REPORTS.items():
+        # Rotated files are numbered in write order
+        files = sorted(path.glob(f"{class_to_filename(cls)}_*.feather"), key=lambda f: int(f.stem.rsplit("_", 1)[1]))
+        table = _read_table(files)
+        if table is None:
+            reports[name] = pd.DataFrame()
+            continue
+        df = table.drop_columns([c for c in ("info",) if c in table.column_names]).to_pandas()
+        reports[name] = df.drop_duplicates("event_id", ignore_index=True)
+    return reports
+
+
+def _decode(df: pd.DataFrame) -> pd.DataFrame:
+    # Dictionary-encoded columns arrive as categoricals
+    return df.astype({c: object for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)})
+
+
+def _datetime(ns: pd.Series) -> pd.Series:
+    return pd.to_datetime(ns.astype("int64"), utc=True)
+
+
+def _quantity(values: pd.Series) -> pd.Series:
+    return values.map(lambda v: np.format_float_positional(v, trim="-"))
+
+
+def _amount(values: pd.Series, currencies: pd.Series, suffix: bool = True) -> pd.Series:
+    # Formatted as nautilus Money: "1.23 USD" (or "1.23" with `suffix=False`)
+    precision = {c: Currency.from_str(c).precision for c in currencies.dropna().unique()}
+    return pd.Series(
+        [
+            f"{v:.{precision[c]}f} {c}" if suffix else f"{v:.{precision[c]}f}"
+            for v, c in zip(values, currencies)
+        ],
+        index=values.index,
+        dtype=object,
+    )
+
+
+def _reindex(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    for column in columns:
+        if column not in df:
+            if column in _BOOL_COLUMNS:
+                df[column] = pd.array([pd.NA] * len(df), dtype="boolean")
+            elif column in _FLOAT_COLUMNS:
+                df[column] = np.nan
+            else:
+                df[column] = None
+    return df[columns]
+
+
+def _order_commissions(fills: pd.DataFrame) -> pd.DataFrame:
+    commission = fills["commission"].str.split(" ", n=1, expand=True)
+    frame = pd.DataFrame({
+        "client_order_id": fills["client_order_id"],
+        "amount": parse_money(commission[0]),
+        "currency": commission[1],
+    })
+    return frame.groupby("client_order_id", sort=False).agg(amount=("amount", "sum"), currency=("currency", "last"))
+
+
+def stream_reports(reports: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+    """
+    The `fills`, `order_fills`, closed `positions` and `account` of `read_stream`, as engine reports.
+
+    Columns, names and types match `analytics.results.generate_reports`; values
+    the events don't carry (order flags, time in force, margins) are left
+    empty. Closed positions are snapshots, and their commissions are those of
+    the opening and closing orders.
+    """
+    fills = _decode(reports["fills"])
+    positions = _decode(reports["positions"])
+    account = _decode(reports["account"])
+    commissions = _order_commissions(fills) if not fills.empty else pd.DataFrame(columns=["amount", "currency"])
+    out = {}
+
+    fills_report = fills.assign(ts_event=_datetime(fills["ts_event"]), ts_init=_datetime(fills["ts_init"]))
+    out["fills"] = _reindex(fills_report, FILLS_COLUMNS) if not fills.empty else pd.DataFrame()
+
+    if fills.empty:
+        out["order_fills"] = pd.DataFrame()
+    else:
+        qty = parse_money(fills["last_qty"])
+        by_order = fills.assign(qty=qty, notional=qty * parse_money(fills["last_px"])).groupby("client_order_id", sort=False)
+        first, last, total = by_order.first(), by_order.last(), by_order[["qty", "notional"]].sum()
+        order_fills = pd.DataFrame({
+            **{c: last[c] for c in ("trader_id", "strategy_id", "instrument_id", "venue_order_id", "position_id", "account_id")},
+            "last_trade_id": last["trade_id"],
+            "type": first["order_type"],
+            "side": first["order_side"],
+            "quantity": _quantity(total["qty"]),
+            "filled_qty": _quantity(total["qty"]),
+            "liquidity_side": last["liquidity_side"],
+            "avg_px": total["notional"] / total["qty"],
+            "commissions": _amount(commissions["amount"], commissions["currency"]),
+            "status": "FILLED",
+            "ts_init": _datetime(first["ts_event"]),
+            "ts_last": _datetime(last["ts_event"]),
+        }).reset_index(names="client_order_id")
+        out["order_fills"] = _reindex(order_fills, ORDER_FILLS_COLUMNS)
+
+    if positions.empty:
+        out["positions"] = pd.DataFrame()
+    else:
+        paid = (
+            positions["opening_order_id"].map(commissions["amount"]).fillna(0.0)
+            + positions["closing_order_id"].map(commissions["amount"]).fillna(0.0)
+        )
+        out["positions"] = _reindex(positions.assign(
+            quantity=_quantity(positions["quantity"]),
+            peak_qty=_quantity(positions["peak_qty"]),
+            ts_init=positions["ts_opened"].astype("int64"),
+            ts_opened=_datetime(positions["ts_opened"]),
+            ts_last=positions["ts_closed"].astype("int64"),
+            ts_closed=_datetime(positions["ts_closed"]),
+            duration_ns=positions["duration_ns"].astype("int64"),
+            commissions=_amount(paid, positions["currency"]),
+            realized_pnl=_amount(positions["realized_pnl"], positions["currency"]),
+            is_snapshot=True,
+        ), POSITIONS_COLUMNS)
+
+    if account.empty:
+        out["account"] = pd.DataFrame()
+    else:
+        currency = account["balance_currency"]
+        out["account"] = _reindex(account.assign(
+            ts_event=_datetime(account["ts_event"]),
+            total=_amount(account["balance_total"], currency, suffix=False),
+            locked=_amount(account["balance_locked"], currency, suffix=False),
+            free=_amount(account["balance_free"], currency, suffix=False),
+            currency=currency,
+        ), ACCOUNT_COLUMNS)
+    return out
+
+
+def stream_summary(reports: dict[str, pd.DataFrame]) -> dict:
+    """Progress of a streamed run: simulated time, fills, closed positions, PnL and balance."""
+    account, positions = reports["account"], reports["positions"]
+    last = max((df["ts_init"].max() for df in reports.values() if not df.empty), default=None)
+    return {
+        "time": pd.Timestamp(last, tz="UTC") if last is not None else None,
+        "fills": len(reports["fills"]),
+        "closed_positions": len(positions),
+        "realized_pnl": float(positions["realized_pnl"].sum()) if not positions.empty else 0.0,
+        "balance": float(account["balance_total"].iloc[-1]) if not account.empty else None,
+    }
+
+
+class StreamingNode(TickCacheNode):
+    """
+    TickCacheNode that keeps the engine cache bounded between batches.
+
+    Closed orders and positions (with their snapshots) and account events
+    older than `ACCOUNT_LOOKBACK_SECS` are purged after every batch. The
+    stream directory of every run is kept in `stream_paths`, by run config id.
+    """
+
+    def __init__(self, configs):
+        super().__init__(configs=configs)
+        self.stream_paths: dict[str, Path] = {}
+
+    def on_batch(self, run_config_id: str, engine: BacktestEngine):
+        if run_config_id not in self.stream_paths and engine.kernel.writer is not None:
+            self.stream_paths[run_config_id] = Path(engine.kernel.writer.path)
+            print(f"Streaming results to {engine.kernel.writer.path}", flush=True)
+        now = engine.kernel.clock.timestamp_ns()
+        engine.cache.purge_closed_orders(now)
+        engine.cache.purge_closed_positions(now)
+        engine.cache.purge_account_events(now, ACCOUNT_LOOKBACK_SECS)
+
+
+def run_streaming(config: BacktestRunConfig) -> CachedRun:
+    """
+    Run `config` (with `streaming` set) on a StreamingNode; reports and stats come from the stream.
+
+    Reports are `stream_reports` of the stream: `fills`, `order_fills`, closed
+    `positions` and `account`, in the schema of a regular run; stats are
+    `analytics.metrics.run_metrics` of the closed positions.
+    """
+    if config.engine.streaming is None:
+        raise ValueError("Run config has no streaming config")
+    node = StreamingNode(configs=[config])
+    results = node.run()
+    engine = node.get_engine(config.id)
+    path = node.stream_paths.get(config.id) or Path(engine.kernel.writer.path)
+    node.dispose()
+    if not results:
+        raise RuntimeError(f"Backtest {config.id} produced no result")
+
+    streamed = read_stream(path)
+    reports = stream_reports(streamed)
+    stats = {}
+    if not reports["positions"].empty and not reports["account"].empty:
+        starting = float(streamed["account"]["balance_total"].iloc[0])
+        stats = run_metrics(reports["positions"], starting).to_dict()
+    return CachedRun(result=results[0], reports=reports, stats=stats)
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Follow the results streamed by a running backtest")
+    parser.add_argument("path", help="stream directory, <results>/backtest/<instance id>")
+    parser.add_argument("--interval", type=float, default=FOLLOW_SECONDS, help="seconds between reads")
+    parser.add_argument("--once", action="store_true", help="print the current state and exit")
+    args = parser.parse_args(argv)
+
+    while True:
+        summary = stream_summary(read_stream(args.path))
+        print("  ".join(f"{name}={value}" for name, value in summary.items()), flush=True)
+        if args.once:
+            return
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
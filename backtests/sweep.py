@@ -0,0 +1,272 @@
+"""
+Parallel parameter sweep for MACDStrategy.
+
+Every point of a parameter grid (or a random / Latin-hypercube sample) becomes
+its own `BacktestRunConfig` via `get_backtest_config`. The configs are run in a
+process pool; each worker decodes the catalog data once and reuses it for all
+the configs it receives.
+
+    python -m backtests.sweep --grid fast_period=8,12,16 --grid slow_period=20,26,32
+    python -m backtests.sweep --lhs 500 --range fast_period=4:30 --range slow_period=10:120
+    python -m backtests.sweep --lhs 81 --range fast_period=4:30 --range slow_period=10:120 --halving 3
+"""
+import argparse
+import itertools
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+
+from nautilus_trader.backtest.config import BacktestDataConfig
+from nautilus_trader.backtest.config import BacktestRunConfig
+from nautilus_trader.backtest.node import BacktestNode
+from nautilus_trader.backtest.node import get_instrument_ids
+from nautilus_trader.config import LoggingConfig
+from nautilus_trader.persistence.catalog.types import CatalogDataResult
+
+from backtests.cache import ResultCache, run_cached
+from configs.backtest import get_backtest_config
+from configs.parquet_data import ParquetConfig, PARQUET_DATA, PARQUET_RESULTS
+
+
+# Sweeps log to stdout only: N workers must not truncate the same log file
+SWEEP_LOGGING = LoggingConfig(log_level="ERROR")
+# Decoded data slices a worker keeps between runs
+DATA_CACHE_SIZE = 2
+
+
+def grid(space: dict[str, list]) -> list[dict]:
+    """Return the cartesian product of the given parameter values."""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*space.values())]
+
+
+def random_sample(space: dict[str, tuple[int, int]], n: int, seed: int | None = None) -> list[dict]:
+    """Draw `n` points uniformly from the inclusive integer ranges in `space`."""
+    rng = np.random.default_rng(seed)
+    columns = {name: rng.integers(lo, hi, size=n, endpoint=True) for name, (lo, hi) in space.items()}
+    return [{name: int(columns[name][i]) for name in space} for i in range(n)]
+
+
+def latin_hypercube(space: dict[str, tuple[int, int]], n: int, seed: int | None = None) -> list[dict]:
+    """Draw `n` Latin-hypercube points from the inclusive integer ranges in `space`."""
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, (lo, hi) in space.items():
+        # One sample per stratum, strata shuffled independently per dimension
+        u = (rng.permutation(n) + rng.random(n)) / n
+        columns[name] = np.floor(lo + u * (hi - lo + 1)).astype(int)
+    return [{name: int(columns[name][i]) for name in space} for i in range(n)]
+
+
+def valid_periods(point: dict) -> bool:
+    """Whether a point's fast_period is below its slow_period (MACD, SMA cross); points without both pass."""
+    fast = point.get("fast_period")
+    slow = point.get("slow_period")
+    return fast is None or slow is None or fast < slow
+
+
+def make_configs(data: ParquetConfig, results: ParquetConfig, points: list[dict]) -> list[BacktestRunConfig]:
+    """Build one run config per parameter point."""
+    instrument_id = data.instrument_ids()[0]
+    return [
+        get_backtest_config(data, results, strategy_config=point, instrument_id=instrument_id, logging=SWEEP_LOGGING)
+        for point in points
+    ]
+
+
+class CachedDataNode(BacktestNode):
+    """
+    BacktestNode that keeps decoded catalog data in the process between runs.
+
+    Sweep configs only differ in strategy parameters, so every config after the
+    first one in a worker reuses the already materialized ticks. At most
+    `max_cached` slices are kept; the least recently used one is dropped first.
+    """
+
+    _data_cache: OrderedDict[tuple, CatalogDataResult] = OrderedDict()
+    max_cached: int = DATA_CACHE_SIZE
+
+    @classmethod
+    def load_data_config(
+        cls,
+        config: BacktestDataConfig,
+        start: str | int | None = None,
+        end: str | int | None = None,
+    ) -> CatalogDataResult:
+        key = (config.json(), start, end)
+        if key in cls._data_cache:
+            cls._data_cache.move_to_end(key)
+            return cls._data_cache[key]
+        result = cls._data_cache[key] = super().load_data_config(config, start, end)
+        while len(cls._data_cache) > cls.max_cached:
+            cls._data_cache.popitem(last=False)
+        return result
+
+
+def summarize(result) -> dict:
+    """Flatten a BacktestResult into one summary row."""
+    row = {
+        "iterations": result.iterations,
+        "total_orders": result.total_orders,
+        "total_positions": result.total_positions,
+        "run_seconds": (result.run_finished - result.run_started) / 1e9,
+    }
+    for currency, stats in result.stats_pnls.items():
+        row.update({f"{currency} {name}": value for name, value in stats.items()})
+    row.update(result.stats_returns)
+    return row
+
+
+def _run_point(
+    point: dict,
+    config: BacktestRunConfig,
+    cache_dir: str | None = None,
+    tick_cache: bool = False,
+    prune=None,
+) -> dict:
+    from backtests.pruning import PruningNode
+    from catalog.tickcache import TickCacheNode
+
+    node_cls = TickCacheNode if tick_cache else CachedDataNode
+    node = None
+    try:
+        if prune is not None:
+            # Not cached: the cache key doesn't cover the pruning rule
+            node = PruningNode(configs=[config], rule=prune)
+            results = node.run()
+            if not results:
+                return {**point, "error": "backtest produced no result"}
+            return {**point, **summarize(results[0]), "pruned": node.pruned.get(config.id), "error": None}
+
+        if cache_dir is not None:
+            run = run_cached(config, ResultCache(cache_dir), node_cls=node_cls)
+            return {**point, **summarize(run.result), "cached": run.hit, "error": None}
+
+        node = node_cls(configs=[config])
+        results = node.run()
+        if not results:
+            return {**point, "error": "backtest produced no result"}
+        return {**point, **summarize(results[0]), "error": None}
+    except Exception as e:
+        return {**point, "error": repr(e)}
+    finally:
+        if node is not None:
+            node.dispose()
+
+
+def run_sweep(
+    configs: list[BacktestRunConfig],
+    points: list[dict],
+    processes: int | None = None,
+    cache_dir: str | None = None,
+    tick_cache: bool = False,
+    prune=None,
+) -> pd.DataFrame:
+    """
+    Run the configs in a process pool and collect one summary row per point.
+
+    With `cache_dir`, points already run on the same catalog data are read
+    from the result cache instead. With `tick_cache`, workers stream quotes
+    from the shared memory-mapped tick cache instead of each decoding the
+    catalog. A `PruneRule` as `prune` ends losing runs early (see
+    `backtests.pruning`; implies the tick cache) and adds a `pruned` column. The
+    returned table is indexed by the swept parameter names.
+    """
+    processes = processes or os.cpu_count()
+    tick_cache = tick_cache or prune is not None
+    if tick_cache:
+        from catalog.tickcache import build_tick_cache
+
+        # Built once here; workers only map the finished files
+        for data_config in {c.json(): c for config in configs for c in config.data}.values():
+            for instrument_id in get_instrument_ids(data_config):
+                build_tick_cache(data_config.catalog_path, instrument_id)
+    # Spawn, not fork: the Rust runtime inside nautilus is not fork-safe
+    with ProcessPoolExecutor(max_workers=processes, mp_context=get_context("spawn")) as pool:
+        chunksize = max(1, len(points) // (processes * 4))
+        rows = list(pool.map(
+            _run_point,
+            points,
+            configs,
+            itertools.repeat(cache_dir),
+            itertools.repeat(tick_cache),
+            itertools.repeat(prune),
+            chunksize=chunksize,
+        ))
+
+    summary = pd.DataFrame(rows)
+    names = list(points[0]) if points else []
+    return summary.set_index(names) if names else summary
+
+
+def _parse_values(items: list[str]) -> dict[str, list[int]]:
+    return {name: [int(v) for v in values.split(",")] for name, values in (i.split("=", 1) for i in items)}
+
+
+def _parse_ranges(items: list[str]) -> dict[str, tuple[int, int]]:
+    ranges = {}
+    for name, bounds in (i.split("=", 1) for i in items):
+        lo, hi = bounds.split(":")
+        ranges[name] = (int(lo), int(hi))
+    return ranges
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Parallel MACDStrategy parameter sweep")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2,...")
+    parser.add_argument("--range", action="append", default=[], metavar="NAME=LO:HI")
+    parser.add_argument("--random", type=int, metavar="N", help="sample N points uniformly from --range")
+    parser.add_argument("--lhs", type=int, metavar="N", help="sample N Latin-hypercube points from --range")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--output", default="sweep.parquet")
+    parser.add_argument("--cache", metavar="DIR", help="reuse results of identical earlier runs from this cache")
+    parser.add_argument("--tick-cache", action="store_true", help="stream quotes from the memory-mapped tick cache")
+    parser.add_argument("--max-drawdown", type=float, help="stop runs whose drawdown exceeds this fraction")
+    parser.add_argument("--min-return", type=float, help="stop runs whose return falls below this fraction")
+    parser.add_argument("--halving", type=int, metavar="ETA", help="successive halving, keeping 1/ETA per rung")
+    parser.add_argument("--min-budget", type=float, help="window fraction of the first halving rung")
+    args = parser.parse_args(argv)
+
+    if args.lhs:
+        points = latin_hypercube(_parse_ranges(args.range), args.lhs, args.seed)
+    elif args.random:
+        points = random_sample(_parse_ranges(args.range), args.random, args.seed)
+    else:
+        points = grid(_parse_values(args.grid))
+    points = [p for p in points if valid_periods(p)]
+
+    data = ParquetConfig(PARQUET_DATA, "data")
+    results = ParquetConfig(PARQUET_RESULTS, "sweep")
+
+    prune = None
+    if args.max_drawdown is not None or args.min_return is not None or args.halving:
+        from backtests.pruning import PruneRule
+
+        prune = PruneRule(max_drawdown=args.max_drawdown, min_return=args.min_return)
+
+    if args.halving:
+        from backtests.pruning import successive_halving
+
+        summary = successive_halving(
+            data, results, points, args.halving, args.min_budget, prune, args.processes
+        )
+    else:
+        configs = make_configs(data, results, points)
+        print(f"Running {len(configs)} configs on {args.processes} processes...")
+        summary = run_sweep(configs, points, args.processes, args.cache, args.tick_cache, prune)
+    summary.to_parquet(args.output)
+
+    # Halving results are already ranked by rung reached, then score
+    if "USD PnL (total)" in summary and not args.halving:
+        summary = summary.sort_values("USD PnL (total)", ascending=False)
+    print(summary.head(20).to_string())
+    print(f"\nSummary written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
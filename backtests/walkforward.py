@@ -0,0 +1,250 @@
+"""
+Walk-forward MACDStrategy backtests.
+
+The catalog's available quote range is split into rolling train/test windows:
+
+    |-- train --|-- test --|
+          |-- train --|-- test --|
+                |-- train --|-- test --|
+
+On every train window the parameter grid is ranked with the vectorized
+`MACDScreener`; the best set is then run through a full `BacktestNode` on the
+following test window. Windows are independent and run concurrently in worker
+processes. Each worker reads only its own slice of the catalog (a filtered
+parquet scan for the train part, `start_time`/`end_time` on the data config for
+the test part), so memory scales with the window size, not with the history.
+
+The out-of-sample positions of all test windows are stitched into one realized
+equity curve. With `--anchored` every train window starts at the beginning of
+the data (expanding window).
+
+    python -m backtests.walkforward --train 3D --test 1D --grid fast_period=4,8,12 --grid slow_period=20,26,40
+    python -m backtests.walkforward --train 5D --test 2D --step 1D --anchored --processes 4
+"""
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import get_context
+
+import pandas as pd
+
+from nautilus_trader.model import QuoteTick
+from nautilus_trader.model.identifiers import InstrumentId
+from nautilus_trader.model.objects import Money
+
+from analytics.metrics import equity_curve, run_metrics
+from backtests.cache import ResultCache, run_cached
+from backtests.screener import MACDScreener, load_quotes
+from backtests.sweep import SWEEP_LOGGING, grid, valid_periods, _parse_values
+from configs.backtest import get_backtest_config
+from configs.parquet_data import ParquetConfig, PARQUET_DATA
+
+
+@dataclass(frozen=True)
+class Window:
+    """One train/test split; bounds are inclusive UNIX nanoseconds."""
+
+    index: int
+    train_start: int
+    train_end: int
+    test_start: int
+    test_end: int
+
+
+def _iso(ns: int) -> str:
+    return pd.Timestamp(ns, tz="UTC").isoformat()
+
+
+def catalog_range(data: ParquetConfig, instrument_id) -> tuple[int, int]:
+    """First and last quote timestamp of an instrument in the catalog."""
+    intervals = data.catalog.get_intervals(QuoteTick, str(instrument_id))
+    if not intervals:
+        raise ValueError(f"No quote ticks for {instrument_id} in {data.path}")
+    return min(i[0] for i in intervals), max(i[1] for i in intervals)
+
+
+def walk_forward_windows(
+    start: int,
+    end: int,
+    train: pd.Timedelta,
+    test: pd.Timedelta,
+    step: pd.Timedelta | None = None,
+    anchored: bool = False,
+) -> list[Window]:
+    """
+    Split `[start, end]` into train/test windows.
+
+    Windows advance by `step` (default: `test`, so test windows tile the range
+    without overlap). Every test window starts before `end`; the last one is
+    cut at `end`.
+    """
+    step = step or test
+    if train.value <= 0 or test.value <= 0 or step.value <= 0:
+        raise ValueError("train, test and step must be positive")
+
+    windows = []
+    offset = start
+    while offset + train.value < end:
+        test_start = offset + train.value
+        test_end = min(test_start + test.value - 1, end)
+        if test_end == end - 1 and test_start + step.value >= end:
+            # Instead of a next window holding only `end` itself
+            test_end = end
+        windows.append(Window(
+            index=len(windows),
+            train_start=start if anchored else offset,
+            train_end=test_start - 1,
+            test_start=test_start,
+            test_end=test_end,
+        ))
+        offset += step.value
+    return windows
+
+
+def _run_window(
+    window: Window,
+    catalog_path: str,
+    instrument_id: str,
+    points: list[dict],
+    fee_rate: float,
+    cache_dir: str | None = None,
+) -> tuple[dict, pd.DataFrame]:
+    row = {
+        "window": window.index,
+        "train_start": pd.Timestamp(window.train_start, tz="UTC"),
+        "test_start": pd.Timestamp(window.test_start, tz="UTC"),
+        "test_end": pd.Timestamp(window.test_end, tz="UTC"),
+    }
+    try:
+        quotes = load_quotes(catalog_path, instrument_id, window.train_start, window.train_end)
+        ranked = MACDScreener(quotes, fee_rate=fee_rate).screen(points)
+        best = ranked.iloc[0]
+        params = {"fast_period": int(best["fast_period"]), "slow_period": int(best["slow_period"])}
+        row.update(params, train_pnl=best["pnl"], train_ticks=len(quotes))
+        del quotes, ranked
+
+        data = ParquetConfig(os.path.dirname(catalog_path), os.path.basename(catalog_path))
+        config = get_backtest_config(
+            data,
+            data,
+            strategy_config=params,
+            instrument_id=InstrumentId.from_str(instrument_id),
+            start_time=_iso(window.test_start),
+            end_time=_iso(window.test_end),
+            logging=SWEEP_LOGGING,
+        )
+        run = run_cached(config, ResultCache(cache_dir) if cache_dir else None)
+    except Exception as e:
+        return {**row, "error": repr(e)}, pd.DataFrame()
+
+    positions = run.reports["positions"]
+    row.update(
+        test_ticks=run.result.iterations,
+        test_orders=run.result.total_orders,
+        test_positions=run.result.total_positions,
+        test_pnl=run.stats.get("USD PnL (total)"),
+        error=None,
+    )
+    return row, positions.assign(window=window.index)
+
+
+def run_walk_forward(
+    data: ParquetConfig,
+    windows: list[Window],
+    points: list[dict],
+    instrument_id=None,
+    processes: int | None = None,
+    cache_dir: str | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Optimize on every train window and run the winner on its test window.
+
+    Returns one summary row per window and the out-of-sample positions of all
+    test windows (with a `window` column), in window order.
+    """
+    instruments = data.catalog.instruments(instrument_ids=[str(instrument_id)] if instrument_id else None)
+    if not instruments:
+        raise ValueError(f"Instrument {instrument_id} not found in {data.path}")
+    instrument = instruments[0]
+    processes = processes or os.cpu_count()
+    # Spawn, not fork: the Rust runtime inside nautilus is not fork-safe
+    with ProcessPoolExecutor(max_workers=processes, mp_context=get_context("spawn")) as pool:
+        results = list(pool.map(
+            _run_window,
+            windows,
+            itertools.repeat(str(data.path)),
+            itertools.repeat(str(instrument.id)),
+            itertools.repeat(points),
+            itertools.repeat(float(instrument.taker_fee)),
+            itertools.repeat(cache_dir),
+        ))
+
+    summary = pd.DataFrame([row for row, _ in results]).set_index("window")
+    frames = [positions for _, positions in results if not positions.empty]
+    positions = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return summary, positions
+
+
+def stitch_equity(positions: pd.DataFrame, starting_balance: float) -> pd.DataFrame:
+    """
+    One realized equity curve over all out-of-sample windows.
+
+    Every test run starts from the same balance, so the windows' realized PnL
+    is chained in close order rather than restarting at each window.
+    """
+    if positions.empty:
+        return pd.DataFrame({"ts": pd.Series(dtype="datetime64[ns, UTC]"), "equity": pd.Series(dtype="float64")})
+    curve = equity_curve(positions, starting_balance)
+    closed = positions[positions["ts_closed"].notna()]
+    windows = closed.assign(ts=pd.to_datetime(closed["ts_closed"], utc=True)).sort_values("ts", kind="stable")
+    curve["window"] = windows["window"].to_numpy()
+    return curve
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Walk-forward MACDStrategy optimization")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2,...")
+    parser.add_argument("--train", default="3D", help="train window length, e.g. 3D or 12h")
+    parser.add_argument("--test", default="1D", help="test window length")
+    parser.add_argument("--step", help="window advance; default: --test")
+    parser.add_argument("--anchored", action="store_true", help="expanding train windows from the start of the data")
+    parser.add_argument("--instrument", help="instrument id; default: first instrument in the catalog")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--cache", metavar="DIR", help="reuse test-window results from this cache")
+    parser.add_argument("--output", default="walkforward.parquet")
+    parser.add_argument("--equity-output", default="walkforward_equity.parquet")
+    args = parser.parse_args(argv)
+
+    points = [p for p in grid(_parse_values(args.grid or ["fast_period=8,12,16", "slow_period=20,26,40"])) if valid_periods(p)]
+    data = ParquetConfig(PARQUET_DATA, "data")
+    instrument_id = args.instrument or data.catalog.instruments()[0].id
+
+    start, end = catalog_range(data, instrument_id)
+    windows = walk_forward_windows(
+        start,
+        end,
+        pd.Timedelta(args.train),
+        pd.Timedelta(args.test),
+        pd.Timedelta(args.step) if args.step else None,
+        args.anchored,
+    )
+    print(f"{len(windows)} windows over {_iso(start)} .. {_iso(end)}, {len(points)} parameter sets")
+
+    summary, positions = run_walk_forward(data, windows, points, instrument_id, args.processes, args.cache)
+    summary.to_parquet(args.output)
+    print(summary.to_string())
+
+    starting_balance = Money.from_str(get_backtest_config(data, data, instrument_id=instrument_id).venues[0].starting_balances[0]).as_double()
+    curve = stitch_equity(positions, starting_balance)
+    curve.to_parquet(args.equity_output, index=False)
+
+    if not positions.empty:
+        print("\n=== OUT-OF-SAMPLE PERFORMANCE ===")
+        print(run_metrics(positions, starting_balance).to_string())
+    print(f"\nWindows written to {args.output}, equity curve to {args.equity_output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Tick-to-bar pre-aggregation.
+
+Aggregates the catalog's `QuoteTick` data into time bars (e.g. 1s/1m/5m/1h,
+MID/BID/ASK) and writes them back to the catalog as EXTERNAL bar types, so
+bar-based strategies load bars instead of replaying every tick through the
+engine's aggregators:
+
+    EUR/USD.SIM-1-MINUTE-MID-EXTERNAL
+
+Bars follow nautilus time-bar semantics: a bar covers `(close - step, close]`,
+is timestamped at its close, and intervals without ticks produce no bar. Volume
+is the summed quote size of the price side (the mean of both sides for MID).
+Prices are rounded to the instrument precision by `BarDataWrangler`.
+
+Ticks are read in day-aligned slices and binned with NumPy, so memory depends on
+`chunk`, not on the history. Updates are incremental: only ticks after the last
+stored bar are aggregated (that bar is rebuilt, since it may have been partial).
+Bars of tick ranges that are apart by at least a bar step are written to
+separate files, so ticks backfilled into such a gap, or older than the first
+stored bar, show up as uncovered and trigger a full rebuild of that bar type.
+
+    python -m catalog.bars --steps 1m 5m 1h --price-types MID
+    python -m catalog.bars --steps 1s --price-types BID ASK --rebuild
+"""
+import argparse
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from nautilus_trader.model.data import Bar
+from nautilus_trader.model.data import BarSpecification
+from nautilus_trader.model.data import BarType
+from nautilus_trader.model.enums import AggregationSource
+from nautilus_trader.model.enums import BarAggregation
+from nautilus_trader.model.enums import PriceType
+from nautilus_trader.model.identifiers import InstrumentId
+from nautilus_trader.model.instruments import Instrument
+from nautilus_trader.model import QuoteTick
+from nautilus_trader.persistence.wranglers import BarDataWrangler
+
+from backtests.screener import load_quotes
+from catalog.ingest import CHUNK_SIZE
+from configs.parquet_data import ParquetConfig, PARQUET_DATA
+
+STEP_UNITS = {"s": BarAggregation.SECOND, "m": BarAggregation.MINUTE, "h": BarAggregation.HOUR}
+CHUNK = pd.Timedelta("1D")
+
+
+@dataclass(frozen=True)
+class BarUpdate:
+    """What `build_bars` did to one bar type."""
+
+    written: int = 0
+    # The stored bars were dropped and built again from all ticks
+    rebuilt: bool = False
+
+
+def bar_type(instrument_id: InstrumentId, step: str, price_type: str = "MID") -> BarType:
+    """EXTERNAL time bar type for a step such as `1s`, `5m` or `1h`."""
+    spec = BarSpecification(int(step[:-1]), STEP_UNITS[step[-1]], PriceType[price_type])
+    return BarType(instrument_id, spec, AggregationSource.EXTERNAL)
+
+
+def step_nanos(bar_type: BarType) -> int:
+    return pd.Timedelta(bar_type.spec.timedelta).value
+
+
+def _label(ts, step: int):
+    # Close time of the bar holding a tick at `ts` (an int or an array): intervals
+    # are (close - step, close], so a tick at exactly `t` closes the bar labelled `t`
+    return ((ts - 1) // step + 1) * step
+
+
+def aggregate_bars(quotes: pd.DataFrame, step: int, price_type: PriceType) -> pd.DataFrame:
+    """
+    Bin quotes (as returned by `load_quotes(..., sizes=True)`) into OHLCV bars of `step` ns.
+
+    Returns a frame indexed by the bar close time, ready for `BarDataWrangler`.
+    """
+    if price_type == PriceType.BID:
+        price, size = quotes["bid"].to_numpy(), quotes["bid_size"].to_numpy()
+    elif price_type == PriceType.ASK:
+        price, size = quotes["ask"].to_numpy(), quotes["ask_size"].to_numpy()
+    else:
+        price = (quotes["bid"].to_numpy() + quotes["ask"].to_numpy()) / 2
+        size = (quotes["bid_size"].to_numpy() + quotes["ask_size"].to_numpy()) / 2
+
+    if len(price) == 0:
+        return pd.DataFrame(columns=["open", "high", "low", "close", "volume"], dtype="float64")
+
+    labels = _label(quotes["ts_init"].to_numpy(), step)
+    starts = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]])
+    ends = np.r_[starts[1:], len(price)] - 1
+    return pd.DataFrame(
+        {
+            "open": price[starts],
+            "high": np.maximum.reduceat(price, starts),
+            "low": np.minimum.reduceat(price, starts),
+            "close": price[ends],
+            "volume": np.add.reduceat(size, starts),
+        },
+        index=pd.to_datetime(labels[starts], utc=True),
+    )
+
+
+def tick_ranges(intervals: list[tuple[int, int]], step: int) -> list[tuple[int, int]]:
+    """Tick file intervals merged across gaps shorter than a bar `step`."""
+    ranges = []
+    for start, end in sorted(intervals):
+        if ranges and start - ranges[-1][1] < step:
+            ranges[-1] = (ranges[-1][0], max(ranges[-1][1], end))
+        else:
+            ranges.append((start, end))
+    return ranges
+
+
+def _pending_start(
+    data: ParquetConfig, bar_type: BarType, ranges: list[tuple[int, int]], rebuild: bool
+) -> tuple[int | None, bool]:
+    """
+    Exclusive tick timestamp to aggregate `bar_type` from (None if it is up to
+    date), and whether the stored bars were dropped for a full rebuild.
+    """
+    step = step_nanos(bar_type)
+    tick_start, tick_end = ranges[0][0], ranges[-1][1]
+    intervals = data.catalog.get_intervals(Bar, str(bar_type))
+    last = max((end for _, end in intervals), default=None)
+
+    def covered(ts: int) -> bool:
+        return any(start <= _label(ts, step) <= end for start, end in intervals)
+
+    # Every tick range up to the last bar must have bars at both ends
+    if intervals and not rebuild and any(
+        not covered(start) or (end <= last and not covered(end)) for start, end in ranges if start <= last
+    ):
+        rebuild = True
+
+    if not intervals or rebuild:
+        if intervals:
+            data.catalog.delete_data_range(Bar, str(bar_type))
+        return tick_start - 1, bool(intervals)
+
+    if tick_end <= last:
+        return None, False
+    # The last stored bar may have been built from a partial interval
+    data.catalog.delete_data_range(Bar, str(bar_type), last, last)
+    return last - step, False
+
+
+def build_bars(
+    data: ParquetConfig,
+    instrument: Instrument,
+    bar_types: list[BarType],
+    rebuild: bool = False,
+    chunk: pd.Timedelta = CHUNK,
+    flush_rows: int = CHUNK_SIZE,
+) -> dict[BarType, BarUpdate]:
+    """
+    Aggregate an instrument's quote ticks into `bar_types` and write them to the catalog.
+
+    Returns the bars written per bar type, and whether it was rebuilt.
+    """
+    chunk_ns = chunk.value
+    for bt in bar_types:
+        if chunk_ns % step_nanos(bt):
+            raise ValueError(f"{bt}: step must divide the {chunk} read chunk")
+
+    intervals = data.catalog.get_intervals(QuoteTick, str(instrument.id))
+    if not intervals:
+        return {bt: BarUpdate() for bt in bar_types}
+    tick_end = max(i[1] for i in intervals)
+    ranges = {bt: tick_ranges(intervals, step_nanos(bt)) for bt in bar_types}
+
+    starts = {bt: _pending_start(data, bt, ranges[bt], rebuild) for bt in bar_types}
+    pending = {bt: start for bt, (start, _) in starts.items() if start is not None}
+    if not pending:
+        return {bt: BarUpdate() for bt in bar_types}
+    written = {bt: 0 for bt in bar_types}
+
+    wranglers = {bt: BarDataWrangler(bt, instrument) for bt in pending}
+    buffers: dict[BarType, list[pd.DataFrame]] = {bt: [] for bt in pending}
+
+    def flush(bt: BarType):
+        frames = [f for f in buffers[bt] if not f.empty]
+        buffers[bt] = []
+        if frames:
+            bars = wranglers[bt].process(pd.concat(frames))
+            data.catalog.write_data(bars)
+            written[bt] += len(bars)
+
+    # Slices are (lo, lo + chunk] and aligned to the chunk, so no bar straddles two slices
+    lo = (min(pending.values()) // chunk_ns) * chunk_ns
+    while lo < tick_end:
+        quotes = load_quotes(data.path, instrument.id, lo + 1, lo + chunk_ns, sizes=True)
+        for bt, start in pending.items():
+            ticks = quotes[quotes["ts_init"].to_numpy() > start] if start >= lo else quotes
+            # A new tick range starts a new bar file (see the module docstring)
+            cuts = [s for s, _ in ranges[bt] if lo < s <= lo + chunk_ns and s > start]
+            bounds = [0, *np.searchsorted(ticks["ts_init"].to_numpy(), cuts), len(ticks)]
+            for i, (first, stop) in enumerate(zip(bounds, bounds[1:])):
+                if i > 0:
+                    flush(bt)
+                buffers[bt].append(aggregate_bars(ticks.iloc[first:stop], step_nanos(bt), bt.spec.price_type))
+            if sum(len(f) for f in buffers[bt]) >= flush_rows:
+                flush(bt)
+        lo += chunk_ns
+
+    for bt in pending:
+        flush(bt)
+    return {bt: BarUpdate(written[bt], starts[bt][1]) for bt in bar_types}
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Aggregate catalog quote ticks into bars")
+    parser.add_argument("--steps", nargs="+", default=["1m"], help="bar steps, e.g. 1s 1m 5m 1h")
+    parser.add_argument("--price-types", nargs="+", default=["MID"], choices=["MID", "BID", "ASK"])
+    parser.add_argument("--instruments", nargs="+", help="instrument ids; default: every instrument in the catalog")
+    parser.add_argument("--name", default="data", help=f"catalog name under {PARQUET_DATA}/")
+    parser.add_argument("--rebuild", action="store_true", help="drop and recompute existing bars")
+    args = parser.parse_args(argv)
+
+    data = ParquetConfig(PARQUET_DATA, args.name)
+    instruments = data.catalog.instruments(instrument_ids=args.instruments)
+    for instrument in instruments:
+        bar_types = [bar_type(instrument.id, s, p) for s in args.steps for p in args.price_types]
+        for bt, update in build_bars(data, instrument, bar_types, args.rebuild).items():
+            print(f"{bt}: {'rebuilt, ' if update.rebuilt else ''}wrote {update.written} bars")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Catalog layout report and compaction.
+
+Every `write_data` call adds a parquet file, so incremental loads leave a data
+directory (`data/<type>/<identifier>/`) with many small files of small row
+groups (nautilus writes 5000 rows per group). The report lists per data type
+and identifier the file count, rows, size, row-group sizes, time coverage and
+whether the directory would be compacted:
+
+    python -m catalog.compact
+    python -m catalog.compact --compact --partition W --row-group-rows 100000
+
+Compaction rewrites a directory as one file per calendar period (`D`, `W` or
+`M`), sorted by `ts_init`, with `--row-group-rows` rows per group, min/max
+statistics and `ts_init` recorded as the sorting column. Files keep the
+catalog's `<first ts_init>_<last ts_init>.parquet` naming, so queries bounded by
+`start`/`end` skip every file outside the window, and row-group statistics
+narrow the read inside the remaining ones.
+
+Tables are moved as Arrow data without decoding to nautilus objects, one
+source file at a time, so memory is bounded by a period plus one file. The new
+files are built in a sibling directory that replaces the old one by rename;
+don't compact while backtests read the catalog. Derived tick caches and cached
+results notice the new file names and rebuild.
+"""
+import argparse
+import shutil
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from nautilus_trader.core.datetime import unix_nanos_to_iso8601
+
+from configs.parquet_data import ParquetConfig, PARQUET_DATA
+
+PARTITION = "W"
+ROW_GROUP_ROWS = 100_000
+PARTITIONS = ("D", "W", "M")
+
+
+def _filename(first: int, last: int) -> str:
+    # e.g. 2020-01-01T00-00-00-000000000Z_2020-01-05T23-59-59-000000000Z.parquet
+    stamps = [unix_nanos_to_iso8601(ts).replace(":", "-").replace(".", "-") for ts in (first, last)]
+    return f"{stamps[0]}_{stamps[1]}.parquet"
+
+
+def _periods(ts: np.ndarray, partition: str) -> np.ndarray:
+    """Ordinal of the calendar period (`D`, `W` or `M`) of every timestamp."""
+    return pd.DatetimeIndex(ts.astype("datetime64[ns]")).to_period(partition).asi8
+
+
+def _ts_range(metadata: pq.FileMetaData, path: Path) -> tuple[int, int] | None:
+    column = metadata.schema.names.index("ts_init")
+    lows, highs = [], []
+    for i in range(metadata.num_row_groups):
+        stats = metadata.row_group(i).column(column).statistics
+        if stats is None or not stats.has_min_max:
+            ts = pq.read_table(path, columns=["ts_init"])["ts_init"].to_numpy()
+            return (int(ts.min()), int(ts.max())) if len(ts) else None
+        lows.append(stats.min)
+        highs.append(stats.max)
+    return (min(lows), max(highs)) if lows else None
+
+
+def data_directories(data: ParquetConfig) -> list[Path]:
+    """Leaf directories (`data/<type>/<identifier>`) holding parquet files."""
+    return sorted(p for p in (data.path / "data").glob("*/*") if p.is_dir() and not p.name.startswith(".") and any(p.glob("*.parquet")))
+
+
+def directory_layout(directory: Path, partition: str = PARTITION, row_group_rows: int = ROW_GROUP_ROWS) -> dict:
+    """Layout statistics of one data directory, read from the parquet footers only."""
+    files = sorted(directory.glob("*.parquet"))
+    rows = groups = size = 0
+    starts, ends = [], []
+    fragmented = tiny_groups = False
+    periods: dict[int, int] = {}
+    for path in files:
+        metadata = pq.ParquetFile(path).metadata
+        rows += metadata.num_rows
+        groups += metadata.num_row_groups
+        size += path.stat().st_size
+        ts_range = _ts_range(metadata, path)
+        if ts_range is not None:
+            starts.append(ts_range[0])
+            ends.append(ts_range[1])
+            first, last = _periods(np.array(ts_range, dtype=np.uint64), partition)
+            fragmented |= first != last
+            periods[first] = periods.get(first, 0) + 1
+        # Every group but the last should be close to the target size
+        target = min(row_group_rows, metadata.num_rows)
+        tiny_groups |= any(metadata.row_group(i).num_rows < target / 2 for i in range(metadata.num_row_groups - 1))
+
+    shared_period = any(n > 1 for n in periods.values())
+    return {
+        "type": directory.parent.name,
+        "identifier": directory.name,
+        "files": len(files),
+        "rows": rows,
+        "size_mb": size / 1024**2,
+        "row_groups": groups,
+        "rows_per_group": rows / groups if groups else 0.0,
+        "start": pd.Timestamp(min(starts), tz="UTC") if starts else None,
+        "end": pd.Timestamp(max(ends), tz="UTC") if ends else None,
+        "compact": fragmented or shared_period or tiny_groups,
+    }
+
+
+def catalog_report(data: ParquetConfig, partition: str = PARTITION, row_group_rows: int = ROW_GROUP_ROWS) -> pd.DataFrame:
+    """One `directory_layout` row per data type and identifier."""
+    rows = [directory_layout(d, partition, row_group_rows) for d in data_directories(data)]
+    return pd.DataFrame(rows).set_index(["type", "identifier"]) if rows else pd.DataFrame()
+
+
+def _write(directory: Path, tables: list[pa.Table], row_group_rows: int) -> Path:
+    table = pa.concat_tables(tables)
+    ts = table["ts_init"].to_numpy()
+    path = directory / _filename(int(ts[0]), int(ts[-1]))
+    pq.write_table(
+        table,
+        path,
+        row_group_size=row_group_rows,
+        write_statistics=True,
+        sorting_columns=[pq.SortingColumn(table.schema.get_field_index("ts_init"))],
+    )
+    return path
+
+
+def compact_directory(
+    directory: Path,
+    partition: str = PARTITION,
+    row_group_rows: int = ROW_GROUP_ROWS,
+    force: bool = False,
+) -> int | None:
+    """
+    Rewrite a data directory as one sorted file per `partition` period.
+
+    Returns the new file count, or None if the layout already fits and
+    `force` is not set.
+    """
+    if partition not in PARTITIONS:
+        raise ValueError(f"partition must be one of {PARTITIONS}, not {partition!r}")
+    if not force and not directory_layout(directory, partition, row_group_rows)["compact"]:
+        return None
+
+    tmp = directory.with_name(f".{directory.name}.{uuid.uuid4().hex}")
+    tmp.mkdir()
+    written = 0
+    pending: list[pa.Table] = []
+    pending_period = None
+    try:
+        # Catalog files are disjoint and named by their first timestamp, so
+        # name order is time order and periods arrive in order
+        for path in sorted(directory.glob("*.parquet")):
+            table = pq.read_table(path)
+            ts = table["ts_init"].to_numpy()
+            if not len(ts):
+                continue
+            if np.any(ts[1:] < ts[:-1]):
+                order = np.argsort(ts, kind="stable")
+                table, ts = table.take(order), ts[order]
+            periods = _periods(ts, partition)
+            bounds = np.r_[0, np.flatnonzero(np.diff(periods)) + 1, len(ts)]
+            for lo, hi in zip(bounds[:-1], bounds[1:]):
+                if pending_period is not None and periods[lo] != pending_period:
+                    if periods[lo] < pending_period:
+                        raise ValueError(f"{directory}: files overlap in time, compaction aborted")
+                    _write(tmp, pending, row_group_rows)
+                    written += 1
+                    pending = []
+                pending.append(table.slice(lo, hi - lo))
+                pending_period = periods[lo]
+        if pending:
+            _write(tmp, pending, row_group_rows)
+            written += 1
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    old = directory.with_name(f".{directory.name}.{uuid.uuid4().hex}.old")
+    directory.rename(old)
+    tmp.rename(directory)
+    shutil.rmtree(old, ignore_errors=True)
+    return written
+
+
+def compact_catalog(
+    data: ParquetConfig,
+    partition: str = PARTITION,
+    row_group_rows: int = ROW_GROUP_ROWS,
+    types: list[str] | None = None,
+    force: bool = False,
+) -> dict[str, int]:
+    """Compact every data directory (of `types`, e.g. `quote_tick`) that needs it; returns new file counts."""
+    compacted = {}
+    for directory in data_directories(data):
+        if types and directory.parent.name not in types:
+            continue
+        files = compact_directory(directory, partition, row_group_rows, force)
+        if files is not None:
+            compacted[f"{directory.parent.name}/{directory.name}"] = files
+    return compacted
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Report and compact the layout of a catalog")
+    parser.add_argument("--name", default="data", help=f"catalog name under {PARQUET_DATA}/")
+    parser.add_argument("--compact", action="store_true", help="rewrite directories that need it; default: report only")
+    parser.add_argument("--partition", default=PARTITION, choices=PARTITIONS, help="one file per day, week or month")
+    parser.add_argument("--row-group-rows", type=int, default=ROW_GROUP_ROWS)
+    parser.add_argument("--types", nargs="+", help="data types to compact, e.g. quote_tick bar; default: all")
+    parser.add_argument("--force", action="store_true", help="rewrite even directories whose layout fits")
+    args = parser.parse_args(argv)
+
+    data = ParquetConfig(PARQUET_DATA, args.name)
+    if args.compact:
+        compacted = compact_catalog(data, args.partition, args.row_group_rows, args.types, args.force)
+        for name, files in compacted.items():
+            print(f"{name}: compacted into {files} files")
+        if not compacted:
+            print("Nothing to compact")
+        print()
+
+    report = catalog_report(data, args.partition, args.row_group_rows)
+    with pd.option_context("display.width", 200, "display.max_rows", None):
+        print(report.to_string(float_format="{:.1f}".format) if not report.empty else f"No data in {data.path}")
+
+
+if __name__ == "__main__":
+    main()
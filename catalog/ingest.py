@@ -0,0 +1,81 @@
+"""
+Streaming HistData tick ingestion.
+
+A tick file is read in bounded chunks, each chunk is wrangled into `QuoteTick`
+objects and appended to the catalog before the next one is read, so peak
+memory depends on `chunk_size`, not on the size of the file.
+"""
+from collections.abc import Iterator
+from pathlib import Path
+
+import pandas as pd
+
+from nautilus_trader.model.instruments import CurrencyPair
+from nautilus_trader.persistence.catalog import ParquetDataCatalog
+from nautilus_trader.persistence.wranglers import QuoteTickDataWrangler
+from nautilus_trader.test_kit.providers import TestInstrumentProvider
+
+HISTDATA_URL = "https://raw.githubusercontent.com/nautechsystems/nautilus_data/main/raw_data/fx_hist_data/{filename}"
+HISTDATA_COLUMNS = ["timestamp", "bid_price", "ask_price", "size"]
+HISTDATA_DATETIME_FORMAT = "%Y%m%d %H%M%S%f"
+CHUNK_SIZE = 500_000
+
+
+def histdata_filename(symbol: str, month: str) -> str:
+    """HistData ASCII tick file name, e.g. `DAT_ASCII_EURUSD_T_202001.csv.gz`."""
+    return f"DAT_ASCII_{symbol}_T_{month}.csv.gz"
+
+
+def fx_instrument(symbol: str) -> CurrencyPair:
+    """SIM venue currency pair for a six-letter symbol such as `EURUSD`."""
+    return TestInstrumentProvider.default_fx_ccy(f"{symbol[:3]}/{symbol[3:]}")
+
+
+def read_tick_chunks(path: str | Path, chunk_size: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Yield the ticks of a HistData CSV (plain or gzip) as DataFrames of at most ~`chunk_size` rows.
+
+    Rows sharing the last timestamp of a chunk are held back and emitted with
+    the next one, so consecutive chunks never overlap in time - the catalog
+    requires disjoint file intervals.
+    """
+    carry = None
+    reader = pd.read_csv(path, header=None, names=HISTDATA_COLUMNS, chunksize=chunk_size)
+    for chunk in reader:
+        chunk.index = pd.to_datetime(chunk.pop("timestamp"), format=HISTDATA_DATETIME_FORMAT)
+        if carry is not None:
+            chunk = pd.concat([carry, chunk])
+
+        last = chunk.index[-1]
+        tail = chunk.index == last
+        carry = chunk[tail]
+        if not tail.all():
+            yield chunk[~tail]
+
+    if carry is not None and len(carry):
+        yield carry
+
+
+def ingest_file(
+    catalog: ParquetDataCatalog,
+    instrument: CurrencyPair,
+    path: str | Path,
+    chunk_size: int = CHUNK_SIZE,
+    write_instrument: bool = True,
+) -> int:
+    """
+    Stream one tick file into the catalog and return the number of ticks written.
+
+    Concurrent loaders writing to one catalog should pass `write_instrument=False`
+    and write the instruments once up front.
+    """
+    if write_instrument:
+        catalog.write_data([instrument])
+    wrangler = QuoteTickDataWrangler(instrument)
+
+    count = 0
+    for chunk in read_tick_chunks(path, chunk_size):
+        ticks = wrangler.process(chunk)
+        catalog.write_data(ticks)
+        count += len(ticks)
+    return count
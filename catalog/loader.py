@@ -0,0 +1,231 @@
+"""
+Bulk HistData loader: many symbols and months into one catalog, in parallel.
+
+Archives are read from a local directory (`--source-dir`); missing ones are
+downloaded into it unless `--offline` is given. Each archive is parsed and
+wrangled in its own worker process via `catalog.ingest.ingest_file`.
+
+Progress is tracked in a JSON manifest next to the catalog with the sha256 of
+every archive that was fully written. Re-running the same command skips those,
+so an interrupted multi-year load resumes where it stopped. A source that was
+not completed (or whose archive changed) has its month range deleted from the
+catalog before it is loaded again.
+
+    python -m catalog.loader --symbols EURUSD GBPUSD --months 201901-201912 --source-dir archives
+    python -m catalog.loader --source-dir archives --offline
+    python -m catalog.loader --symbols EURUSD --months 202002 --bars 1m 5m
+
+With `--bars` the loaded instruments' bars (see `catalog.bars`) are brought up
+to date after the ticks are written.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from pathlib import Path
+
+import pandas as pd
+
+from nautilus_trader.model import QuoteTick
+from nautilus_trader.persistence.catalog import ParquetDataCatalog
+
+from catalog.bars import bar_type, build_bars
+from catalog.ingest import CHUNK_SIZE, HISTDATA_URL, fx_instrument, histdata_filename, ingest_file
+from configs.parquet_data import ParquetConfig, PARQUET_DATA
+
+MANIFEST_NAME = "manifest.json"
+HISTDATA_PATTERN = re.compile(r"DAT_ASCII_(?P<symbol>[A-Z]{6})_T_(?P<month>\d{6})\.csv\.gz$")
+
+
+@dataclass(frozen=True)
+class Source:
+    symbol: str
+    month: str
+    path: Path
+
+    @property
+    def key(self) -> str:
+        return self.path.name
+
+
+def month_range(spec: str) -> list[str]:
+    """Expand `YYYYMM` or `YYYYMM-YYYYMM` into the list of months."""
+    start, _, end = spec.partition("-")
+    months = pd.period_range(pd.Period(start, "M"), pd.Period(end or start, "M"), freq="M")
+    return [m.strftime("%Y%m") for m in months]
+
+
+def month_bounds(month: str) -> tuple[int, int]:
+    """Inclusive UNIX nanosecond bounds of a `YYYYMM` month."""
+    period = pd.Period(month, "M")
+    return period.start_time.tz_localize("UTC").value, period.end_time.tz_localize("UTC").value
+
+
+def discover_sources(source_dir: str | Path) -> list[Source]:
+    """All HistData tick archives found in `source_dir`."""
+    sources = []
+    for path in sorted(Path(source_dir).glob("DAT_ASCII_*_T_*.csv.gz")):
+        match = HISTDATA_PATTERN.match(path.name)
+        if match:
+            sources.append(Source(match["symbol"], match["month"], path))
+    return sources
+
+
+def fetch_sources(source_dir: str | Path, symbols: list[str], months: list[str], offline: bool = False) -> list[Source]:
+    """
+    Resolve symbol/month pairs to local archives, downloading the missing ones.
+
+    With `offline=True` missing archives are reported and skipped.
+    """
+    source_dir = Path(source_dir)
+    source_dir.mkdir(parents=True, exist_ok=True)
+
+    sources = []
+    for symbol in symbols:
+        for month in months:
+            path = source_dir / histdata_filename(symbol, month)
+            if not path.exists():
+                if offline:
+                    print(f"Missing {path.name}, skipped (offline)")
+                    continue
+                url = HISTDATA_URL.format(filename=path.name)
+                print(f"Downloading from: {url}")
+                try:
+                    urllib.request.urlretrieve(url, path.with_suffix(".part"))  # noqa: S310
+                except OSError as e:
+                    print(f"Error: {e}")
+                    continue
+                path.with_suffix(".part").rename(path)
+            sources.append(Source(symbol, month, path))
+    return sources
+
+
+def file_checksum(path: str | Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """JSON record of the archives that were completely written to a catalog."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.entries: dict[str, dict] = json.loads(self.path.read_text()) if self.path.exists() else {}
+
+    def is_done(self, source: Source, checksum: str) -> bool:
+        entry = self.entries.get(source.key)
+        return entry is not None and entry["sha256"] == checksum
+
+    def mark_done(self, source: Source, checksum: str, ticks: int):
+        self.entries[source.key] = {
+            "symbol": source.symbol,
+            "month": source.month,
+            "sha256": checksum,
+            "ticks": ticks,
+            "completed": datetime.now(timezone.utc).isoformat(),
+        }
+        self.save()
+
+    def save(self):
+        # Write-then-rename so an interrupted save never leaves a truncated manifest
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.entries, indent=2, sort_keys=True))
+        os.replace(tmp, self.path)
+
+
+def _load_source(catalog_path: str, source: Source, chunk_size: int) -> int:
+    catalog = ParquetDataCatalog(catalog_path)
+    instrument = fx_instrument(source.symbol)
+
+    # Drop whatever a previous, interrupted attempt left for this month
+    start, end = month_bounds(source.month)
+    catalog.delete_data_range(QuoteTick, instrument.id.value, start, end)
+
+    return ingest_file(catalog, instrument, source.path, chunk_size, write_instrument=False)
+
+
+def bulk_load(
+    data: ParquetConfig,
+    sources: list[Source],
+    processes: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Manifest:
+    """Load every source not yet in the manifest, one archive per worker task."""
+    manifest = Manifest(data.path / MANIFEST_NAME)
+
+    pending = []
+    for source in sources:
+        checksum = file_checksum(source.path)
+        if manifest.is_done(source, checksum):
+            print(f"{source.key}: already loaded, skipped")
+        else:
+            pending.append((source, checksum))
+
+    if not pending:
+        return manifest
+
+    # Instruments are written once here; workers only append ticks
+    data.catalog.write_data([fx_instrument(symbol) for symbol in sorted({s.symbol for s, _ in pending})])
+
+    with ProcessPoolExecutor(max_workers=processes, mp_context=get_context("spawn")) as pool:
+        futures = {
+            pool.submit(_load_source, str(data.path), source, chunk_size): (source, checksum)
+            for source, checksum in pending
+        }
+        for future in as_completed(futures):
+            source, checksum = futures[future]
+            try:
+                ticks = future.result()
+            except Exception as e:
+                print(f"{source.key}: failed: {e!r}")
+                continue
+            manifest.mark_done(source, checksum, ticks)
+            print(f"{source.key}: wrote {ticks} ticks")
+
+    return manifest
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Parallel, resumable HistData catalog loader")
+    parser.add_argument("--symbols", nargs="+", help="six-letter FX symbols; default: every archive in --source-dir")
+    parser.add_argument("--months", nargs="+", default=[], help="YYYYMM or YYYYMM-YYYYMM")
+    parser.add_argument("--source-dir", default="archives", help="directory of DAT_ASCII_*_T_*.csv.gz archives")
+    parser.add_argument("--offline", action="store_true", help="never download, use --source-dir only")
+    parser.add_argument("--name", default="data", help=f"catalog name under {PARQUET_DATA}/")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--bars", nargs="+", default=[], metavar="STEP", help="update MID bars of these steps, e.g. 1m 1h")
+    args = parser.parse_args(argv)
+
+    if args.symbols:
+        months = [m for spec in args.months for m in month_range(spec)]
+        sources = fetch_sources(args.source_dir, args.symbols, months, args.offline)
+    else:
+        sources = discover_sources(args.source_dir)
+
+    data = ParquetConfig(PARQUET_DATA, args.name)
+    print(f"Catalog directory: {data.path}")
+    print(f"Loading {len(sources)} archives on {args.processes} processes...")
+
+    manifest = bulk_load(data, sources, args.processes, args.chunk_size)
+    print(f"\n{len(manifest.entries)} archives recorded in {manifest.path}")
+
+    if args.bars:
+        for symbol in sorted({s.symbol for s in sources}):
+            instrument = fx_instrument(symbol)
+            bar_types = [bar_type(instrument.id, step) for step in args.bars]
+            for bt, update in build_bars(data, instrument, bar_types).items():
+                print(f"{bt}: {'rebuilt, ' if update.rebuilt else ''}wrote {update.written} bars")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+Memory-mapped, column-oriented quote-tick cache derived from the catalog.
+
+Each instrument's quotes are decoded once from the catalog parquet files into
+flat little-endian column files next to the catalog:
+
+    <catalog>/tick_cache/<instrument>/ts_event.u8, ts_init.u8, bid.f8, ask.f8, bid_size.f8, ask_size.f8
+    <catalog>/tick_cache/<instrument>/meta.json
+
+Runs map the columns instead of materializing `QuoteTick` objects for the
+whole range: opening a cache and locating a time range (binary search on
+`ts_init`) cost the same for a day or for years of history, and `QuoteTick`s
+are only built batch by batch while the engine streams. The mappings are
+file-backed, so sweep workers replaying the same instrument share one copy
+in the OS page cache.
+
+A cache is rebuilt when the catalog files it was derived from change (name,
+size or mtime). `TickCacheNode` is a drop-in `BacktestNode` that serves QuoteTick
+data configs from the cache:
+
+    python -m catalog.tickcache                      # build caches for every instrument
+    python -m backtests.sweep --tick-cache --grid fast_period=8,12 --grid slow_period=26
+"""
+import argparse
+import json
+import shutil
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pyarrow.parquet as pq
+
+from nautilus_trader.backtest.engine import BacktestEngine
+from nautilus_trader.backtest.node import BacktestNode
+from nautilus_trader.backtest.node import get_instrument_ids
+from nautilus_trader.backtest.results import BacktestResult
+from nautilus_trader.core.datetime import dt_to_unix_nanos
+from nautilus_trader.model import QuoteTick
+from nautilus_trader.model.identifiers import InstrumentId
+from nautilus_trader.persistence.funcs import urisafe_identifier
+
+from backtests.screener import decode_fixed
+from configs.parquet_data import ParquetConfig, PARQUET_DATA
+
+CACHE_DIR = "tick_cache"
+META_FILE = "meta.json"
+BATCH_SIZE = 100_000
+COLUMNS = {
+    "ts_event": np.uint64,
+    "ts_init": np.uint64,
+    "bid": np.float64,
+    "ask": np.float64,
+    "bid_size": np.float64,
+    "ask_size": np.float64,
+}
+FIXED_COLUMNS = {"bid": "bid_price", "ask": "ask_price", "bid_size": "bid_size", "ask_size": "ask_size"}
+
+
+def _source_files(catalog_path: Path, instrument_id) -> list[Path]:
+    directory = catalog_path / "data" / "quote_tick" / urisafe_identifier(str(instrument_id))
+    # File names start with the interval start, so name order is time order
+    return sorted(directory.glob("*.parquet"))
+
+
+def _fingerprint(files: list[Path]) -> list[str]:
+    return [f"{f.name}:{f.stat().st_size}:{f.stat().st_mtime_ns}" for f in files]
+
+
+def _column_file(directory: Path, name: str) -> Path:
+    # e.g. ts_init.u8, bid.f8
+    return directory / f"{name}.{np.dtype(COLUMNS[name]).str[1:]}"
+
+
+def cache_path(catalog_path: str | Path, instrument_id) -> Path:
+    return Path(catalog_path) / CACHE_DIR / urisafe_identifier(str(instrument_id))
+
+
+def build_tick_cache(catalog_path: str | Path, instrument_id, rebuild: bool = False) -> Path:
+    """
+    Decode an instrument's quotes into the column cache unless it is up to date.
+
+    Files are converted one at a time, so memory is bounded by the largest
+    catalog file. Returns the cache directory.
+    """
+    catalog_path = Path(catalog_path)
+    target = cache_path(catalog_path, instrument_id)
+    files = _source_files(catalog_path, instrument_id)
+    fingerprint = _fingerprint(files)
+    if not rebuild and (target / META_FILE).exists():
+        if json.loads((target / META_FILE).read_text())["sources"] == fingerprint:
+            return target
+    if not files:
+        raise FileNotFoundError(f"No quote ticks for {instrument_id} in {catalog_path}")
+
+    # Build next to the final place and swap in, so readers never see a partial cache
+    tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex}")
+    tmp.mkdir(parents=True)
+    outputs = {name: open(_column_file(tmp, name), "wb") for name in COLUMNS}
+    rows = 0
+    price_precision = size_precision = None
+    try:
+        for path in files:
+            table = pq.read_table(path)
+            metadata = table.schema.metadata
+            price_precision = int(metadata[b"price_precision"])
+            size_precision = int(metadata[b"size_precision"])
+            order = np.argsort(table.column("ts_init").to_numpy(), kind="stable")
+            for name in ("ts_event", "ts_init"):
+                table.column(name).to_numpy()[order].astype(COLUMNS[name]).tofile(outputs[name])
+            for name, column in FIXED_COLUMNS.items():
+                decode_fixed(table.column(column))[order].tofile(outputs[name])
+            rows += table.num_rows
+    finally:
+        for f in outputs.values():
+            f.close()
+
+    (tmp / META_FILE).write_text(json.dumps({
+        "instrument_id": str(instrument_id),
+        "rows": rows,
+        "price_precision": price_precision,
+        "size_precision": size_precision,
+        "sources": fingerprint,
+    }, indent=2))
+
+    old = target.with_name(f".{target.name}.{uuid.uuid4().hex}.old")
+    if target.exists():
+        target.rename(old)
+    try:
+        tmp.rename(target)
+    except OSError:
+        # Another process swapped in the same cache first
+        shutil.rmtree(tmp, ignore_errors=True)
+    shutil.rmtree(old, ignore_errors=True)
+    return target
+
+
+class TickCache:
+    """Memory-mapped columns of one instrument's cached quotes."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        meta = json.loads((self.path / META_FILE).read_text())
+        self.instrument_id = InstrumentId.from_str(meta["instrument_id"])
+        self.rows = meta["rows"]
+        self.price_precision = meta["price_precision"]
+        self.size_precision = meta["size_precision"]
+        # Copy-on-write maps are writable views (required by the Cython tick
+        # constructor) that keep sharing clean pages with the page cache
+        self.columns = {
+            name: np.memmap(_column_file(self.path, name), dtype=dtype, mode="c", shape=(self.rows,))
+            if self.rows else np.empty(0, dtype=dtype)
+            for name, dtype in COLUMNS.items()
+        }
+
+    @property
+    def ts_init(self) -> np.ndarray:
+        return self.columns["ts_init"]
+
+    def bounds(self, start=None, end=None) -> tuple[int, int]:
+        """Row range `[lo, hi)` of quotes with `start <= ts_init <= end`."""
+        lo = 0 if start is None else int(np.searchsorted(self.ts_init, dt_to_unix_nanos(start), side="left"))
+        hi = self.rows if end is None else int(np.searchsorted(self.ts_init, dt_to_unix_nanos(end), side="right"))
+        return lo, max(lo, hi)
+
+    def ticks(self, lo: int, hi: int) -> list[QuoteTick]:
+        """Build the `QuoteTick`s of rows `[lo, hi)`."""
+        c = self.columns
+        return QuoteTick.from_raw_arrays_to_list(
+            self.instrument_id,
+            self.price_precision,
+            self.size_precision,
+            c["bid"][lo:hi],
+            c["ask"][lo:hi],
+            c["bid_size"][lo:hi],
+            c["ask_size"][lo:hi],
+            c["ts_event"][lo:hi],
+            c["ts_init"][lo:hi],
+        )
+
+
+def stream_batches(
+    caches: list[TickCache],
+    start=None,
+    end=None,
+    batch_size: int = BATCH_SIZE,
+    bounds: list[tuple[int, int]] | None = None,
+):
+    """
+    Yield time-ordered batches of at most `batch_size` ticks per instrument.
+
+    Every batch ends at a common timestamp cutoff, so ticks of all instruments
+    up to the cutoff are in the batch and later batches never go back in time.
+    `bounds` gives each cache its own row range instead of `start`/`end`.
+    """
+    cursors = list(bounds) if bounds is not None else [cache.bounds(start, end) for cache in caches]
+    while True:
+        live = [(cache, lo, hi) for cache, (lo, hi) in zip(caches, cursors) if lo < hi]
+        if not live:
+            return
+        # The earliest of the per-instrument batch ends bounds this batch
+        cutoff = min(cache.ts_init[min(lo + batch_size, hi) - 1] for cache, lo, hi in live)
+        batch = []
+        for i, (cache, (lo, hi)) in enumerate(zip(caches, cursors)):
+            if lo >= hi:
+                continue
+            stop = int(np.searchsorted(cache.ts_init[lo:hi], cutoff, side="right")) + lo
+            batch.extend(cache.ticks(lo, stop))
+            cursors[i] = (stop, hi)
+        yield batch
+
+
+class TickCacheNode(BacktestNode):
+    """
+    BacktestNode that streams QuoteTick data configs from the memory-mapped tick cache.
+
+    Caches are built (or refreshed) on first use. The run config's `chunk_size`
+    is the per-instrument batch size (default `BATCH_SIZE`). Runs with other data
+    types fall back to the regular catalog path.
+
+    `on_batch` is called and `should_stop` checked after every batch;
+    subclasses act on the engine between batches, or end a run early by
+    returning True, which skips the remaining data and ends the engine as usual.
+    """
+
+    def _run(
+        self,
+        run_config_id: str,
+        data_configs,
+        chunk_size: int | None,
+        dispose_on_completion: bool,
+        start: str | int | None = None,
+        end: str | int | None = None,
+    ) -> BacktestResult:
+        if not data_configs or any(config.data_type is not QuoteTick for config in data_configs):
+            return super()._run(run_config_id, data_configs, chunk_size, dispose_on_completion, start, end)
+
+        engine: BacktestEngine = self.get_engine(run_config_id)
+        # The ticks of every data config are merged into one time-ordered stream
+        caches, bounds = [], []
+        for config in data_configs:
+            used_start = _latest(config.start_time, start)
+            used_end = _earliest(config.end_time, end)
+            instrument_ids = get_instrument_ids(config) or [i.id for i in self.load_catalog(config).instruments()]
+            for instrument_id in instrument_ids:
+                cache = TickCache(build_tick_cache(config.catalog_path, instrument_id))
+                caches.append(cache)
+                bounds.append(cache.bounds(used_start, used_end))
+
+        for batch in stream_batches(caches, batch_size=chunk_size or BATCH_SIZE, bounds=bounds):
+            engine.add_data(batch, validate=False, sort=True)
+            engine.run(start=start, end=end, run_config_id=run_config_id, streaming=True)
+            engine.clear_data()
+            self.on_batch(run_config_id, engine)
+            if self.should_stop(run_config_id, engine):
+                break
+        engine.end()
+
+        if dispose_on_completion:
+            engine.dispose()
+        else:
+            engine.clear_data()
+        return engine.get_result()
+
+    def on_batch(self, run_config_id: str, engine: BacktestEngine):
+        """Called after every batch."""
+
+    def should_stop(self, run_config_id: str, engine: BacktestEngine) -> bool:
+        """Whether to end the run after the batch just processed."""
+        return False
+
+
+def _latest(a, b):
+    values = [dt_to_unix_nanos(v) for v in (a, b) if v is not None]
+    return max(values) if values else None
+
+
+def _earliest(a, b):
+    values = [dt_to_unix_nanos(v) for v in (a, b) if v is not None]
+    return min(values) if values else None
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Build memory-mapped tick caches from the catalog")
+    parser.add_argument("--instruments", nargs="+", help="instrument ids; default: every instrument in the catalog")
+    parser.add_argument("--name", default="data", help=f"catalog name under {PARQUET_DATA}/")
+    parser.add_argument("--rebuild", action="store_true")
+    args = parser.parse_args(argv)
+
+    data = ParquetConfig(PARQUET_DATA, args.name)
+    for instrument in data.catalog.instruments(instrument_ids=args.instruments):
+        path = build_tick_cache(data.path, instrument.id, args.rebuild)
+        print(f"{instrument.id}: {TickCache(path).rows} ticks in {path}")
+
+
+if __name__ == "__main__":
+    main()
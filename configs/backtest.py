@@ -1,35 +1,88 @@
+from pathlib import Path
+
+from configs.execution import ExecutionProfile
 from configs.parquet_data import ParquetConfig
+from nautilus_trader.core.datetime import dt_to_unix_nanos
+from nautilus_trader.model import Bar
+from nautilus_trader.model import Money
 from nautilus_trader.model import QuoteTick
+from nautilus_trader.model.identifiers import InstrumentId
 from nautilus_trader.config import ImportableStrategyConfig
 from nautilus_trader.config import LoggingConfig
+from nautilus_trader.persistence.config import StreamingConfig
 from nautilus_trader.backtest.config import BacktestVenueConfig
 from nautilus_trader.backtest.config import BacktestDataConfig
 from nautilus_trader.backtest.config import BacktestEngineConfig
 from nautilus_trader.backtest.config import BacktestRunConfig
-from nautilus_trader.persistence.catalog import ParquetDataCatalog
-
-def get_backtest_config(data: ParquetConfig, result: ParquetConfig):
+from nautilus_trader.trading.config import StrategyFactory
 
-    # Настройки инструмента
-    venue_config = BacktestVenueConfig(
+def sim_venue_config(execution: ExecutionProfile | None = None) -> BacktestVenueConfig:
+    """The SIM venue; `execution` adds order latency and fill simulation (see `backtests.execution`)."""
+    return BacktestVenueConfig(
         name="SIM",
         oms_type="NETTING",
         account_type="MARGIN",
         base_currency="USD",
-        starting_balances=["1_000_000 USD"]
+        starting_balances=["1_000_000 USD"],
+        **(execution.venue_models() if execution is not None else {}),
     )
 
+
+def default_logging() -> LoggingConfig:
+    return LoggingConfig(
+        log_level="ERROR",
+        log_level_file = "WARN",
+        log_directory="logs",
+        log_file_name="backtest.log",
+        clear_log_file = True
+        )
+
+
+def get_backtest_config(
+    data: ParquetConfig,
+    result: ParquetConfig,
+    strategy_config: dict | None = None,
+    instrument_id: InstrumentId | None = None,
+    end_time: str | None = "2020-01-10",
+    logging: LoggingConfig | None = None,
+    start_time: str | None = None,
+    strategy_path: str = "strategies.macd:MACDStrategy",
+    config_path: str = "configs.macd:MACDConfig",
+    streaming: StreamingConfig | None = None,
+    execution: ExecutionProfile | None = None,
+    bar_spec: str | None = None,
+):
+    """
+    Build the single-instrument run config, by default for `MACDStrategy`.
+
+    `strategy_config` is merged over the default `MACDConfig` fields, so a
+    parameter sweep only has to pass the values it varies. Another strategy
+    is run by passing its `strategy_path` and `config_path`. Without
+    `instrument_id` the first catalog instrument is used, read from the
+    cached instrument metadata. `start_time`/`end_time` bound the
+    catalog slice that is loaded. `streaming` makes the engine write its
+    events while it runs (see `backtests.streaming`). With `bar_spec`, e.g.
+    "1-MINUTE-MID", the catalog's EXTERNAL bars of that spec (see
+    `catalog.bars`) are loaded instead of the quote ticks.
+    """
+
+    # Настройки инструмента
+    venue_config = sim_venue_config(execution)
+
     # Загрузка данных
     # data = ParquetConfig()
     # result = ParquetConfig(PARQUET_RESULTS)
-    instruments = data.catalog.instruments()
+    if instrument_id is None:
+        instrument_id = data.instrument_ids()[0]
 
     # Конфигурация данных
     data_config = BacktestDataConfig(
         catalog_path=str(data.path),
-        data_cls=QuoteTick,
-        instrument_id=instruments[0].id,
-        end_time="2020-01-10",
+        data_cls=Bar if bar_spec else QuoteTick,
+        instrument_id=instrument_id,
+        start_time=start_time,
+        end_time=end_time,
+        bar_spec=bar_spec,
     )
 
 
@@ -37,20 +90,16 @@ def get_backtest_config(data: ParquetConfig, result: ParquetConfig):
     engine_config = BacktestEngineConfig(
         strategies=[
             ImportableStrategyConfig(
-                strategy_path="strategies.macd:MACDStrategy",
-                config_path="configs.macd:MACDConfig",
+                strategy_path=strategy_path,
+                config_path=config_path,
                 config={
-                "instrument_id": instruments[0].id,
+                "instrument_id": instrument_id,
+                **(strategy_config or {}),
                 },
             )
         ],
-        logging=LoggingConfig(
-            log_level="ERROR",
-            log_level_file = "WARN",
-            log_directory="logs",
-            log_file_name="backtest.log",
-            clear_log_file = True
-            ),
+        logging=logging or default_logging(),
+        streaming=streaming,
     )
 
     # Конфигурация запуска
@@ -58,8 +107,99 @@ def get_backtest_config(data: ParquetConfig, result: ParquetConfig):
         engine=engine_config,
         data=[data_config],
         venues=[venue_config],
-        results_catalog=ParquetDataCatalog(path="./backtest_results"), 
-        save_results=True, 
     )
 
-    return run_config
\ No newline at end of file
+    return run_config
+
+
+def get_portfolio_backtest_config(
+    data: ParquetConfig,
+    result: ParquetConfig,
+    strategy_config: dict | None = None,
+    instrument_ids: list[InstrumentId] | None = None,
+    end_time: str | None = "2020-01-10",
+    logging: LoggingConfig | None = None,
+    start_time: str | None = None,
+):
+    """
+    Build the multi-instrument MACD run config.
+
+    Without `instrument_ids` every instrument in the catalog is traded. All
+    instruments are read by one data config, so the catalog is queried once.
+    """
+    if instrument_ids is None:
+        instrument_ids = data.instrument_ids()
+
+    data_config = BacktestDataConfig(
+        catalog_path=str(data.path),
+        data_cls=QuoteTick,
+        instrument_ids=[str(i) for i in instrument_ids],
+        start_time=start_time,
+        end_time=end_time,
+    )
+
+    engine_config = BacktestEngineConfig(
+        strategies=[
+            ImportableStrategyConfig(
+                strategy_path="strategies.macd_portfolio:MACDPortfolioStrategy",
+                config_path="configs.macd:MACDPortfolioConfig",
+                config={
+                "instrument_ids": instrument_ids,
+                **(strategy_config or {}),
+                },
+            )
+        ],
+        logging=logging or default_logging(),
+    )
+
+    return BacktestRunConfig(
+        engine=engine_config,
+        data=[data_config],
+        venues=[sim_venue_config()],
+    )
+
+
+def validate_backtest_config(config: BacktestRunConfig) -> list[str]:
+    """
+    Check a run config without building an engine; returns the problems found.
+
+    Strategies are instantiated from their importable configs, starting
+    balances parsed, and every instrument of a data config (all of the
+    catalog's if it names none) must have data inside its time range.
+    """
+    problems = []
+    for strategy in config.engine.strategies:
+        try:
+            StrategyFactory.create(strategy)
+        except Exception as e:
+            problems.append(f"strategy {strategy.strategy_path}: {e!r}")
+
+    for venue in config.venues:
+        for balance in venue.starting_balances:
+            try:
+                Money.from_str(balance)
+            except Exception as e:
+                problems.append(f"venue {venue.name}: starting balance {balance!r}: {e!r}")
+
+    for data_config in config.data:
+        path = Path(data_config.catalog_path)
+        if not (path / "data").is_dir():
+            problems.append(f"catalog {path} has no data")
+            continue
+        data = ParquetConfig(path.parent, path.name)
+        known = {i["id"] for i in data.instrument_metadata()}
+        ids = data_config.instrument_ids or ([data_config.instrument_id] if data_config.instrument_id else sorted(known))
+        if not ids:
+            problems.append(f"catalog {path} has no instruments")
+        start = dt_to_unix_nanos(data_config.start_time) if data_config.start_time else None
+        end = dt_to_unix_nanos(data_config.end_time) if data_config.end_time else None
+        for instrument_id in map(str, ids):
+            if instrument_id not in known:
+                problems.append(f"instrument {instrument_id} not in catalog {path}")
+                continue
+            # Catalog bars are stored per EXTERNAL bar type
+            identifier = f"{instrument_id}-{data_config.bar_spec}-EXTERNAL" if data_config.bar_spec else instrument_id
+            intervals = data.catalog.get_intervals(data_config.data_type, identifier)
+            if not any((start is None or hi >= start) and (end is None or lo <= end) for lo, hi in intervals):
+                problems.append(f"no {data_config.data_type.__name__} data for {identifier} in the run's time range")
+    return problems
@@ -0,0 +1,68 @@
+from nautilus_trader.backtest.config import FillModelConfig
+from nautilus_trader.backtest.config import ImportableFillModelConfig
+from nautilus_trader.backtest.config import SimulationModuleConfig
+from nautilus_trader.common.config import ImportableActorConfig
+from nautilus_trader.common.config import NautilusConfig
+
+
+class ExecutionModuleConfig(SimulationModuleConfig, frozen=True):
+    """Configuration for `backtests.execution.ExecutionModule`."""
+
+    # Order latency: a fixed floor plus an exponential tail with mean `jitter_ms`
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    seed: int | None = None
+
+
+class QueueSlippageFillModelConfig(FillModelConfig, frozen=True):
+    """Configuration for `backtests.execution.QueueSlippageFillModel`."""
+
+    # Share of the displayed size at the touch that is queued ahead of our orders
+    queue_ahead: float = 0.0
+    # Market orders fill this many current spreads beyond the touch
+    spread_slippage: float = 0.0
+
+
+class ExecutionProfile(NautilusConfig, frozen=True):
+    """
+    Order latency and fill simulation of the SIM venue.
+
+    Without a profile (`sim_venue_config()`) orders reach the venue instantly
+    and market orders fill at the touch. See `backtests.execution` for how
+    each field is simulated.
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    queue_ahead: float = 0.0
+    spread_slippage: float = 0.0
+    seed: int | None = 42
+
+    def venue_models(self) -> dict:
+        """The `BacktestVenueConfig` fields (`modules`, `fill_model`) that apply this profile."""
+        module = ExecutionModuleConfig(latency_ms=self.latency_ms, jitter_ms=self.jitter_ms, seed=self.seed)
+        fill = QueueSlippageFillModelConfig(
+            queue_ahead=self.queue_ahead, spread_slippage=self.spread_slippage, random_seed=self.seed
+        )
+        return {
+            "modules": [
+                ImportableActorConfig(
+                    actor_path="backtests.execution:ExecutionModule",
+                    config_path="configs.execution:ExecutionModuleConfig",
+                    config=module.dict(),
+                )
+            ],
+            "fill_model": ImportableFillModelConfig(
+                fill_model_path="backtests.execution:QueueSlippageFillModel",
+                config_path="configs.execution:QueueSlippageFillModelConfig",
+                config=fill.dict(),
+            ),
+        }
+
+
+# Named profiles for `run_backtest.py --execution`
+EXECUTION_PROFILES = {
+    "colo": ExecutionProfile(latency_ms=1, jitter_ms=0.5),
+    "vps": ExecutionProfile(latency_ms=20, jitter_ms=10, queue_ahead=0.5, spread_slippage=0.25),
+    "retail": ExecutionProfile(latency_ms=80, jitter_ms=40, queue_ahead=0.8, spread_slippage=0.5),
+}
@@ -8,4 +8,17 @@ class MACDConfig(StrategyConfig):
     instrument_id: InstrumentId
     fast_period: int = 12
     slow_period: int = 26
-    trade_size: int = 10000
\ No newline at end of file
+    trade_size: int = 10000
+    # Write per-callback timings here (see strategies.profiling); None disables
+    profile_dir: str | None = None
+
+
+class MACDPortfolioConfig(StrategyConfig):
+    """Configuration for the multi-instrument MACD strategy."""
+
+    instrument_ids: list[InstrumentId]
+    fast_period: int = 12
+    slow_period: int = 26
+    trade_size: int = 10000
+    # Write per-callback timings here (see strategies.profiling); None disables
+    profile_dir: str | None = None
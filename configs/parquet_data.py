@@ -1,14 +1,76 @@
+import json
+import os
+import uuid
+from functools import cached_property
 from pathlib import Path
 
-from nautilus_trader.persistence.catalog import ParquetDataCatalog
-
 PARQUET_DATA: str = "parquet_in"
 PARQUET_RESULTS: str = "parquet_out"
+INSTRUMENTS_FILE: str = "instruments.json"
+
+
+def _stamp(path: Path) -> str | None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class ParquetConfig:
 
-class ParquetConfig:    
-   
     def __init__(self, path: str, name: str):
         self.path = Path(path) / name
         self.path.mkdir(parents=True, exist_ok=True)
-        self.catalog = ParquetDataCatalog(self.path)
 
+    @cached_property
+    def catalog(self):
+        # Opened on first use, so building configs from cached metadata never
+        # imports the catalog stack
+        from nautilus_trader.persistence.catalog import ParquetDataCatalog
+
+        return ParquetDataCatalog(self.path)
+
+    def instrument_metadata(self) -> list[dict]:
+        """
+        Id, type and precisions of every instrument in the catalog.
+
+        Cached in `<catalog>/instruments.json`; the catalog is only queried again
+        when an instrument file or directory was added, removed or rewritten.
+        """
+        cache = self.path / INSTRUMENTS_FILE
+        if cache.exists():
+            cached = json.loads(cache.read_text())
+            if all(_stamp(self.path / p) == s for p, s in cached["stamps"].items()):
+                return cached["instruments"]
+
+        from nautilus_trader.persistence.funcs import class_to_filename
+        from nautilus_trader.persistence.funcs import urisafe_identifier
+
+        data_dir = self.path / "data"
+        # New instrument types change `data/`, new instruments their type directory
+        paths = [data_dir]
+        instruments = []
+        for instrument in self.catalog.instruments():
+            type_dir = data_dir / class_to_filename(type(instrument))
+            instrument_dir = type_dir / urisafe_identifier(str(instrument.id))
+            paths += [type_dir, instrument_dir, *sorted(instrument_dir.glob("*.parquet"))]
+            instruments.append({
+                "id": str(instrument.id),
+                "type": type(instrument).__name__,
+                "price_precision": instrument.price_precision,
+                "size_precision": instrument.size_precision,
+            })
+
+        stamps = {str(p.relative_to(self.path)): _stamp(p) for p in dict.fromkeys(paths)}
+        # Concurrent runs may refresh the cache at the same time: write, then rename
+        tmp = cache.with_name(f".{cache.name}.{uuid.uuid4().hex}")
+        tmp.write_text(json.dumps({"instruments": instruments, "stamps": stamps}, indent=2))
+        os.replace(tmp, cache)
+        return instruments
+
+    def instrument_ids(self) -> list:
+        """`InstrumentId`s of the catalog instruments, from the cached metadata."""
+        from nautilus_trader.model.identifiers import InstrumentId
+
+        return [InstrumentId.from_str(i["id"]) for i in self.instrument_metadata()]
@@ -0,0 +1,18 @@
+from nautilus_trader.model.identifiers import InstrumentId
+from nautilus_trader.trading.strategy import StrategyConfig
+
+
+class SMACrossConfig(StrategyConfig):
+    """Configuration for the SMA crossover strategy."""
+
+    instrument_id: InstrumentId
+    bar_spec: str = "1-MINUTE-MID"
+    # INTERNAL: bars aggregated by the engine from the run's quote ticks.
+    # EXTERNAL: pre-aggregated catalog bars (catalog.bars), loaded by a run
+    # config built with `get_backtest_config(..., bar_spec=...)`
+    bar_source: str = "INTERNAL"
+    fast_period: int = 10
+    slow_period: int = 20
+    trade_size: int = 10000
+    # Write per-callback timings here (see strategies.profiling); None disables
+    profile_dir: str | None = None
@@ -1,66 +1,51 @@
+import argparse
 import os
+import tempfile
 import urllib.request
 
-from nautilus_trader.persistence.loaders import CSVTickDataLoader
-from nautilus_trader.persistence.wranglers import QuoteTickDataWrangler
-from nautilus_trader.test_kit.providers import TestInstrumentProvider
-
+from catalog.ingest import CHUNK_SIZE, HISTDATA_URL, fx_instrument, histdata_filename, ingest_file
 from configs.parquet_data import ParquetConfig, PARQUET_DATA
 
+parser = argparse.ArgumentParser(description="Download HistData tick files and stream them into the catalog")
+parser.add_argument("symbols", nargs="*", default=["EURUSD"], help="six-letter FX symbols, e.g. EURUSD GBPUSD")
+parser.add_argument("--months", nargs="+", default=["202001"], help="YYYYMM months to load for every symbol")
+parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="ticks held in memory at once")
+args = parser.parse_args()
+
 data = ParquetConfig(PARQUET_DATA, "data")
 
 print(f"Catalog directory: {data.path}")
 
-try:
-    # Download EUR/USD sample data
-    print("Downloading EUR/USD sample data...")
-    url = "https://raw.githubusercontent.com/nautechsystems/nautilus_data/main/raw_data/fx_hist_data/DAT_ASCII_EURUSD_T_202001.csv.gz"
-    filename = "EURUSD_202001.csv.gz"
-
-    print(f"Downloading from: {url}")
-    urllib.request.urlretrieve(url, filename)  # noqa: S310
-    print("Download complete")
-
+for symbol in args.symbols:
     # Create the instrument using the current schema (includes multiplier)
-    print("Creating EUR/USD instrument...")
-    instrument = TestInstrumentProvider.default_fx_ccy("EUR/USD")
-
-    # Load and process the tick data
-    print("Loading tick data...")
-    wrangler = QuoteTickDataWrangler(instrument)
-
-    df = CSVTickDataLoader.load(
-        filename,
-        index_col=0,
-        datetime_format="%Y%m%d %H%M%S%f",
-    )
-    df.columns = ["bid_price", "ask_price", "size"]
-    print(f"Loaded {len(df)} ticks")
-
-    # Process ticks
-    print("Processing ticks...")
-    ticks = wrangler.process(df)
-
-    # Write instrument first
-    data.catalog.write_data([instrument])
-    print("Instrument written to catalog")
-
-    # Write tick data
-    data.catalog.write_data(ticks)
-    print("Tick data written to catalog")
-
-    # Verify what was written
-    print("\nVerifying catalog contents...")
-    loaded_instruments = data.catalog.instruments()
-    print(f"Instruments in catalog: {[str(i.id) for i in loaded_instruments]}")
-
-    # Clean up downloaded file
-    os.unlink(filename)
-    
-
-except Exception as e:
-    print(f"Error: {e}")
-    import traceback
-    traceback.print_exc()
-finally:
-    print("\nData setup complete!")
\ No newline at end of file
+    instrument = fx_instrument(symbol)
+
+    for month in args.months:
+        filename = histdata_filename(symbol, month)
+        url = HISTDATA_URL.format(filename=filename)
+        path = os.path.join(tempfile.gettempdir(), filename)
+
+        try:
+            print(f"Downloading from: {url}")
+            urllib.request.urlretrieve(url, path)  # noqa: S310
+            print("Download complete")
+
+            # Stream ticks chunk by chunk: wrangle and append, never the whole file at once
+            print(f"Loading {instrument.id} ticks for {month}...")
+            count = ingest_file(data.catalog, instrument, path, args.chunk_size)
+            print(f"Wrote {count} ticks to catalog")
+
+        except Exception as e:
+            print(f"Error: {e}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            # Clean up downloaded file
+            if os.path.exists(path):
+                os.unlink(path)
+
+# Verify what was written
+print("\nVerifying catalog contents...")
+loaded_instruments = data.catalog.instruments()
+print(f"Instruments in catalog: {[str(i.id) for i in loaded_instruments]}")
+print("\nData setup complete!")
@@ -1,108 +1,146 @@
-# scripts/run_backtest.py
-from nautilus_trader.backtest.node import BacktestNode
-from nautilus_trader.backtest.results import BacktestResult
-from nautilus_trader.backtest.engine import BacktestEngine
-from nautilus_trader.model import Venue
-
-from configs.backtest import get_backtest_config
-from configs.parquet_data import ParquetConfig, PARQUET_RESULTS, PARQUET_DATA
-
-data = ParquetConfig(PARQUET_DATA, "data")
-results = ParquetConfig(PARQUET_RESULTS, "22")
-
-# Get backtest configuration
-config = get_backtest_config(data, results)
-node = BacktestNode(configs=[config])
-
-# Runs one or many configs synchronously
-results: list[BacktestResult] = node.run()
-
-
-# Analyze results
-engine: BacktestEngine = node.get_engine(config.id)
-# len(engine.trader.generate_order_fills_report())
-# engine.trader.generate_positions_report()
-# engine.trader.generate_account_report(Venue("SIM"))
-
-# Get performance statistics]
-
-# Get the account and positions
-account = engine.trader.generate_account_report(Venue("SIM"))
-positions = engine.trader.generate_positions_report()
-orders = engine.trader.generate_order_fills_report()
-orders_report = engine.trader.generate_orders_report()
-fills_report = engine.trader.generate_fills_report()
-
-# account.write(data.catalog)
-# orders.to_parquet(data.path / "orders.parquet")
-# orders_report.to_parquet(data.path / "orders_report.parquet")
-# data.catalog.write_data(fills_report)
-# # fills_report.to_parquet(data.path / "fills_report.parquet")
-# account.to_parquet(data.path / "account.parquet")
-# positions.to_parquet(data.path / "positions.parquet")
-
-# Access portfolio analyzer
-portfolio = engine.portfolio
-
-# Get different categories of statistics
-stats_pnls = portfolio.analyzer.get_performance_stats_pnls()
-stats_returns = portfolio.analyzer.get_performance_stats_returns()
-stats_general = portfolio.analyzer.get_performance_stats_general()
-
-# stats_pnls.to_parquet(data.path / "stats_pnls.parquet")
-# stats_returns.to_parquet(data.path / "stats_returns.parquet")
-# stats_general.to_parquet(data.path / "stats_general.parquet")
-# stats_pnls.write(data.catalog)
-
-# data.catalog.write_data(stats_pnls)
-# data.catalog.write_data(stats_returns)
-# data.catalog.write_data(stats_general)
-
-# Get the positions and orders
-# Print summary statistics
-print("=== STRATEGY PERFORMANCE ===")
-print(f"Total Orders: {len(orders)}")
-print(f"Total Positions: {len(positions)}")
-
-if len(positions) > 0:
-    # Convert P&L strings to numeric values
-    positions["pnl_numeric"] = positions["realized_pnl"].apply(
-        lambda x: float(str(x).replace(" USD", "").replace(",", "")) if isinstance(x, str) else float(x)
+# run_backtest.py
+"""
+Run the MACD backtest on a catalog and print its performance.
+
+    python run_backtest.py
+    python run_backtest.py --start 2020-01-02 --end 2020-01-05
+    python run_backtest.py --dry-run        # validate the config, don't run it
+    python run_backtest.py --stream --end 2021-01-01   # write results while it runs
+    python run_backtest.py --execution vps       # simulate latency, queue position and slippage
+
+Modules are imported inside `main` once the arguments are parsed, so `--help`
+and argument errors return immediately. `--dry-run` still pays for importing
+the nautilus config classes (about a second), but not for the engine run,
+results store or reporting modules. The catalog instrument is taken from the
+cached instrument metadata unless `--instrument` is given.
+"""
+import argparse
+import sys
+
+
+def print_summary(config, run):
+    from nautilus_trader.model import Money
+
+    from analytics.metrics import run_metrics
+
+    # Get the account and positions
+    account = run.reports["account"]
+    positions = run.reports["positions"]
+    orders = run.reports["order_fills"]
+
+    # Print summary statistics
+    print("=== STRATEGY PERFORMANCE ===")
+    print(f"Total Orders: {len(orders)}")
+    print(f"Total Positions: {len(positions)}")
+
+    if len(positions) > 0:
+        # Money columns are parsed once, all metrics are vectorized
+        starting_balance = Money.from_str(config.venues[0].starting_balances[0]).as_double()
+        metrics = run_metrics(positions, starting_balance)
+
+        print(f"\nWin Rate: {metrics['win_rate']:.1f}%")
+        print(f"Winning Trades: {metrics['wins']:.0f}")
+        print(f"Losing Trades: {metrics['losses']:.0f}")
+
+        print(f"\nTotal P&L: {metrics['total_pnl']:.2f} USD")
+        print(f"Average P&L: {metrics['avg_pnl']:.2f} USD")
+        print(f"Best Trade: {metrics['best_trade']:.2f} USD")
+        print(f"Worst Trade: {metrics['worst_trade']:.2f} USD")
+
+        # Calculate risk metrics if we have both wins and losses
+        if metrics["wins"] > 0 and metrics["losses"] > 0:
+            print(f"\nAverage Win: {metrics['avg_win']:.2f} USD")
+            print(f"Average Loss: {metrics['avg_loss']:.2f} USD")
+            print(f"Profit Factor: {metrics['profit_factor']:.2f}")
+            print(f"Risk/Reward Ratio: {metrics['risk_reward']:.2f}")
+
+        print(f"\nSharpe Ratio: {metrics['sharpe']:.2f}")
+        print(f"Sortino Ratio: {metrics['sortino']:.2f}")
+        print(f"Max Drawdown: {metrics['max_drawdown']:.2%}")
+        print(f"Exposure: {metrics['exposure']:.1%}")
+        print(f"Turnover: {metrics['turnover']:.2f}x")
+    else:
+        print("\nNo positions generated. Check strategy parameters.")
+
+    print("\n=== FINAL ACCOUNT STATE ===")
+    print(account.tail(1).to_string())
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Run the MACD backtest")
+    parser.add_argument("--name", default="data", help="catalog name under parquet_in/")
+    parser.add_argument("--instrument", help="instrument id; default: the first catalog instrument")
+    parser.add_argument("--start", help="first timestamp of the catalog slice")
+    parser.add_argument("--end", default="2020-01-10", help="last timestamp of the catalog slice")
+    parser.add_argument("--no-cache", action="store_true", help="always run, don't reuse cached results")
+    parser.add_argument("--dry-run", action="store_true", help="validate the config without running it")
+    parser.add_argument(
+        "--stream", action="store_true", help="write fills, positions and account states while the run progresses"
     )
+    parser.add_argument("--execution", metavar="PROFILE", help="execution profile from configs.execution, e.g. vps")
+    args = parser.parse_args(argv)
+
+    from configs.backtest import get_backtest_config, validate_backtest_config
+    from configs.execution import EXECUTION_PROFILES
+    from configs.parquet_data import ParquetConfig, PARQUET_RESULTS, PARQUET_DATA
+
+    if args.execution and args.execution not in EXECUTION_PROFILES:
+        parser.error(f"unknown execution profile {args.execution!r}, choose from {', '.join(EXECUTION_PROFILES)}")
+
+    data = ParquetConfig(PARQUET_DATA, args.name)
+    results = ParquetConfig(PARQUET_RESULTS, "runs")
+
+    instrument_id = None
+    if args.instrument:
+        from nautilus_trader.model.identifiers import InstrumentId
+
+        instrument_id = InstrumentId.from_str(args.instrument)
+    streaming = None
+    if args.stream:
+        from backtests.streaming import streaming_config
+
+        streaming = streaming_config(results.path)
+    config = get_backtest_config(
+        data,
+        results,
+        instrument_id=instrument_id,
+        start_time=args.start,
+        end_time=args.end,
+        streaming=streaming,
+        execution=EXECUTION_PROFILES[args.execution] if args.execution else None,
+    )
+
+    if args.dry_run:
+        problems = validate_backtest_config(config)
+        for problem in problems:
+            print(f"INVALID {problem}")
+        if problems:
+            sys.exit(1)
+        print(f"Config {config.id} is valid")
+        return
+
+    from analytics.results import ResultsStore
+    from backtests.cache import ResultCache, run_cached
+
+    if args.stream:
+        from backtests.streaming import run_streaming
+
+        # Streamed runs are long by design: not cached
+        run = run_streaming(config)
+    else:
+        # Reuse a stored run if neither the config nor the catalog slice changed
+        cache = None if args.no_cache else ResultCache(ParquetConfig(PARQUET_RESULTS, "cache").path)
+        run = run_cached(config, cache)
+
+    if run.hit:
+        print(f"Cache hit: reusing results of run {run.result.run_id}")
+    else:
+        # Append reports and stats to the results store (one dataset per report, keyed by run id)
+        run_id = ResultsStore(results.path).append(config, run.result, run.reports, run.stats)
+        print(f"Results stored under {results.path} as run {run_id}")
+
+    print_summary(config, run)
+
 
-    # Calculate win rate
-    winning_trades = positions[positions["pnl_numeric"] > 0]
-    losing_trades = positions[positions["pnl_numeric"] < 0]
-
-    win_rate = len(winning_trades) / len(positions) * 100 if len(positions) > 0 else 0
-
-    print(f"\nWin Rate: {win_rate:.1f}%")
-    print(f"Winning Trades: {len(winning_trades)}")
-    print(f"Losing Trades: {len(losing_trades)}")
-
-    # Calculate returns
-    total_pnl = positions["pnl_numeric"].sum()
-    avg_pnl = positions["pnl_numeric"].mean()
-    max_win = positions["pnl_numeric"].max()
-    max_loss = positions["pnl_numeric"].min()
-
-    print(f"\nTotal P&L: {total_pnl:.2f} USD")
-    print(f"Average P&L: {avg_pnl:.2f} USD")
-    print(f"Best Trade: {max_win:.2f} USD")
-    print(f"Worst Trade: {max_loss:.2f} USD")
-
-    # Calculate risk metrics if we have both wins and losses
-    if len(winning_trades) > 0 and len(losing_trades) > 0:
-        avg_win = winning_trades["pnl_numeric"].mean()
-        avg_loss = abs(losing_trades["pnl_numeric"].mean())
-        profit_factor = winning_trades["pnl_numeric"].sum() / abs(losing_trades["pnl_numeric"].sum())
-
-        print(f"\nAverage Win: {avg_win:.2f} USD")
-        print(f"Average Loss: {avg_loss:.2f} USD")
-        print(f"Profit Factor: {profit_factor:.2f}")
-        print(f"Risk/Reward Ratio: {avg_win/avg_loss:.2f}")
-else:
-    print("\nNo positions generated. Check strategy parameters.")
-
-print("\n=== FINAL ACCOUNT STATE ===")
-print(account.tail(1).to_string())
\ No newline at end of file
+if __name__ == "__main__":
+    main()
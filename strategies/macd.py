@@ -12,8 +12,10 @@ from nautilus_trader.model.events import PositionClosed
 from nautilus_trader.model.events import PositionOpened
 from nautilus_trader.trading.strategy import Strategy
 
+from strategies.profiling import ProfilingMixin
 
-class MACDStrategy(Strategy):
+
+class MACDStrategy(ProfilingMixin, Strategy):
     """A MACD-based strategy that only trades on zero-line crossovers."""
 
     def __init__(self, config: MACDConfig):
@@ -29,6 +31,9 @@ class MACDStrategy(Strategy):
         self.position: Position | None = None
         self.last_macd_above_zero = None  # Track if MACD was above zero on last check
 
+        if config.profile_dir:
+            self.enable_profiling(config.profile_dir)
+
     def on_start(self):
         """Subscribe to market data on strategy start."""
         self.subscribe_quote_ticks(instrument_id=self.config.instrument_id)
@@ -0,0 +1,149 @@
+from configs.macd import MACDPortfolioConfig
+
+import numpy as np
+
+from nautilus_trader.core.message import Event
+from nautilus_trader.model import Quantity
+from nautilus_trader.model import QuoteTick
+from nautilus_trader.model.enums import OrderSide
+from nautilus_trader.model.events import PositionChanged
+from nautilus_trader.model.events import PositionClosed
+from nautilus_trader.model.events import PositionOpened
+from nautilus_trader.trading.strategy import Strategy
+
+from strategies.profiling import ProfilingMixin
+
+
+class MACDPortfolioStrategy(ProfilingMixin, Strategy):
+    """
+    MACD zero-line crossovers on many instruments from one strategy instance.
+
+    Indicator and position state live in NumPy arrays with one slot per
+    instrument instead of one indicator object (or strategy) per instrument.
+    Quotes are buffered until every instrument has quoted at the timestamp, or
+    the timestamp changes; the buffered batch then updates the EMAs of all its
+    instruments and checks their signals in one vectorized pass.
+
+    The EMAs follow nautilus `MovingAverageConvergenceDivergence` on MID prices:
+    seeded with the first price, MACD ready after `slow_period` quotes, and the
+    first ready reading only records the side of zero. On a crossover the
+    position is set to `+trade_size` (above zero) or `-trade_size` (below) with
+    one market order, reversing an opposite position in a single step.
+
+    A complete batch (always, with one instrument) is acted on at once, so its
+    orders fill at the quotes that produced the signals. An incomplete batch is
+    only acted on when data of a later timestamp (or `on_stop`) arrives, which
+    the venue has already applied: an instrument quoting at that later
+    timestamp fills one quote late.
+    """
+
+    def __init__(self, config: MACDPortfolioConfig):
+        super().__init__(config=config)
+        self.instrument_ids = list(config.instrument_ids)
+        self.slots = {instrument_id: i for i, instrument_id in enumerate(self.instrument_ids)}
+        self.trade_size = config.trade_size
+
+        n = len(self.instrument_ids)
+        self.fast_alpha = 2.0 / (config.fast_period + 1.0)
+        self.slow_alpha = 2.0 / (config.slow_period + 1.0)
+        self.fast_ema = np.zeros(n)
+        self.slow_ema = np.zeros(n)
+        self.count = np.zeros(n, dtype=np.int64)
+        # -1: no ready reading yet, 0: MACD below (or at) zero, 1: above
+        self.last_above = np.full(n, -1, dtype=np.int8)
+        self.net_qty = np.zeros(n)
+        self.mid_scale = np.full(n, 1e6)
+
+        # Quotes of the current timestamp, at most one per instrument
+        self._batch_ts = -1
+        self._batch_slots: list[int] = []
+        self._batch_bids: list[float] = []
+        self._batch_asks: list[float] = []
+        self._in_batch = np.zeros(n, dtype=bool)
+
+        if config.profile_dir:
+            self.enable_profiling(config.profile_dir)
+
+    def on_start(self):
+        """Subscribe to quotes of every configured instrument."""
+        for slot, instrument_id in enumerate(self.instrument_ids):
+            instrument = self.cache.instrument(instrument_id)
+            if instrument is None:
+                self._log.error(f"Instrument {instrument_id} not found in cache")
+                continue
+            # MID prices carry one more digit, like `QuoteTick.extract_price(PriceType.MID)`
+            self.mid_scale[slot] = 10.0 ** (instrument.price_precision + 1)
+            self.subscribe_quote_ticks(instrument_id=instrument_id)
+
+    def on_stop(self):
+        """Act on the last batch, then flatten and unsubscribe."""
+        self.flush()
+        for instrument_id in self.instrument_ids:
+            self.close_all_positions(instrument_id)
+            self.unsubscribe_quote_ticks(instrument_id=instrument_id)
+
+    def on_quote_tick(self, tick: QuoteTick):
+        """Buffer the quote; a complete batch, a new timestamp or a repeated instrument flushes."""
+        slot = self.slots[tick.instrument_id]
+        if tick.ts_event != self._batch_ts or self._in_batch[slot]:
+            self.flush()
+            self._batch_ts = tick.ts_event
+        self._in_batch[slot] = True
+        self._batch_slots.append(slot)
+        self._batch_bids.append(tick.bid_price.as_double())
+        self._batch_asks.append(tick.ask_price.as_double())
+        if len(self._batch_slots) == len(self.instrument_ids):
+            self.flush()
+
+    def flush(self):
+        """Update the indicators of the buffered quotes and check their signals."""
+        if not self._batch_slots:
+            return
+        slots = np.array(self._batch_slots)
+        bids = np.array(self._batch_bids)
+        asks = np.array(self._batch_asks)
+        self._batch_slots.clear()
+        self._batch_bids.clear()
+        self._batch_asks.clear()
+        self._in_batch[slots] = False
+
+        scale = self.mid_scale[slots]
+        mid = np.round((bids + asks) / 2 * scale) / scale
+        first = self.count[slots] == 0
+        self.fast_ema[slots] = np.where(first, mid, self.fast_ema[slots] + self.fast_alpha * (mid - self.fast_ema[slots]))
+        self.slow_ema[slots] = np.where(first, mid, self.slow_ema[slots] + self.slow_alpha * (mid - self.slow_ema[slots]))
+        self.count[slots] += 1
+
+        ready = slots[self.count[slots] >= self.config.slow_period]
+        if len(ready):
+            self.check_signals(ready)
+
+    def check_signals(self, slots: np.ndarray):
+        """Trade the instruments in `slots` whose MACD crossed zero since their last reading."""
+        above = (self.fast_ema[slots] - self.slow_ema[slots] > 0).astype(np.int8)
+        last = self.last_above[slots]
+        self.last_above[slots] = above
+
+        crossed = (last != -1) & (last != above)
+        for slot, up in zip(slots[crossed], above[crossed]):
+            target = self.trade_size if up else -self.trade_size
+            self.trade_to(int(slot), target)
+
+    def trade_to(self, slot: int, target: float):
+        """Submit one market order taking the position of `slot` to `target`."""
+        delta = target - self.net_qty[slot]
+        if delta == 0:
+            return
+        order = self.order_factory.market(
+            instrument_id=self.instrument_ids[slot],
+            order_side=OrderSide.BUY if delta > 0 else OrderSide.SELL,
+            quantity=Quantity.from_int(int(abs(delta))),
+        )
+        self.submit_order(order)
+
+    def on_event(self, event: Event):
+        """Mirror the net position of every instrument from position events."""
+        if isinstance(event, (PositionOpened, PositionChanged, PositionClosed)):
+            slot = self.slots.get(event.instrument_id)
+            if slot is not None:
+                self.net_qty[slot] = 0.0 if isinstance(event, PositionClosed) else event.signed_qty
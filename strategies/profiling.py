@@ -0,0 +1,188 @@
+"""
+Opt-in per-callback profiling for strategies.
+
+`ProfilingMixin.enable_profiling` replaces the listed handlers of one strategy
+instance with timing wrappers. Nothing is wrapped unless it is called, so a
+strategy with profiling off runs its unmodified methods at zero cost; with
+profiling on each call costs two `perf_counter_ns` reads and a few list
+updates.
+
+Per callback the profiler records the call count, inclusive and self time (self
+excludes nested profiled calls, e.g. `on_quote_tick` minus `check_signals`), a
+log2 latency histogram and the slowest calls. Calls above `slow_us` are counted
+as outliers. The summary is logged and written as JSON once, on `on_stop`;
+`on_dispose` puts the unwrapped handlers back:
+
+    class MACDStrategy(ProfilingMixin, Strategy):
+        def __init__(self, config):
+            super().__init__(config=config)
+            if config.profile_dir:
+                self.enable_profiling(config.profile_dir)
+"""
+import heapq
+import json
+import time
+import uuid
+from pathlib import Path
+
+PROFILED_HANDLERS = ("on_quote_tick", "on_trade_tick", "on_bar", "on_event", "on_order_filled")
+PROFILED_ACTIONS = ("check_signals", "go_long", "go_short", "submit_order", "close_position")
+SLOW_US = 500.0
+SLOWEST = 10
+BUCKETS = 64
+
+
+class CallbackStats:
+    """Counters of one profiled callback."""
+
+    __slots__ = ("count", "total_ns", "child_ns", "max_ns", "slow", "histogram", "slowest")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.child_ns = 0
+        self.max_ns = 0
+        self.slow = 0
+        # Bucket i counts calls taking [2**(i-1), 2**i) ns
+        self.histogram = [0] * BUCKETS
+        self.slowest: list[tuple[int, int]] = []
+
+    def percentile_us(self, q: float) -> float:
+        """Upper bound of the histogram bucket holding the `q` quantile, in microseconds."""
+        target = q * self.count
+        seen = 0
+        for bucket, n in enumerate(self.histogram):
+            seen += n
+            if n and seen >= target:
+                return (1 << bucket) / 1000
+        return 0.0
+
+    def summary(self) -> dict:
+        mean = self.total_ns / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "total_ms": self.total_ns / 1e6,
+            "self_ms": (self.total_ns - self.child_ns) / 1e6,
+            "mean_us": mean / 1000,
+            "p50_us": self.percentile_us(0.5),
+            "p99_us": self.percentile_us(0.99),
+            "max_us": self.max_ns / 1000,
+            "slow": self.slow,
+            "histogram_us": {str((1 << b) / 1000): n for b, n in enumerate(self.histogram) if n},
+            "slowest": [{"ts": ts, "us": ns / 1000} for ns, ts in sorted(self.slowest, reverse=True)],
+        }
+
+
+class CallbackProfiler:
+    """Collects `CallbackStats` for the callbacks it wraps."""
+
+    def __init__(self, slow_us: float = SLOW_US, timestamp_ns=None):
+        self.slow_ns = int(slow_us * 1000)
+        # Stamps slow calls, e.g. with the strategy clock's (simulated) time
+        self.timestamp_ns = timestamp_ns
+        self.stats: dict[str, CallbackStats] = {}
+        # Time spent in nested profiled calls, per open frame
+        self._children: list[int] = []
+
+    def wrap(self, name: str, func):
+        stats = self.stats.setdefault(name, CallbackStats())
+        children = self._children
+        histogram = stats.histogram
+        slow_ns = self.slow_ns
+        now = time.perf_counter_ns
+
+        def profiled(*args, **kwargs):
+            children.append(0)
+            start = now()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = now() - start
+                nested = children.pop()
+                if children:
+                    children[-1] += elapsed
+                stats.count += 1
+                stats.total_ns += elapsed
+                stats.child_ns += nested
+                histogram[min(elapsed.bit_length(), BUCKETS - 1)] += 1
+                if elapsed > stats.max_ns:
+                    stats.max_ns = elapsed
+                if elapsed > slow_ns:
+                    stats.slow += 1
+                    entry = (elapsed, self.timestamp_ns() if self.timestamp_ns is not None else 0)
+                    if len(stats.slowest) < SLOWEST:
+                        heapq.heappush(stats.slowest, entry)
+                    else:
+                        heapq.heappushpop(stats.slowest, entry)
+
+        profiled.__wrapped__ = func
+        return profiled
+
+    def summary(self) -> dict[str, dict]:
+        return {name: s.summary() for name, s in self.stats.items() if s.count}
+
+    def format(self) -> str:
+        """Plain-text table of the summary, slowest callbacks (by total time) first."""
+        rows = sorted(self.summary().items(), key=lambda item: -item[1]["total_ms"])
+        lines = [f"{'callback':<16} {'count':>10} {'total ms':>10} {'self ms':>10} {'mean us':>9} {'p99 us':>9} {'max us':>9} {'slow':>6}"]
+        for name, s in rows:
+            lines.append(
+                f"{name:<16} {s['count']:>10} {s['total_ms']:>10.1f} {s['self_ms']:>10.1f} "
+                f"{s['mean_us']:>9.2f} {s['p99_us']:>9.1f} {s['max_us']:>9.1f} {s['slow']:>6}"
+            )
+        return "\n".join(lines)
+
+    def dump(self, path: str | Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"slow_us": self.slow_ns / 1000, "callbacks": self.summary()}, indent=2))
+
+
+class ProfilingMixin:
+    """Adds `enable_profiling` to a `Strategy` subclass; list it before `Strategy`."""
+
+    _profiler: CallbackProfiler | None = None
+
+    def enable_profiling(
+        self,
+        output_dir: str | Path,
+        callbacks: tuple[str, ...] = PROFILED_HANDLERS + PROFILED_ACTIONS,
+        slow_us: float = SLOW_US,
+    ) -> CallbackProfiler:
+        """Wrap `callbacks` of this instance; the summary goes to `output_dir/<strategy>-<uid>.json`."""
+        profiler = CallbackProfiler(slow_us, timestamp_ns=lambda: self.clock.timestamp_ns())
+        # Instance attributes shadow the class methods, also for the Cython handler dispatch
+        self._wrapped = [name for name in callbacks if hasattr(self, name)]
+        for name in self._wrapped:
+            setattr(self, name, profiler.wrap(name, getattr(self, name)))
+
+        self._profiler = profiler
+        self._profile_path = Path(output_dir) / f"{uuid.uuid4().hex[:12]}.json"
+        self._wrapped += ["on_stop", "on_dispose"]
+        self.on_stop = self._after(self.on_stop, self.dump_profile)
+        self.on_dispose = self._after(self.on_dispose, self._unwrap)
+        return profiler
+
+    @staticmethod
+    def _after(func, then):
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                then()
+
+        return wrapper
+
+    def _unwrap(self):
+        # Dropping the instance attributes uncovers the class methods again
+        for name in self._wrapped:
+            vars(self).pop(name, None)
+
+    def dump_profile(self):
+        """Log the profile summary and write it to the profile file."""
+        if self._profiler is None:
+            return
+        # The strategy id is only final once the strategy is registered with a trader
+        path = self._profile_path.with_name(f"{self.id}-{self._profile_path.name}")
+        self._profiler.dump(path)
+        self._log.info(f"Callback profile written to {path}\n{self._profiler.format()}")
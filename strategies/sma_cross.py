@@ -1,52 +1,134 @@
 # strategies/sma_cross.py
+from collections.abc import Sequence
+
+import numpy as np
+
 from nautilus_trader.model.data import Bar
-from nautilus_trader.model.identifiers import InstrumentId
-from nautilus_trader.model.orders import MarketOrder
+from nautilus_trader.model.data import BarType
+from nautilus_trader.model.enums import OrderSide
+from nautilus_trader.model.objects import FIXED_SCALAR
+from nautilus_trader.model.objects import Quantity
 from nautilus_trader.trading.strategy import Strategy
-from nautilus_trader.core.nautilus_pyo3.indicators import SimpleMovingAverage
 
+from configs.sma import SMACrossConfig
+from strategies.profiling import ProfilingMixin
+
+# Raw price units per 1e-9: float closes are taken to nanounits, then scaled
+RAW_PER_NANO = int(FIXED_SCALAR) // 10**9
+
+
+class SMACross(ProfilingMixin, Strategy):
+    """
+    Long-only SMA crossover on bar closes: buy when the fast SMA is above the
+    slow SMA, sell when it no longer is.
 
-class SMACross(Strategy):
-    def __init__(self, bar_type, fast_period: int = 10, slow_period: int = 20):
-        super().__init__()
+    Both SMAs share one ring buffer of the last `slow_period` closes and are
+    kept as running sums, so a bar costs two additions and one comparison
+    (`fast_sum * slow_period > slow_sum * fast_period`, no divisions). Closes
+    are the prices' raw fixed-point integers, so the sums are exact: nothing
+    drifts and equal averages (e.g. flat prices) never count as a crossing.
+
+    `warm_up` primes both averages from historical closes in one vectorized
+    call, e.g. in `on_start` before the replay starts. An SMA only depends on
+    its window, so years of history cost the same as `slow_period` bars.
+
+    Run configs (sweeps, the job server) pass an `SMACrossConfig` instead; its
+    bars are aggregated by the engine from the quote ticks (INTERNAL), or read
+    from the catalog's pre-aggregated bars with `bar_source="EXTERNAL"`.
+    """
+
+    def __init__(
+        self,
+        bar_type: BarType | None = None,
+        fast_period: int = 10,
+        slow_period: int = 20,
+        trade_size: int = 100,
+        profile_dir: str | None = None,
+        config: SMACrossConfig | None = None,
+    ):
+        if config is not None:
+            bar_type = BarType.from_str(f"{config.instrument_id}-{config.bar_spec}-{config.bar_source}")
+            fast_period, slow_period = config.fast_period, config.slow_period
+            trade_size, profile_dir = config.trade_size, config.profile_dir
+        if bar_type is None:
+            raise ValueError("Need a bar_type or a config")
+        if not 0 < fast_period < slow_period:
+            raise ValueError(f"Need 0 < fast_period < slow_period, got {fast_period} and {slow_period}")
+        super().__init__(config=config)
         self.bar_type = bar_type
         self.instrument_id = bar_type.instrument_id
-        self.fast_sma = SimpleMovingAverage(fast_period)
-        self.slow_sma = SimpleMovingAverage(slow_period)
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        # Sized once, not per signal
+        self.trade_size = Quantity.from_int(trade_size)
         self.position_open = False
+        self._reset_averages()
+
+        if profile_dir:
+            self.enable_profiling(profile_dir)
+
+    def _reset_averages(self):
+        self._closes = [0] * self.slow_period
+        self._count = 0
+        self._fast_sum = 0
+        self._slow_sum = 0
+
+    @property
+    def initialized(self) -> bool:
+        return self._count >= self.slow_period
+
+    @property
+    def fast_value(self) -> float:
+        return self._fast_sum / self.fast_period / FIXED_SCALAR
+
+    @property
+    def slow_value(self) -> float:
+        return self._slow_sum / self.slow_period / FIXED_SCALAR
+
+    def warm_up(self, closes: Sequence[float] | np.ndarray | Sequence[Bar]):
+        """
+        Set both SMAs from historical closes or bars (oldest first), replacing their state.
+
+        Float closes are rounded to 9 decimals, the finest price precision.
+        """
+        if len(closes) and isinstance(closes[0], Bar):
+            tail = [bar.close.raw for bar in closes[-self.slow_period:]]
+        else:
+            nanos = np.rint(np.asarray(closes[-self.slow_period:], dtype=np.float64) * 1e9).astype(np.int64)
+            tail = [v * RAW_PER_NANO for v in nanos.tolist()]
+
+        self._reset_averages()
+        self._closes[: len(tail)] = tail
+        self._count = len(tail)
+        self._slow_sum = sum(tail)
+        self._fast_sum = sum(tail[-self.fast_period:])
 
     def on_start(self):
         self.subscribe_bars(self.bar_type)
 
     def on_bar(self, bar: Bar):
-        self.fast_sma.update_raw(bar.close)
-        self.slow_sma.update_raw(bar.close)
-
-        if not self.fast_sma.initialized or not self.slow_sma.initialized:
+        close = bar.close.raw
+        closes = self._closes
+        n = self._count
+        slow = self.slow_period
+        # Slots not written yet hold 0, so the first windows fill up by themselves
+        self._fast_sum += close - closes[(n - self.fast_period) % slow]
+        self._slow_sum += close - closes[n % slow]
+        closes[n % slow] = close
+        self._count = n + 1
+        if n + 1 < slow:
             return
 
-        if self.fast_sma.value > self.slow_sma.value and not self.position_open:
-            # Buy signal
-            order = MarketOrder(
-                trader_id=self.trader_id,
-                strategy_id=self.id,
-                instrument_id=self.instrument_id,
-                order_side=1,  # BUY
-                quantity=self.risk_manager.get_quantity(self.instrument_id),
-                time_in_force=3,  # GTC
-            )
-            self.submit_order(order)
-            self.position_open = True
+        self.check_signals()
 
-        elif self.fast_sma.value < self.slow_sma.value and self.position_open:
-            # Sell signal
-            order = MarketOrder(
-                trader_id=self.trader_id,
-                strategy_id=self.id,
+    def check_signals(self):
+        """Trade when the side of the fast SMA differs from the position."""
+        above = self._fast_sum * self.slow_period > self._slow_sum * self.fast_period
+        if above != self.position_open:
+            order = self.order_factory.market(
                 instrument_id=self.instrument_id,
-                order_side=2,  # SELL
-                quantity=self.risk_manager.get_quantity(self.instrument_id),
-                time_in_force=3,
+                order_side=OrderSide.BUY if above else OrderSide.SELL,
+                quantity=self.trade_size,
             )
             self.submit_order(order)
-            self.position_open = False
\ No newline at end of file
+            self.position_open = above
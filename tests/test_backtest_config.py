@@ -0,0 +1,77 @@
+# tests/test_backtest_config.py
+import json
+
+import pandas as pd
+import pytest
+from msgspec import structs
+
+from nautilus_trader.persistence.wranglers import QuoteTickDataWrangler
+from nautilus_trader.test_kit.providers import TestInstrumentProvider
+
+from configs.backtest import get_backtest_config, validate_backtest_config
+from configs.parquet_data import INSTRUMENTS_FILE, ParquetConfig
+
+
+@pytest.fixture
+def eurusd():
+    return TestInstrumentProvider.default_fx_ccy("EUR/USD")
+
+
+@pytest.fixture
+def data(tmp_path, eurusd):
+    data = ParquetConfig(tmp_path, "data")
+    data.catalog.write_data([eurusd])
+    df = pd.DataFrame(
+        {"bid_price": 1.1, "ask_price": 1.1001, "size": 1_000_000.0},
+        index=pd.date_range("2020-01-01", periods=10, freq="1min", tz="UTC"),
+    )
+    data.catalog.write_data(QuoteTickDataWrangler(eurusd).process(df))
+    return data
+
+
+def test_instrument_metadata_is_cached_until_instruments_change(data, eurusd):
+    assert data.instrument_ids() == [eurusd.id]
+    cached = json.loads((data.path / INSTRUMENTS_FILE).read_text())
+    assert cached["instruments"][0]["price_precision"] == eurusd.price_precision
+
+    # A fresh handle answers from the cache without opening the catalog
+    fresh = ParquetConfig(data.path.parent, data.path.name)
+    assert fresh.instrument_ids() == [eurusd.id]
+    assert "catalog" not in vars(fresh)
+
+    gbpusd = TestInstrumentProvider.default_fx_ccy("GBP/USD")
+    data.catalog.write_data([gbpusd])
+    assert sorted(map(str, fresh.instrument_ids())) == ["EUR/USD.SIM", "GBP/USD.SIM"]
+
+
+def test_valid_config_has_no_problems(data, eurusd):
+    config = get_backtest_config(data, data, end_time=None)
+
+    assert config.data[0].instrument_id == eurusd.id
+    assert validate_backtest_config(config) == []
+
+
+def test_validation_reports_bad_parameters_and_empty_ranges(data, eurusd):
+    config = get_backtest_config(
+        data,
+        data,
+        strategy_config={"fast_period": "fast"},
+        start_time="2021-01-01",
+        end_time="2021-02-01",
+    )
+
+    problems = validate_backtest_config(config)
+
+    assert len(problems) == 2
+    assert problems[0].startswith("strategy strategies.macd:MACDStrategy")
+    assert problems[1] == "no QuoteTick data for EUR/USD.SIM in the run's time range"
+
+
+def test_data_config_without_instruments_checks_every_catalog_instrument(data, eurusd):
+    config = get_backtest_config(data, data, end_time=None)
+    config = structs.replace(config, data=[structs.replace(config.data[0], instrument_id=None)])
+    assert validate_backtest_config(config) == []
+
+    data.catalog.write_data([TestInstrumentProvider.default_fx_ccy("GBP/USD")])
+
+    assert validate_backtest_config(config) == ["no QuoteTick data for GBP/USD.SIM in the run's time range"]
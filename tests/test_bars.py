@@ -0,0 +1,149 @@
+# tests/test_bars.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from nautilus_trader.backtest.node import BacktestNode
+from nautilus_trader.config import LoggingConfig
+from nautilus_trader.model.data import Bar
+from nautilus_trader.model.enums import PriceType
+from nautilus_trader.persistence.wranglers import QuoteTickDataWrangler
+from nautilus_trader.test_kit.providers import TestInstrumentProvider
+
+from backtests.screener import load_quotes
+from catalog.bars import BarUpdate, aggregate_bars, bar_type, build_bars
+from configs.backtest import get_backtest_config, validate_backtest_config
+from configs.parquet_data import ParquetConfig
+
+
+@pytest.fixture
+def instrument():
+    return TestInstrumentProvider.default_fx_ccy("EUR/USD")
+
+
+def quote_frame(start, periods, seed=3):
+    rng = np.random.default_rng(seed)
+    mid = 1.12 + np.round(np.cumsum(rng.normal(0, 0.00003, periods)), 5)
+    return pd.DataFrame(
+        {"bid_price": mid - 0.00001, "ask_price": mid + 0.00001, "bid_size": 1_000_000.0, "ask_size": 2_000_000.0},
+        index=pd.date_range(start, periods=periods, freq="7s", tz="UTC"),
+    )
+
+
+def test_aggregate_matches_right_closed_resample():
+    frame = quote_frame("2020-01-01", 2000)
+    quotes = pd.DataFrame({
+        "ts_init": frame.index.asi8,
+        "bid": frame["bid_price"].to_numpy(),
+        "ask": frame["ask_price"].to_numpy(),
+        "bid_size": frame["bid_size"].to_numpy(),
+        "ask_size": frame["ask_size"].to_numpy(),
+    })
+
+    bars = aggregate_bars(quotes, pd.Timedelta("1min").value, PriceType.BID)
+
+    resampler = frame.resample("1min", closed="right", label="right")
+    expected = resampler["bid_price"].ohlc().assign(volume=resampler["bid_size"].sum())
+    expected = expected[resampler["bid_price"].count() > 0]
+    pd.testing.assert_frame_equal(bars, expected, check_names=False, check_freq=False)
+
+
+def test_incremental_update_matches_full_build(tmp_path, instrument):
+    wrangler = QuoteTickDataWrangler(instrument)
+    # The second batch starts inside the last (partial) minute bar of the first
+    first, second = quote_frame("2020-01-01", 30_000), quote_frame("2020-01-03 10:19:57", 30_000, seed=4)
+
+    incremental = ParquetConfig(tmp_path, "incremental")
+    incremental.catalog.write_data([instrument])
+    bar_types = [bar_type(instrument.id, "1m"), bar_type(instrument.id, "1h", "ASK")]
+    incremental.catalog.write_data(wrangler.process(first))
+    build_bars(incremental, instrument, bar_types, flush_rows=500)
+    incremental.catalog.write_data(wrangler.process(second))
+    build_bars(incremental, instrument, bar_types, flush_rows=500)
+
+    full = ParquetConfig(tmp_path, "full")
+    full.catalog.write_data([instrument])
+    full.catalog.write_data(wrangler.process(pd.concat([first, second])))
+    build_bars(full, instrument, bar_types)
+
+    for bt in bar_types:
+        got = incremental.catalog.query(Bar, identifiers=[str(bt)])
+        want = full.catalog.query(Bar, identifiers=[str(bt)])
+        assert len(got) == len(want) > 0
+        assert got == want
+
+    # Up to date: nothing to write
+    assert build_bars(incremental, instrument, bar_types) == {bt: BarUpdate() for bt in bar_types}
+
+
+def test_bars_cover_every_tick(tmp_path, instrument):
+    data = ParquetConfig(tmp_path, "data")
+    data.catalog.write_data([instrument])
+    data.catalog.write_data(QuoteTickDataWrangler(instrument).process(quote_frame("2020-01-01", 5000)))
+
+    bt = bar_type(instrument.id, "5m")
+    build_bars(data, instrument, [bt])
+
+    bars = data.catalog.query(Bar, identifiers=[str(bt)])
+    quotes = load_quotes(data.path, instrument.id, sizes=True)
+    assert sum(b.volume.as_double() for b in bars) == pytest.approx(quotes[["bid_size", "ask_size"]].mean(axis=1).sum())
+    assert bars[-1].ts_event >= quotes["ts_init"].iloc[-1]
+
+
+def test_ticks_backfilled_between_stored_bars_are_aggregated(tmp_path, instrument):
+    wrangler = QuoteTickDataWrangler(instrument)
+    january, march = quote_frame("2020-01-01", 5000), quote_frame("2020-01-06", 5000, seed=4)
+    february = quote_frame("2020-01-03 12:00", 5000, seed=5)
+    bar_types = [bar_type(instrument.id, "1m"), bar_type(instrument.id, "1h", "ASK")]
+
+    data = ParquetConfig(tmp_path, "backfilled")
+    data.catalog.write_data([instrument])
+    data.catalog.write_data(wrangler.process(january))
+    data.catalog.write_data(wrangler.process(march))
+    build_bars(data, instrument, bar_types)
+    # Gaps in the ticks alone don't make the bars stale
+    assert build_bars(data, instrument, bar_types) == {bt: BarUpdate() for bt in bar_types}
+
+    data.catalog.write_data(wrangler.process(february))
+    assert all(update.rebuilt for update in build_bars(data, instrument, bar_types).values())
+
+    full = ParquetConfig(tmp_path, "full")
+    full.catalog.write_data([instrument])
+    full.catalog.write_data(wrangler.process(pd.concat([january, february, march])))
+    build_bars(full, instrument, bar_types)
+
+    for bt in bar_types:
+        got = data.catalog.query(Bar, identifiers=[str(bt)])
+        assert len(got) > 0
+        assert got == full.catalog.query(Bar, identifiers=[str(bt)])
+    assert build_bars(data, instrument, bar_types) == {bt: BarUpdate() for bt in bar_types}
+
+
+def test_sma_cross_run_config_reads_catalog_bars(tmp_path, instrument):
+    data = ParquetConfig(tmp_path, "data")
+    data.catalog.write_data([instrument])
+    data.catalog.write_data(QuoteTickDataWrangler(instrument).process(quote_frame("2020-01-01", 20_000)))
+    (update,) = build_bars(data, instrument, [bar_type(instrument.id, "1m")]).values()
+
+    results = []
+    for source in ("INTERNAL", "EXTERNAL"):
+        config = get_backtest_config(
+            data,
+            data,
+            strategy_config={"fast_period": 5, "slow_period": 20, "bar_source": source},
+            end_time=None,
+            logging=LoggingConfig(log_level="ERROR"),
+            strategy_path="strategies.sma_cross:SMACross",
+            config_path="configs.sma:SMACrossConfig",
+            bar_spec="1-MINUTE-MID" if source == "EXTERNAL" else None,
+        )
+        assert validate_backtest_config(config) == []
+        node = BacktestNode(configs=[config])
+        results.append(node.run()[0])
+        node.dispose()
+
+    ticks, bars = results
+    assert ticks.iterations == 20_000
+    assert bars.iterations == update.written
+    # Same bars, so the same signals
+    assert bars.total_orders == ticks.total_orders > 0
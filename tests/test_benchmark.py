@@ -0,0 +1,42 @@
+# tests/test_benchmark.py
+from backtests.benchmark import compare
+
+
+def report(**cases):
+    return {"meta": {"ticks": 1000, "bars": 100}, "cases": cases}
+
+
+def case(ticks_per_sec=10_000.0, wall_s=10.0, catalog_read_s=1.0, peak_rss_mb=400.0, error=None):
+    return {
+        "ticks_per_sec": ticks_per_sec,
+        "wall_s": wall_s,
+        "catalog_read_s": catalog_read_s,
+        "peak_rss_mb": peak_rss_mb,
+        "error": error,
+    }
+
+
+def test_compare_within_tolerance_passes():
+    baseline = report(macd=case())
+    current = report(macd=case(ticks_per_sec=9_500.0, wall_s=10.5, peak_rss_mb=420.0))
+
+    assert compare(current, baseline, tolerance=0.1) == []
+
+
+def test_compare_flags_slower_and_bigger_runs():
+    baseline = report(macd=case(), sma=case())
+    current = report(macd=case(ticks_per_sec=7_000.0, wall_s=14.0), sma=case(peak_rss_mb=600.0))
+
+    regressions = compare(current, baseline, tolerance=0.1)
+
+    assert len(regressions) == 3
+    assert any(r.startswith("macd: ticks_per_sec") for r in regressions)
+    assert any(r.startswith("macd: wall_s") for r in regressions)
+    assert any(r.startswith("sma: peak_rss_mb") for r in regressions)
+
+
+def test_compare_ignores_tiny_timings_and_reports_failures():
+    baseline = report(macd=case(catalog_read_s=0.01), sma=case())
+    current = report(macd=case(catalog_read_s=0.03), sma=case(error="AttributeError()"))
+
+    assert compare(current, baseline) == ["sma: failed (AttributeError())"]
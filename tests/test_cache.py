@@ -0,0 +1,76 @@
+# tests/test_cache.py
+import os
+
+import pandas as pd
+import pytest
+
+from nautilus_trader.backtest.results import BacktestResult
+from nautilus_trader.persistence.wranglers import QuoteTickDataWrangler
+from nautilus_trader.test_kit.providers import TestInstrumentProvider
+
+from backtests.cache import CachedRun, ResultCache, cache_key
+from configs.backtest import get_backtest_config
+from configs.parquet_data import ParquetConfig
+
+
+@pytest.fixture
+def instrument():
+    return TestInstrumentProvider.default_fx_ccy("EUR/USD")
+
+
+@pytest.fixture
+def data(tmp_path, instrument):
+    data = ParquetConfig(tmp_path, "data")
+    data.catalog.write_data([instrument])
+    return data
+
+
+def write_ticks(data, instrument, start, periods=10):
+    df = pd.DataFrame(
+        {"bid_price": 1.1, "ask_price": 1.1001, "size": 1_000_000.0},
+        index=pd.date_range(start, periods=periods, freq="1min", tz="UTC"),
+    )
+    data.catalog.write_data(QuoteTickDataWrangler(instrument).process(df))
+
+
+def make_run(run_id):
+    result = BacktestResult(
+        trader_id="BACKTESTER-001", machine_id="test", run_config_id="cfg", instance_id="inst",
+        run_id=run_id, run_started=1, run_finished=2, backtest_start=None, backtest_end=None,
+        elapsed_time=1.0, iterations=10, total_events=1, total_orders=0, total_positions=0,
+        stats_pnls={"USD": {"PnL (total)": 1.0}}, stats_returns={},
+    )
+    return CachedRun(result=result, reports={"positions": pd.DataFrame({"realized_pnl": ["1.00 USD"] * 1000})}, stats={})
+
+
+def test_key_tracks_only_files_inside_the_window(data, instrument):
+    write_ticks(data, instrument, "2020-01-02")
+    config = get_backtest_config(data, data, instrument_id=instrument.id, end_time="2020-01-10")
+    key = cache_key(config)
+
+    write_ticks(data, instrument, "2020-02-01")  # after end_time
+    assert cache_key(config) == key
+
+    write_ticks(data, instrument, "2020-01-05")  # inside the window
+    assert cache_key(config) != key
+
+    other = get_backtest_config(data, data, {"fast_period": 8}, instrument_id=instrument.id, end_time="2020-01-10")
+    assert cache_key(other) != cache_key(config)
+
+
+def test_cache_round_trip_and_lru_eviction(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    cache.put("a", make_run("a"))
+    entry_size = cache.size()
+    cache.max_bytes = int(entry_size * 2.5)
+
+    cache.put("b", make_run("b"))
+    os.utime(cache.root / "a", ns=(0, 0))
+    os.utime(cache.root / "b", ns=(1, 1))
+    hit = cache.get("a")  # refreshes "a", "b" becomes the oldest
+    cache.put("c", make_run("c"))
+
+    assert hit.hit and hit.result.run_id == "a"
+    assert list(hit.reports["positions"]["realized_pnl"][:1]) == ["1.00 USD"]
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
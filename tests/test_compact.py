@@ -0,0 +1,59 @@
+# tests/test_compact.py
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from nautilus_trader.model import QuoteTick
+from nautilus_trader.persistence.wranglers import QuoteTickDataWrangler
+from nautilus_trader.test_kit.providers import TestInstrumentProvider
+
+from catalog.compact import catalog_report, compact_catalog
+from configs.parquet_data import ParquetConfig
+
+
+@pytest.fixture
+def data(tmp_path):
+    eurusd = TestInstrumentProvider.default_fx_ccy("EUR/USD")
+    data = ParquetConfig(tmp_path, "data")
+    data.catalog.write_data([eurusd])
+    df = pd.DataFrame(
+        {"bid_price": 1.1, "ask_price": 1.1001, "size": 1_000_000.0},
+        index=pd.date_range("2020-01-01", periods=3 * 24 * 60, freq="1min", tz="UTC"),
+    )
+    ticks = QuoteTickDataWrangler(eurusd).process(df)
+    # One small file per write, as incremental loads leave them
+    for i in range(0, len(ticks), 400):
+        data.catalog.write_data(ticks[i:i + 400])
+    return data
+
+
+def fields(ticks):
+    return [(str(t.bid_price), str(t.ask_price), t.ts_init) for t in ticks]
+
+
+def test_report_flags_fragmented_directories(data):
+    report = catalog_report(data, partition="D")
+    quotes = report.loc[("quote_tick", "EURUSD.SIM")]
+
+    assert quotes["files"] == 11
+    assert quotes["rows"] == 3 * 24 * 60
+    assert quotes["start"] == pd.Timestamp("2020-01-01", tz="UTC")
+    assert quotes["compact"]
+    assert not report.loc[("currency_pair", "EURUSD.SIM")]["compact"]
+
+
+def test_compaction_writes_one_sorted_file_per_period(data):
+    before = data.catalog.query(QuoteTick)
+
+    assert compact_catalog(data, partition="D", row_group_rows=1000) == {"quote_tick/EURUSD.SIM": 3}
+
+    files = sorted((data.path / "data" / "quote_tick" / "EURUSD.SIM").glob("*.parquet"))
+    assert [f.name[:10] for f in files] == ["2020-01-01", "2020-01-02", "2020-01-03"]
+    metadata = pq.ParquetFile(files[0]).metadata
+    assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [1000, 440]
+    assert metadata.row_group(0).sorting_columns[0].column_index == metadata.schema.names.index("ts_init")
+    assert fields(data.catalog.query(QuoteTick)) == fields(before)
+    assert len(data.catalog.query(QuoteTick, start="2020-01-02", end="2020-01-02 23:59:59")) == 1440
+
+    # The layout now fits: nothing left to do
+    assert compact_catalog(data, partition="D", row_group_rows=1000) == {}
@@ -0,0 +1,90 @@
+# tests/test_distributed.py
+import asyncio
+import json
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from nautilus_trader.persistence.wranglers import QuoteTickDataWrangler
+from nautilus_trader.test_kit.providers import TestInstrumentProvider
+
+from backtests.distributed import Coordinator, ShardBook, run_worker, sweep_requests
+from configs.parquet_data import ParquetConfig
+
+
+def test_shards_of_lost_workers_are_retried_then_failed():
+    book = ShardBook(5, shard_size=2, max_attempts=2)
+    assert book.shards == {0: [0, 1], 1: [2, 3], 2: [4]}
+
+    assert book.lease("a") == 0
+    assert book.lease("b") == 1
+    assert book.release("a", "gone") == [0]
+    assert book.lease("b") == 2
+    assert book.lease("b") == 0
+    assert book.lease("b") is None
+
+    assert book.complete(1, [{}, {}])
+    assert book.release("b", "gone") == [2, 0]
+    # Shard 0 has used both attempts, shard 2 gets another one
+    assert book.failed == {0: "gone (2 attempts)"}
+    assert book.lease("c") == 2
+    assert book.complete(2, [{}])
+    assert not book.complete(2, [{}])
+    assert book.done
+
+
+def test_expired_leases_are_requeued():
+    book = ShardBook(1, shard_size=1)
+    assert book.lease("a", seconds=-1) == 0
+    assert book.expire() == [0]
+    assert book.lease("b") == 0
+
+
+@pytest.fixture
+def data(tmp_path):
+    eurusd = TestInstrumentProvider.default_fx_ccy("EUR/USD")
+    data = ParquetConfig(tmp_path, "data")
+    data.catalog.write_data([eurusd])
+    # A price swinging with a 90-minute period, so the moving averages cross
+    mid = 1.1 + np.round(0.001 * np.sin(np.arange(500) * 2 * np.pi / 90), 5)
+    df = pd.DataFrame(
+        {"bid_price": mid - 0.00005, "ask_price": mid + 0.00005, "size": 1_000_000.0},
+        index=pd.date_range("2020-01-01", periods=500, freq="1min", tz="UTC"),
+    )
+    data.catalog.write_data(QuoteTickDataWrangler(eurusd).process(df))
+    return data
+
+
+def test_shard_of_a_dead_worker_is_run_by_another(data):
+    points = [{"fast_period": 4, "slow_period": s} for s in (10, 20, 30)]
+    requests = sweep_requests(points, "sma", catalog=str(data.path), end="2020-01-01 05:00")
+
+    async def scenario():
+        coordinator = Coordinator(requests, shard_size=2, port=0)
+        await coordinator.start()
+        try:
+            # A worker that takes a shard and dies
+            reader, writer = await asyncio.open_connection("127.0.0.1", coordinator.port)
+            writer.write(json.dumps({"op": "pull"}).encode() + b"\n")
+            assert json.loads(await reader.readline())["shard"] == 0
+            writer.close()
+
+            worker = get_context("spawn").Process(target=run_worker, args=("127.0.0.1", coordinator.port, 1, "survivor"))
+            worker.start()
+            rows = await asyncio.wait_for(coordinator.wait(), 120)
+            await asyncio.get_running_loop().run_in_executor(None, worker.join)
+            return rows, coordinator.book, worker.exitcode
+        finally:
+            await coordinator.close()
+
+    rows, book, exitcode = asyncio.run(scenario())
+
+    assert exitcode == 0
+    assert [row["error"] for row in rows] == [None, None, None]
+    assert [row["slow_period"] for row in rows] == [10, 20, 30]
+    assert {row["worker"] for row in rows} == {"survivor"}
+    assert all(row["iterations"] == 301 for row in rows)
+    assert all(row["total_orders"] > 0 for row in rows)
+    assert book.attempts == {0: 2, 1: 1}
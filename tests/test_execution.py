@@ -0,0 +1,87 @@
+# tests/test_execution.py
+import numpy as np
+import pytest
+
+from nautilus_trader.model.enums import OrderSide
+from nautilus_trader.model.objects import Price
+from nautilus_trader.model.objects import Quantity
+from nautilus_trader.test_kit.providers import TestInstrumentProvider
+from nautilus_trader.test_kit.stubs.data import TestDataStubs
+from nautilus_trader.test_kit.stubs.execution import TestExecStubs
+
+from backtests.execution import QueueSlippageFillModel
+from backtests.harness import StrategyHarness
+from configs.execution import ExecutionProfile, QueueSlippageFillModelConfig
+from configs.macd import MACDConfig
+from strategies.macd import MACDStrategy
+
+MIDS = 1.1 + np.round(np.cumsum(np.random.default_rng(3).normal(0, 0.00003, 2000)), 5)
+
+
+def run_macd(execution):
+    with StrategyHarness(execution=execution) as harness:
+        # One quote per millisecond: arrival times are exact to the millisecond
+        quotes = harness.quotes(MIDS, freq="1ms")
+        config = MACDConfig(instrument_id=harness.instrument.id, fast_period=5, slow_period=12)
+        first = harness.run(MACDStrategy(config), quotes)
+        second = harness.run(MACDStrategy(config), quotes)
+    return first, second
+
+
+def delays_ms(run):
+    return [(order.ts_last - order.ts_init) / 1e6 for order in run.filled]
+
+
+def test_fixed_latency_delays_every_fill():
+    run, _ = run_macd(ExecutionProfile(latency_ms=20))
+
+    assert len(run.filled) > 10
+    assert set(delays_ms(run)) == {20.0}
+
+
+def test_sampled_latency_is_seeded_and_reset_between_runs():
+    first, second = run_macd(ExecutionProfile(latency_ms=5, jitter_ms=10, seed=7))
+
+    delays = delays_ms(first)
+    assert min(delays) >= 5
+    assert len(set(delays)) > 5
+    assert delays_ms(second) == delays
+    assert first.pnl == second.pnl
+
+
+def fills(model, side, quantity, bid="1.00000", ask="1.00004", size=1_000_000):
+    instrument = TestInstrumentProvider.default_fx_ccy("EUR/USD")
+    quote = TestDataStubs.quote_tick(instrument, float(bid), float(ask), size, size)
+
+    class Cache:
+        def quote_tick(self, instrument_id):
+            return quote
+
+    model.cache = Cache()
+    order = TestExecStubs.market_order(instrument, side, Quantity.from_int(quantity))
+    book = model.get_orderbook_for_fill_simulation(instrument, order, Price.from_str(bid), Price.from_str(ask))
+    return [(str(px), float(qty)) for px, qty in book.simulate_fills(order, 5, 0, is_aggressive=True)]
+
+
+def test_market_orders_slip_with_the_spread():
+    model = QueueSlippageFillModel(QueueSlippageFillModelConfig(spread_slippage=0.5))
+
+    # Half of a 4-tick spread beyond the touch
+    assert fills(model, OrderSide.BUY, 10_000) == [("1.00006", 10_000.0)]
+    assert fills(model, OrderSide.SELL, 10_000) == [("0.99998", 10_000.0)]
+    assert fills(model, OrderSide.BUY, 10_000, ask="1.00010") == [("1.00015", 10_000.0)]
+
+
+def test_queue_ahead_leaves_part_of_the_touch():
+    model = QueueSlippageFillModel(QueueSlippageFillModelConfig(queue_ahead=0.75))
+
+    # 25k of the displayed 100k are ours; the rest fills one spread deeper
+    assert fills(model, OrderSide.BUY, 40_000, size=100_000) == [("1.00004", 25_000.0), ("1.00008", 15_000.0)]
+    assert fills(model, OrderSide.SELL, 20_000, size=100_000) == [("1.00000", 20_000.0)]
+    assert model.prob_fill_on_limit == pytest.approx(0.25)
+
+
+@pytest.mark.parametrize("queue_ahead", [-0.1, 1.5])
+def test_queue_ahead_must_be_a_share(queue_ahead):
+    with pytest.raises(ValueError, match="queue_ahead"):
+        QueueSlippageFillModel(QueueSlippageFillModelConfig(queue_ahead=queue_ahead))
@@ -0,0 +1,75 @@
+# tests/test_harness.py
+import numpy as np
+import pytest
+
+from nautilus_trader.model.enums import OrderSide
+
+from backtests.harness import StrategyHarness
+from configs.macd import MACDConfig
+from strategies.macd import MACDStrategy
+from strategies.sma_cross import SMACross
+
+
+@pytest.fixture(scope="module")
+def harness():
+    with StrategyHarness() as harness:
+        yield harness
+
+
+def sma_cross(harness, fast=3, slow=8):
+    return SMACross(harness.bar_type, fast, slow, trade_size=10_000)
+
+
+def expected_sides(pips: np.ndarray, fast: int, slow: int) -> list[OrderSide]:
+    # Exact reference on integer prices: long while the fast mean is strictly above the slow one
+    sides, long = [], False
+    for i in range(slow - 1, len(pips)):
+        above = pips[i - fast + 1:i + 1].sum() * slow > pips[i - slow + 1:i + 1].sum() * fast
+        if above != long:
+            sides.append(OrderSide.BUY if above else OrderSide.SELL)
+            long = above
+    return sides
+
+
+def test_orders_are_filled_and_positions_closed(harness):
+    closes = [1.1] * 8 + [1.101, 1.102, 1.103] + [1.09] * 5
+    run = harness.run(sma_cross(harness), harness.bars(closes))
+
+    assert run.iterations == len(closes)
+    assert [o.side for o in run.orders] == [OrderSide.BUY, OrderSide.SELL]
+    assert len(run.filled) == 2
+    assert len(run.positions) == 1 and run.positions[0].is_closed
+    # Bought around 1.101, sold at 1.09
+    assert run.pnl < 0
+
+
+def test_sma_cross_signals_match_reference_on_random_paths(harness):
+    rng = np.random.default_rng(7)
+    subscriptions = None
+    for _ in range(60):
+        fast = int(rng.integers(1, 6))
+        slow = int(rng.integers(fast + 1, 12))
+        # Unit steps with many zeros: flat stretches make the averages tie often
+        pips = 11_000 + np.cumsum(rng.choice([-1, 0, 0, 1], size=120))
+        run = harness.run(sma_cross(harness, fast, slow), harness.bars(pips / 10_000))
+
+        assert [o.side for o in run.orders] == expected_sides(pips, fast, slow)
+        assert len(run.filled) == len(run.orders)
+        # Earlier strategies are detached from the message bus
+        count = len(harness.engine.kernel.msgbus.subscriptions())
+        assert subscriptions in (None, count)
+        subscriptions = count
+
+
+def test_reset_engine_replays_identically(harness):
+    rng = np.random.default_rng(1)
+    quotes = harness.quotes(1.1 + np.round(np.cumsum(rng.normal(0, 0.00003, 1500)), 5))
+    config = MACDConfig(instrument_id=harness.instrument.id, fast_period=5, slow_period=12)
+
+    first = harness.run(MACDStrategy(config), quotes)
+    second = harness.run(MACDStrategy(config), quotes)
+
+    assert first.iterations == second.iterations == 1500
+    assert len(first.orders) > 0
+    assert [(o.side, o.ts_init) for o in first.orders] == [(o.side, o.ts_init) for o in second.orders]
+    assert first.pnl == second.pnl
@@ -0,0 +1,43 @@
+# tests/test_ingest.py
+import gzip
+
+from nautilus_trader.persistence.catalog import ParquetDataCatalog
+
+from catalog.ingest import fx_instrument, ingest_file, read_tick_chunks
+
+
+def write_histdata(path, rows):
+    with gzip.open(path, "wt") as f:
+        for ts, bid, ask in rows:
+            f.write(f"{ts},{bid},{ask},0\n")
+
+
+def test_chunks_never_split_a_timestamp(tmp_path):
+    path = tmp_path / "DAT_ASCII_EURUSD_T_202001.csv.gz"
+    # Four ticks share 170000123, which straddles the 3-row chunk boundary
+    write_histdata(path, [
+        ("20200101 170000000", 1.12100, 1.12110),
+        ("20200101 170000123", 1.12101, 1.12111),
+        ("20200101 170000123", 1.12102, 1.12112),
+        ("20200101 170000123", 1.12103, 1.12113),
+        ("20200101 170000123", 1.12104, 1.12114),
+        ("20200101 170001000", 1.12105, 1.12115),
+        ("20200101 170002000", 1.12106, 1.12116),
+    ])
+
+    chunks = list(read_tick_chunks(path, chunk_size=3))
+
+    assert sum(len(c) for c in chunks) == 7
+    assert all(a.index[-1] < b.index[0] for a, b in zip(chunks, chunks[1:]))
+
+
+def test_ingest_file_appends_chunks_to_catalog(tmp_path):
+    path = tmp_path / "DAT_ASCII_EURUSD_T_202001.csv.gz"
+    write_histdata(path, [(f"20200101 17{i // 60:02d}{i % 60:02d}000", 1.12100, 1.12110) for i in range(250)])
+    catalog = ParquetDataCatalog(tmp_path / "catalog")
+
+    count = ingest_file(catalog, fx_instrument("EURUSD"), path, chunk_size=100)
+
+    assert count == 250
+    assert len(catalog.quote_ticks()) == 250
+    assert [str(i.id) for i in catalog.instruments()] == ["EUR/USD.SIM"]
@@ -0,0 +1,99 @@
+# tests/test_jobserver.py
+import asyncio
+
+import pandas as pd
+import pytest
+
+from nautilus_trader.persistence.wranglers import QuoteTickDataWrangler
+from nautilus_trader.test_kit.providers import TestInstrumentProvider
+
+from analytics.results import ResultsStore
+from backtests.jobserver import JobQueue, JobServer, request, watch
+from configs.parquet_data import ParquetConfig
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(tmp_path / "jobs.sqlite")
+
+
+def test_jobs_are_claimed_in_submission_order(queue):
+    first = queue.submit({"config": {"fast_period": 8}})
+    second = queue.submit({"config": {"fast_period": 10}})
+    assert queue.cancel(second)
+
+    job_id, req = queue.claim()
+    assert job_id == first
+    assert req["config"] == {"fast_period": 8}
+    assert req["strategy_path"] == "strategies.macd:MACDStrategy"
+    assert queue.claim() is None
+    assert queue.get(second)["status"] == "cancelled"
+
+
+def test_interrupted_jobs_are_requeued(queue):
+    job_id = queue.submit({})
+    queue.claim()
+    assert not queue.cancel(job_id)
+
+    assert JobQueue(queue.path).requeue_running() == 1
+    assert queue.claim()[0] == job_id
+
+
+def test_unknown_request_fields_are_rejected(queue):
+    with pytest.raises(ValueError):
+        queue.submit({"fast_period": 8})
+
+
+@pytest.fixture
+def data(tmp_path):
+    eurusd = TestInstrumentProvider.default_fx_ccy("EUR/USD")
+    data = ParquetConfig(tmp_path, "data")
+    data.catalog.write_data([eurusd])
+    df = pd.DataFrame(
+        {"bid_price": 1.1, "ask_price": 1.1001, "size": 1_000_000.0},
+        index=pd.date_range("2020-01-01", periods=500, freq="1min", tz="UTC"),
+    )
+    data.catalog.write_data(QuoteTickDataWrangler(eurusd).process(df))
+    return data
+
+
+def test_server_runs_jobs_and_stores_results(tmp_path, data):
+    async def scenario():
+        server = JobServer(JobQueue(tmp_path / "jobs.sqlite"), workers=1, results_root=tmp_path / "runs", port=0)
+        await server.start()
+        try:
+            req = {"config": {"fast_period": 8}, "catalog": str(data.path), "end": "2020-01-01 05:00"}
+            job_id = (await request({"op": "submit", "request": req}, port=server.port))["job_id"]
+            stages = [job["stage"] async for job in watch(job_id, port=server.port)]
+            return stages, (await request({"op": "status", "job_id": job_id}, port=server.port))["job"]
+        finally:
+            await server.close()
+
+    stages, job = asyncio.run(scenario())
+
+    assert job["status"] == "done", job["error"]
+    assert stages[-1] == "done"
+    assert job["summary"]["iterations"] == 301
+    assert ResultsStore(tmp_path / "runs").index()["run_id"].tolist() == [job["run_id"]]
+
+
+def test_close_waits_for_running_jobs(tmp_path, data):
+    queue = JobQueue(tmp_path / "jobs.sqlite")
+
+    async def scenario():
+        server = JobServer(queue, workers=1, results_root=tmp_path / "runs", port=0)
+        await server.start()
+        try:
+            req = {"config": {"fast_period": 8}, "catalog": str(data.path), "end": "2020-01-01 05:00"}
+            job_id = (await request({"op": "submit", "request": req}, port=server.port))["job_id"]
+            while queue.get(job_id)["status"] == "queued":
+                await asyncio.sleep(0.05)
+        finally:
+            await server.close()
+        # Recorded before close returns, so a restart won't run it again
+        return queue.get(job_id)
+
+    job = asyncio.run(scenario())
+
+    assert job["status"] == "done", job["error"]
+    assert queue.requeue_running() == 0
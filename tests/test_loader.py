@@ -0,0 +1,39 @@
+# tests/test_loader.py
+import gzip
+
+from configs.parquet_data import ParquetConfig
+from catalog.loader import bulk_load, discover_sources, month_range
+
+
+def write_archive(directory, symbol, month, n=50):
+    path = directory / f"DAT_ASCII_{symbol}_T_{month}.csv.gz"
+    with gzip.open(path, "wt") as f:
+        for i in range(n):
+            f.write(f"{month}01 1700{i:02d}000,1.12100,1.12110,0\n")
+    return path
+
+
+def test_month_range_spans_years():
+    assert month_range("201911-202002") == ["201911", "201912", "202001", "202002"]
+    assert month_range("202001") == ["202001"]
+
+
+def test_bulk_load_resumes_from_manifest(tmp_path):
+    archives = tmp_path / "archives"
+    archives.mkdir()
+    write_archive(archives, "EURUSD", "202001")
+    write_archive(archives, "GBPUSD", "202001")
+    data = ParquetConfig(tmp_path, "data")
+
+    manifest = bulk_load(data, discover_sources(archives), processes=2)
+    assert sorted(e["symbol"] for e in manifest.entries.values()) == ["EURUSD", "GBPUSD"]
+    assert len(data.catalog.quote_ticks()) == 100
+
+    # A changed archive is reloaded in place, the unchanged one is skipped
+    write_archive(archives, "EURUSD", "202001", n=30)
+    completed = manifest.entries["DAT_ASCII_GBPUSD_T_202001.csv.gz"]["completed"]
+    manifest = bulk_load(data, discover_sources(archives), processes=2)
+
+    assert manifest.entries["DAT_ASCII_GBPUSD_T_202001.csv.gz"]["completed"] == completed
+    assert manifest.entries["DAT_ASCII_EURUSD_T_202001.csv.gz"]["ticks"] == 30
+    assert len(data.catalog.quote_ticks(instrument_ids=["EUR/USD.SIM"])) == 30
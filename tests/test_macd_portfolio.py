@@ -0,0 +1,87 @@
+# tests/test_macd_portfolio.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from nautilus_trader.backtest.node import BacktestNode
+from nautilus_trader.config import LoggingConfig
+from nautilus_trader.persistence.wranglers import QuoteTickDataWrangler
+from nautilus_trader.test_kit.providers import TestInstrumentProvider
+
+from backtests.harness import StrategyHarness
+from backtests.screener import MACDScreener, crossovers, load_quotes
+from configs.backtest import get_portfolio_backtest_config
+from configs.macd import MACDConfig, MACDPortfolioConfig
+from configs.parquet_data import ParquetConfig
+from strategies.macd import MACDStrategy
+from strategies.macd_portfolio import MACDPortfolioStrategy
+
+SYMBOLS = ["EUR/USD", "GBP/USD", "AUD/USD"]
+
+
+@pytest.fixture
+def data(tmp_path):
+    data = ParquetConfig(tmp_path, "data")
+    index = pd.date_range("2020-01-01", periods=2000, freq="1s", tz="UTC")
+    for seed, symbol in enumerate(SYMBOLS):
+        instrument = TestInstrumentProvider.default_fx_ccy(symbol)
+        rng = np.random.default_rng(seed)
+        mid = 1.2 + np.round(np.cumsum(rng.normal(0, 0.00003, len(index))), 5)
+        df = pd.DataFrame({"bid_price": mid - 0.00001, "ask_price": mid + 0.00001, "size": 1_000_000.0}, index=index)
+        data.catalog.write_data([instrument])
+        data.catalog.write_data(QuoteTickDataWrangler(instrument).process(df))
+    return data
+
+
+def test_config_trades_every_catalog_instrument(data):
+    config = get_portfolio_backtest_config(data, data, end_time=None)
+
+    assert sorted(config.data[0].instrument_ids) == sorted(f"{s}.SIM" for s in SYMBOLS)
+    assert len(config.engine.strategies) == 1
+
+
+def test_orders_follow_each_instruments_crossovers(data):
+    fast, slow = 8, 21
+    config = get_portfolio_backtest_config(
+        data,
+        data,
+        strategy_config={"fast_period": fast, "slow_period": slow},
+        end_time=None,
+        logging=LoggingConfig(log_level="ERROR"),
+    )
+    node = BacktestNode(configs=[config])
+    node.run()
+    fills = node.get_engine(config.id).trader.generate_order_fills_report()
+    node.dispose()
+
+    for symbol in SYMBOLS:
+        screener = MACDScreener(load_quotes(data.path, f"{symbol}.SIM"))
+        _, direction = crossovers(screener._ema(fast) - screener._ema(slow), slow)
+        orders = fills[fills["instrument_id"] == f"{symbol}.SIM"]
+        assert len(direction) > 2
+
+        # One order per crossover plus the close in `on_stop`
+        sides = np.where(orders["side"] == "BUY", 1, -1)
+        assert len(sides) == len(direction) + 1
+        np.testing.assert_array_equal(sides[:-1], direction)
+        quantities = orders["quantity"].astype(float).to_numpy()
+        assert quantities[0] == 10_000
+        assert (quantities[1:-1] == 20_000).all()
+
+
+def test_single_instrument_fills_at_the_signal_quote_like_macd_strategy():
+    mids = 1.1 + np.round(np.cumsum(np.random.default_rng(3).normal(0, 0.00003, 3000)), 5)
+    with StrategyHarness() as harness:
+        quotes = harness.quotes(mids)
+        periods = {"fast_period": 5, "slow_period": 12}
+        single = harness.run(MACDStrategy(MACDConfig(instrument_id=harness.instrument.id, **periods)), quotes)
+        portfolio = harness.run(
+            MACDPortfolioStrategy(MACDPortfolioConfig(instrument_ids=[harness.instrument.id], **periods)), quotes
+        )
+
+    def fills(run):
+        # MACDStrategy reverses with a close and an open order, the portfolio with one
+        return sorted({(order.ts_last, order.side_string(), order.avg_px) for order in run.filled})
+
+    assert len(fills(single)) > 10
+    assert fills(portfolio) == fills(single)
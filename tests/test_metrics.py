@@ -0,0 +1,55 @@
+# tests/test_metrics.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.metrics import equity_stats, parse_money, run_metrics, trade_stats
+
+
+def positions(run_id, pnls, start="2020-01-01"):
+    opened = pd.date_range(start, periods=len(pnls), freq="1D", tz="UTC")
+    return pd.DataFrame({
+        "run_id": run_id,
+        "realized_pnl": [f"{p:.2f} USD" for p in pnls],
+        "ts_opened": opened,
+        "ts_closed": opened + pd.Timedelta(hours=12),
+        "peak_qty": "10000",
+        "avg_px_open": 1.0,
+        "avg_px_close": 1.0,
+    })
+
+
+def test_parse_money_handles_separators_and_missing():
+    parsed = parse_money(pd.Series(["1,234.50 USD", None, "-3 JPY"], dtype=object))
+
+    assert parsed.iloc[0] == 1234.5
+    assert np.isnan(parsed.iloc[1])
+    assert parsed.iloc[2] == -3.0
+
+
+def test_trade_stats_match_manual_calculation():
+    stats = trade_stats(positions("a", [10.0, -5.0, 20.0, -5.0]))
+
+    assert stats["win_rate"] == 50.0
+    assert stats["total_pnl"] == 20.0
+    assert stats["profit_factor"] == 3.0
+    assert stats["risk_reward"] == 3.0
+
+
+def test_run_metrics_groups_by_run():
+    df = pd.concat([positions("a", [10.0, -5.0]), positions("b", [-1.0, -1.0, -1.0])], ignore_index=True)
+
+    metrics = run_metrics(df, starting_balance=1000.0, by="run_id")
+
+    assert list(metrics.index) == ["a", "b"]
+    assert metrics.loc["a", "trades"] == 2
+    assert metrics.loc["b", "total_return"] == pytest.approx(-0.003)
+    # Half of every day is spent in a position, except the trailing half day
+    assert metrics.loc["b", "exposure"] == pytest.approx(1.5 / 2.5)
+    assert metrics.loc["b", "turnover"] == pytest.approx(3 * 20000 / 1000.0)
+
+
+def test_max_drawdown_is_measured_from_the_peak():
+    equity = pd.Series([100.0, 120.0, 90.0, 110.0], index=pd.date_range("2020-01-01", periods=4, freq="1D"))
+
+    assert equity_stats(equity)["max_drawdown"] == pytest.approx(90.0 / 120.0 - 1)
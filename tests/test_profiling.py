@@ -0,0 +1,108 @@
+# tests/test_profiling.py
+import json
+import time
+
+import numpy as np
+
+from nautilus_trader.model.identifiers import InstrumentId
+
+from backtests.harness import StrategyHarness
+from configs.macd import MACDConfig
+from strategies.macd import MACDStrategy
+from strategies.profiling import CallbackProfiler
+from strategies.sma_cross import SMACross
+
+
+def test_profiler_counts_nested_self_time_and_outliers():
+    profiler = CallbackProfiler(slow_us=1_000, timestamp_ns=lambda: 42)
+    inner = profiler.wrap("inner", lambda: time.sleep(0.002))
+
+    def outer(n):
+        for _ in range(n):
+            inner()
+        return n
+
+    outer = profiler.wrap("outer", outer)
+    assert outer(3) == 3
+    assert outer(0) == 0
+
+    summary = profiler.summary()
+    assert summary["inner"]["count"] == 3
+    assert summary["outer"]["count"] == 2
+    assert summary["inner"]["slow"] == 3
+    assert summary["inner"]["slowest"][0]["ts"] == 42
+    assert sum(summary["inner"]["histogram_us"].values()) == 3
+    # Outer self time excludes the sleeps inside `inner`
+    assert summary["outer"]["self_ms"] < summary["inner"]["total_ms"] / 3
+    assert summary["outer"]["total_ms"] >= summary["inner"]["total_ms"]
+
+
+def test_profiler_records_calls_that_raise():
+    profiler = CallbackProfiler()
+
+    def fail():
+        raise ValueError
+
+    fail = profiler.wrap("fail", fail)
+    for _ in range(2):
+        try:
+            fail()
+        except ValueError:
+            pass
+    assert profiler.summary()["fail"]["count"] == 2
+
+
+def test_profiling_off_leaves_handlers_untouched():
+    strategy = MACDStrategy(MACDConfig(instrument_id=InstrumentId.from_str("EUR/USD.SIM")))
+
+    assert "on_quote_tick" not in vars(strategy)
+    assert strategy._profiler is None
+
+
+def test_profiling_on_wraps_handlers_and_dumps(tmp_path):
+    config = MACDConfig(instrument_id=InstrumentId.from_str("EUR/USD.SIM"), profile_dir=str(tmp_path))
+    strategy = MACDStrategy(config)
+
+    assert strategy.on_quote_tick.__wrapped__ is not None
+    strategy.check_signals()  # MACD not initialized yet: first reading only
+    strategy.dump_profile()
+
+    (path,) = tmp_path.glob("*.json")
+    profile = json.loads(path.read_text())
+    assert profile["callbacks"]["check_signals"]["count"] == 1
+
+
+def test_engine_dispatches_to_profiled_handlers(tmp_path):
+    mids = 1.1 + np.round(np.cumsum(np.random.default_rng(5).normal(0, 0.00003, 1000)), 5)
+    with StrategyHarness() as harness:
+        quotes, bars = harness.quotes(mids), harness.bars(mids)
+        config = MACDConfig(
+            instrument_id=harness.instrument.id, fast_period=5, slow_period=12, profile_dir=str(tmp_path / "macd")
+        )
+        macd = harness.run(MACDStrategy(config), quotes)
+        sma = harness.run(SMACross(harness.bar_type, 5, 12, profile_dir=str(tmp_path / "sma")), bars)
+
+    assert macd.orders and sma.orders
+    (macd_path,) = (tmp_path / "macd").glob("*.json")
+    (sma_path,) = (tmp_path / "sma").glob("*.json")
+    callbacks = json.loads(macd_path.read_text())["callbacks"]
+    assert callbacks["on_quote_tick"]["count"] == len(quotes)
+    assert callbacks["check_signals"]["count"] > 0
+    callbacks = json.loads(sma_path.read_text())["callbacks"]
+    assert callbacks["on_bar"]["count"] == len(bars)
+    assert callbacks["on_bar"]["total_ms"] > 0
+
+
+def test_profile_is_dumped_once_and_dispose_unwraps(tmp_path, monkeypatch):
+    dumps = []
+    monkeypatch.setattr(CallbackProfiler, "dump", lambda self, path: dumps.append(path))
+    with StrategyHarness() as harness:
+        strategy = MACDStrategy(MACDConfig(instrument_id=harness.instrument.id, profile_dir=str(tmp_path)))
+        harness.run(strategy, harness.quotes(np.full(100, 1.1)))
+        assert len(dumps) == 1
+        assert "on_quote_tick" in vars(strategy)
+        strategy.dispose()
+
+    assert len(dumps) == 1
+    assert "on_quote_tick" not in vars(strategy)
+    assert "on_dispose" not in vars(strategy)
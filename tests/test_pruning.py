@@ -0,0 +1,65 @@
+# tests/test_pruning.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from nautilus_trader.config import LoggingConfig
+from nautilus_trader.persistence.wranglers import QuoteTickDataWrangler
+from nautilus_trader.test_kit.providers import TestInstrumentProvider
+
+from backtests.pruning import EquityMonitor, PruneRule, PruningNode, successive_halving
+from configs.backtest import get_backtest_config
+from configs.parquet_data import ParquetConfig
+
+
+@pytest.fixture
+def data(tmp_path):
+    eurusd = TestInstrumentProvider.default_fx_ccy("EUR/USD")
+    data = ParquetConfig(tmp_path, "data")
+    data.catalog.write_data([eurusd])
+    rng = np.random.default_rng(0)
+    mid = 1.2 + np.round(np.cumsum(rng.normal(0, 0.00005, 3000)), 5)
+    df = pd.DataFrame(
+        {"bid_price": mid - 0.00005, "ask_price": mid + 0.00005, "size": 1_000_000.0},
+        index=pd.date_range("2020-01-01", periods=3000, freq="1s", tz="UTC"),
+    )
+    data.catalog.write_data(QuoteTickDataWrangler(eurusd).process(df))
+    return data
+
+
+def test_monitor_stops_on_drawdown_from_peak_and_on_loss():
+    monitor = EquityMonitor(PruneRule(max_drawdown=0.1))
+    assert monitor.check(100.0, 120.0) is None
+    assert monitor.check(100.0, 110.0) is None
+    assert monitor.check(100.0, 107.0).startswith("drawdown")
+
+    assert EquityMonitor(PruneRule(min_return=-0.05)).check(100.0, 94.0).startswith("return")
+    assert EquityMonitor(PruneRule()).check(100.0, 1.0) is None
+
+
+def test_pruned_run_ends_early_and_records_why(data):
+    config = get_backtest_config(
+        data, data, strategy_config={"fast_period": 4, "slow_period": 10}, end_time=None,
+        logging=LoggingConfig(log_level="ERROR"),
+    )
+    # Every round trip pays the spread, so any trading crosses a zero drawdown
+    node = PruningNode(configs=[config], rule=PruneRule(max_drawdown=0.0, check_every=500))
+    result = node.run()[0]
+    node.dispose()
+
+    assert result.iterations == 500
+    assert node.pruned[config.id].startswith("drawdown")
+    # Positions are flattened when the engine ends
+    assert result.total_positions > 0
+    assert result.stats_pnls["USD"]["PnL (total)"] < 0
+
+
+def test_successive_halving_promotes_a_third_per_rung(data):
+    points = [{"fast_period": f, "slow_period": 40} for f in (4, 8, 12)]
+
+    table = successive_halving(data, data, points, eta=3, processes=1, end_time=None)
+
+    assert len(table) == 3
+    assert table["budget"].tolist() == pytest.approx([1.0, 1 / 3, 1 / 3])
+    assert table["rung"].tolist() == [1, 0, 0]
+    assert table["pruned"].isna().all()
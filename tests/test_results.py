@@ -0,0 +1,73 @@
+# tests/test_results.py
+import pandas as pd
+import pytest
+
+from nautilus_trader.backtest.results import BacktestResult
+from nautilus_trader.model.identifiers import InstrumentId
+
+from analytics.results import ResultsStore, config_hash, flatten_stats
+from configs.backtest import get_backtest_config
+from configs.parquet_data import ParquetConfig
+
+
+@pytest.fixture
+def data(tmp_path):
+    return ParquetConfig(tmp_path, "data")
+
+
+def make_config(data, **params):
+    return get_backtest_config(data, data, strategy_config=params, instrument_id=InstrumentId.from_str("EUR/USD.SIM"))
+
+
+def make_result(run_id, pnl):
+    return BacktestResult(
+        trader_id="BACKTESTER-001",
+        machine_id="test",
+        run_config_id="cfg",
+        instance_id="inst",
+        run_id=run_id,
+        run_started=1,
+        run_finished=2,
+        backtest_start=1577836800000000000,
+        backtest_end=1578614400000000000,
+        elapsed_time=1.0,
+        iterations=100,
+        total_events=10,
+        total_orders=2,
+        total_positions=1,
+        stats_pnls={"USD": {"PnL (total)": pnl}},
+        stats_returns={"Sharpe Ratio (252 days)": 0.5},
+    )
+
+
+def positions_report(pnl):
+    return pd.DataFrame(
+        {"realized_pnl": [f"{pnl} USD"], "commissions": [["0.22 USD", "0.22 USD"]], "closing_order_id": [None]},
+        index=pd.Index(["P-1"], name="position_id"),
+    )
+
+
+def test_config_hash_depends_only_on_strategy_config(data):
+    assert config_hash(make_config(data, fast_period=8)) == config_hash(make_config(data, fast_period=8))
+    assert config_hash(make_config(data, fast_period=8)) != config_hash(make_config(data, fast_period=9))
+
+
+def test_runs_are_appended_and_queryable(tmp_path, data):
+    store = ResultsStore(tmp_path / "runs")
+    fast, slow = make_config(data, fast_period=8), make_config(data, fast_period=16)
+
+    for run_id, config, pnl in [("r1", fast, 1.5), ("r2", fast, -2.0), ("r3", slow, 3.0)]:
+        result = make_result(run_id, pnl)
+        store.append(config, result, {"positions": positions_report(pnl)}, flatten_stats(result))
+
+    index = store.index()
+    assert list(index["run_id"]) == ["r1", "r2", "r3"]
+    assert index["config_hash"].nunique() == 2
+
+    stats = store.load("stats", config_hash=config_hash(fast))
+    assert sorted(stats["USD PnL (total)"]) == [-2.0, 1.5]
+
+    positions = store.load("positions", run_ids=["r3"])
+    assert list(positions["position_id"]) == ["P-1"]
+    assert list(positions["commissions"]) == ["0.22 USD, 0.22 USD"]
+    assert positions["closing_order_id"].isna().all()
@@ -0,0 +1,70 @@
+# tests/test_screener.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from nautilus_trader.indicators import MovingAverageConvergenceDivergence
+from nautilus_trader.model.enums import PriceType
+from nautilus_trader.persistence.catalog import ParquetDataCatalog
+from nautilus_trader.persistence.wranglers import QuoteTickDataWrangler
+from nautilus_trader.test_kit.providers import TestInstrumentProvider
+
+from backtests.screener import MACDScreener, load_quotes
+
+
+@pytest.fixture
+def instrument():
+    return TestInstrumentProvider.default_fx_ccy("EUR/USD")
+
+
+@pytest.fixture
+def ticks(instrument):
+    rng = np.random.default_rng(7)
+    mid = 1.12 + np.round(np.cumsum(rng.normal(0, 0.00003, 3000)), 5)
+    df = pd.DataFrame(
+        {"bid_price": mid - 0.00001, "ask_price": mid + 0.00001, "size": 1_000_000.0},
+        index=pd.date_range("2020-01-01", periods=len(mid), freq="1s", tz="UTC"),
+    )
+    return QuoteTickDataWrangler(instrument).process(df)
+
+
+@pytest.fixture
+def catalog_path(tmp_path, instrument, ticks):
+    catalog = ParquetDataCatalog(tmp_path)
+    catalog.write_data([instrument])
+    catalog.write_data(ticks)
+    return tmp_path
+
+
+def event_driven_crossovers(ticks, fast_period, slow_period):
+    # Same sequence as MACDStrategy.on_quote_tick -> check_signals
+    macd = MovingAverageConvergenceDivergence(fast_period=fast_period, slow_period=slow_period, price_type=PriceType.MID)
+    last_above = None
+    signals = []
+    for tick in ticks:
+        macd.handle_quote_tick(tick)
+        if not macd.initialized:
+            continue
+        above = macd.value > 0
+        if last_above is not None and above != last_above:
+            signals.append((tick.ts_init, 1 if above else -1))
+        last_above = above
+    return signals
+
+
+@pytest.mark.parametrize("fast_period, slow_period", [(3, 5), (12, 26), (20, 21)])
+def test_crossovers_match_indicator(catalog_path, instrument, ticks, fast_period, slow_period):
+    quotes = load_quotes(catalog_path, instrument.id)
+    signals = MACDScreener(quotes).signals(fast_period, slow_period)
+
+    expected = event_driven_crossovers(ticks, fast_period, slow_period)
+    assert len(expected) > 0
+    assert list(zip(signals["ts_init"], signals["direction"])) == expected
+
+
+def test_positions_alternate_between_first_direction_and_flat(catalog_path, instrument):
+    signals = MACDScreener(load_quotes(catalog_path, instrument.id)).signals(12, 26)
+
+    first = signals["direction"].iloc[0]
+    assert (signals["side"].iloc[::2] == first).all()
+    assert (signals["side"].iloc[1::2] == -first).all()
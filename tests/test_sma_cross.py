@@ -1,12 +1,15 @@
 # tests/test_sma_cross.py
+import numpy as np
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 
 from nautilus_trader.model.data import Bar, BarType
-from nautilus_trader.model.enums import AggregationSource, BarAggregation, OrderSide, PriceType
-from nautilus_trader.model.identifiers import InstrumentId, Symbol, Venue
+from nautilus_trader.model.enums import OrderSide
+from nautilus_trader.model.identifiers import InstrumentId, Symbol, TraderId, Venue
 from nautilus_trader.model.objects import Price, Quantity
-from nautilus_trader.core.nautilus_pyo3.indicators import SimpleMovingAverage
+from nautilus_trader.common.component import MessageBus, TestClock
+from nautilus_trader.portfolio.portfolio import Portfolio
+from nautilus_trader.test_kit.stubs.component import TestComponentStubs
 from strategies.sma_cross import SMACross
 
 
@@ -17,7 +20,23 @@ def instrument_id():
 
 @pytest.fixture
 def bar_type(instrument_id):
-    return BarType.from_str(f"{instrument_id}-1-MINUTE[LAST]-EXTERNAL")
+    return BarType.from_str(f"{instrument_id}-1-MINUTE-LAST-EXTERNAL")
+
+
+def register(strategy):
+    # Настоящие компоненты: order_factory создаётся при регистрации
+    clock = TestClock()
+    trader_id = TraderId("TESTER-001")
+    msgbus = MessageBus(trader_id, clock)
+    cache = TestComponentStubs.cache()
+    strategy.register(trader_id, Portfolio(msgbus, cache, clock), msgbus, cache, clock)
+
+
+def make_bars(bar_type, closes):
+    return [
+        Bar(bar_type, Price(c, 2), Price(c, 2), Price(c, 2), Price(c, 2), Quantity(100, 0), i, i)
+        for i, c in enumerate(closes)
+    ]
 
 
 def test_sma_cross_submits_buy_order_on_cross_above(bar_type):
@@ -25,23 +44,16 @@ def test_sma_cross_submits_buy_order_on_cross_above(bar_type):
     strategy = SMACross(bar_type=bar_type, fast_period=2, slow_period=3)
     
     # Подменяем зависимости (изолируем стратегию)
-    strategy.register_base(
-        trader_id=Mock(),
-        portfolio=Mock(),
-        msgbus=Mock(),
-        cache=Mock(),
-        risk_engine=Mock(),
-        log=Mock(),
-    )
+    register(strategy)
     strategy.submit_order = Mock()  # Перехватываем вызовы отправки ордера
 
     # Подготовим бары так, чтобы произошёл сигнал BUY
     # Нужно: fast_sma > slow_sma после инициализации
     bars = [
-        Bar(bar_type, Price(1.00, 2), Price(1.00, 2), Price(1.00, 2), Price(1.00, 2), Quantity(100), 0, 0),
-        Bar(bar_type, Price(1.01, 2), Price(1.01, 2), Price(1.01, 2), Price(1.01, 2), Quantity(100), 0, 0),
-        Bar(bar_type, Price(1.02, 2), Price(1.02, 2), Price(1.02, 2), Price(1.02, 2), Quantity(100), 0, 0),
-        Bar(bar_type, Price(1.03, 2), Price(1.03, 2), Price(1.03, 2), Price(1.03, 2), Quantity(100), 0, 0),
+        Bar(bar_type, Price(1.00, 2), Price(1.00, 2), Price(1.00, 2), Price(1.00, 2), Quantity(100, 0), 0, 0),
+        Bar(bar_type, Price(1.01, 2), Price(1.01, 2), Price(1.01, 2), Price(1.01, 2), Quantity(100, 0), 0, 0),
+        Bar(bar_type, Price(1.02, 2), Price(1.02, 2), Price(1.02, 2), Price(1.02, 2), Quantity(100, 0), 0, 0),
+        Bar(bar_type, Price(1.03, 2), Price(1.03, 2), Price(1.03, 2), Price(1.03, 2), Quantity(100, 0), 0, 0),
     ]
 
     # Act
@@ -60,20 +72,13 @@ def test_sma_cross_submits_buy_order_on_cross_above(bar_type):
 def test_sma_cross_does_not_trade_before_indicator_ready(bar_type):
     # Arrange
     strategy = SMACross(bar_type=bar_type, fast_period=2, slow_period=3)
-    strategy.register_base(
-        trader_id=Mock(),
-        portfolio=Mock(),
-        msgbus=Mock(),
-        cache=Mock(),
-        risk_engine=Mock(),
-        log=Mock(),
-    )
+    register(strategy)
     strategy.submit_order = Mock()
 
     # Подадим только 2 бара — индикаторы ещё не готовы
     bars = [
-        Bar(bar_type, Price(1.00, 2), Price(1.00, 2), Price(1.00, 2), Price(1.00, 2), Quantity(100), 0, 0),
-        Bar(bar_type, Price(1.01, 2), Price(1.01, 2), Price(1.01, 2), Price(1.01, 2), Quantity(100), 0, 0),
+        Bar(bar_type, Price(1.00, 2), Price(1.00, 2), Price(1.00, 2), Price(1.00, 2), Quantity(100, 0), 0, 0),
+        Bar(bar_type, Price(1.01, 2), Price(1.01, 2), Price(1.01, 2), Price(1.01, 2), Quantity(100, 0), 0, 0),
     ]
 
     # Act
@@ -81,4 +86,56 @@ def test_sma_cross_does_not_trade_before_indicator_ready(bar_type):
         strategy.on_bar(bar)
 
     # Assert
-    strategy.submit_order.assert_not_called()
\ No newline at end of file
+    strategy.submit_order.assert_not_called()
+
+
+def test_warm_up_matches_bar_by_bar_updates(bar_type):
+    closes = [1.00, 1.03, 1.01, 1.05, 1.02, 1.04, 1.00, 0.99]
+    stepped = SMACross(bar_type=bar_type, fast_period=2, slow_period=3)
+    register(stepped)
+    stepped.submit_order = Mock()
+    for bar in make_bars(bar_type, closes):
+        stepped.on_bar(bar)
+
+    warmed = SMACross(bar_type=bar_type, fast_period=2, slow_period=3)
+    warmed.warm_up(np.array(closes))
+
+    assert warmed.initialized
+    assert warmed.fast_value == pytest.approx(stepped.fast_value)
+    assert warmed.slow_value == pytest.approx(stepped.slow_value)
+    assert warmed.fast_value == pytest.approx((1.00 + 0.99) / 2)
+    # Бары тоже принимаются
+    from_bars = SMACross(bar_type=bar_type, fast_period=2, slow_period=3)
+    from_bars.warm_up(make_bars(bar_type, closes))
+    assert from_bars.slow_value == pytest.approx(stepped.slow_value)
+
+
+def test_warmed_strategy_trades_on_first_live_bar(bar_type):
+    strategy = SMACross(bar_type=bar_type, fast_period=2, slow_period=3)
+    register(strategy)
+    strategy.submit_order = Mock()
+    strategy.warm_up([1.00, 1.01, 1.02])
+
+    # fast = (1.02 + 1.03)/2 > slow = (1.01 + 1.02 + 1.03)/3
+    strategy.on_bar(make_bars(bar_type, [1.03])[0])
+    # Продолжение роста — позиция уже открыта, новых ордеров нет
+    strategy.on_bar(make_bars(bar_type, [1.04])[0])
+    # Падение — fast < slow → SELL
+    strategy.on_bar(make_bars(bar_type, [0.90])[0])
+
+    sides = [call[0][0].side for call in strategy.submit_order.call_args_list]
+    assert sides == [OrderSide.BUY, OrderSide.SELL]
+    assert strategy.submit_order.call_args[0][0].quantity == Quantity.from_int(100)
+
+
+def test_partial_warm_up_needs_more_bars(bar_type):
+    strategy = SMACross(bar_type=bar_type, fast_period=2, slow_period=3)
+    register(strategy)
+    strategy.submit_order = Mock()
+    strategy.warm_up([1.00, 1.01])
+    assert not strategy.initialized
+
+    strategy.on_bar(make_bars(bar_type, [1.02])[0])
+    assert strategy.initialized
+    assert strategy.slow_value == pytest.approx(1.01)
+    strategy.submit_order.assert_called_once()
@@ -0,0 +1,112 @@
+# tests/test_streaming.py
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+from msgspec import structs
+
+from nautilus_trader.config import LoggingConfig
+from nautilus_trader.persistence.wranglers import QuoteTickDataWrangler
+from nautilus_trader.test_kit.providers import TestInstrumentProvider
+
+from analytics.metrics import parse_money
+from analytics.results import ResultsStore, normalize_report
+from backtests.cache import run_cached
+from backtests.streaming import StreamingNode, read_stream, run_streaming, stream_summary, streaming_config
+from catalog.tickcache import TickCacheNode
+from configs.backtest import get_backtest_config
+from configs.parquet_data import ParquetConfig
+
+
+@pytest.fixture
+def eurusd():
+    return TestInstrumentProvider.default_fx_ccy("EUR/USD")
+
+
+@pytest.fixture
+def config(tmp_path, eurusd):
+    rng = np.random.default_rng(0)
+    mid = 1.2 + np.round(np.cumsum(rng.normal(0, 0.00003, 6000)), 5)
+    df = pd.DataFrame(
+        {"bid_price": mid - 0.00001, "ask_price": mid + 0.00001, "size": 1_000_000.0},
+        index=pd.date_range("2020-01-01", periods=len(mid), freq="1s", tz="UTC"),
+    )
+    data = ParquetConfig(tmp_path, "data")
+    data.catalog.write_data([eurusd])
+    data.catalog.write_data(QuoteTickDataWrangler(eurusd).process(df))
+    config = get_backtest_config(
+        data,
+        ParquetConfig(tmp_path, "runs"),
+        strategy_config={"fast_period": 5, "slow_period": 12},
+        instrument_id=eurusd.id,
+        end_time=None,
+        logging=LoggingConfig(log_level="ERROR"),
+        streaming=streaming_config(tmp_path / "runs", flush_interval_ms=60_000),
+    )
+    # Small batches: the cache is purged many times during the run
+    return structs.replace(config, chunk_size=500)
+
+
+def plain(config):
+    return structs.replace(config, engine=structs.replace(config.engine, streaming=None))
+
+
+def test_stream_holds_every_fill_and_closed_position(config):
+    node = TickCacheNode(configs=[plain(config)])
+    expected = node.run()[0]
+    node.dispose()
+
+    run = run_streaming(config)
+    (path,) = (Path(config.engine.streaming.catalog_path) / "backtest").iterdir()
+    streamed = read_stream(path)
+    fills, positions = run.reports["fills"], run.reports["positions"]
+
+    assert fills["event_id"].is_unique
+    # The engine's own counts only cover what was left after the last purge
+    assert len(run.reports["order_fills"]) == expected.total_orders > run.result.total_orders
+    pnl = parse_money(positions["realized_pnl"])
+    assert pnl.sum() == pytest.approx(expected.stats_pnls["USD"]["PnL (total)"])
+    # Every position of the netting account is opened and closed by one buy and one sell
+    assert len(positions) > 0
+    assert len(positions) == len(streamed["positions_opened"]) - (len(fills) % 2)
+    assert run.stats["total_pnl"] == pytest.approx(pnl.sum())
+
+    summary = stream_summary(streamed)
+    assert summary["fills"] == len(fills)
+    assert summary["closed_positions"] == len(positions)
+    assert summary["balance"] == pytest.approx(float(run.reports["account"]["total"].iloc[-1]))
+
+
+def test_streamed_and_regular_runs_share_the_results_store(tmp_path, config):
+    store = ResultsStore(tmp_path / "store")
+    regular = run_cached(plain(config), None)
+    streamed = run_streaming(config)
+    ids = [store.append(config, run.result, run.reports, run.stats) for run in (regular, streamed)]
+
+    for name in ("positions", "fills", "order_fills", "account"):
+        assert set(store.load(name)["run_id"]) == set(ids)
+        schemas = [pa.Schema.from_pandas(normalize_report(run.reports[name]), preserve_index=False) for run in (regular, streamed)]
+        assert schemas[0].equals(schemas[1], check_metadata=False)
+    pnl = store.load("positions").groupby("run_id")["realized_pnl"].apply(lambda v: parse_money(v).sum())
+    assert pnl[ids[0]] == pytest.approx(pnl[ids[1]])
+
+
+def test_engine_cache_is_purged_between_batches(config):
+    class Recorder(StreamingNode):
+        cached = []
+
+        def on_batch(self, run_config_id, engine):
+            super().on_batch(run_config_id, engine)
+            self.cached.append(len(engine.cache.orders()))
+
+    node = Recorder(configs=[config])
+    node.run()
+    path = node.stream_paths[config.id]
+    node.dispose()
+
+    assert len(node.cached) > 5
+    # At most the open position's order is left after a purge
+    assert max(node.cached) <= 1
+    assert len(read_stream(path)["fills"]) > 100
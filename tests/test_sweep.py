@@ -0,0 +1,53 @@
+# tests/test_sweep.py
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from nautilus_trader.backtest.node import BacktestNode
+
+from backtests.sweep import CachedDataNode, grid, latin_hypercube, random_sample, valid_periods
+
+
+def test_grid_is_cartesian_product():
+    points = grid({"fast_period": [8, 12], "slow_period": [20, 26, 32]})
+
+    assert len(points) == 6
+    assert {"fast_period": 12, "slow_period": 32} in points
+
+
+def test_latin_hypercube_hits_every_stratum_once():
+    points = latin_hypercube({"fast_period": (0, 9), "slow_period": (10, 109)}, n=10, seed=1)
+
+    # 10 strata over 10 values -> each value exactly once
+    assert sorted(p["fast_period"] for p in points) == list(range(10))
+    # 10 strata of width 10 -> one point per decade
+    assert sorted(p["slow_period"] // 10 for p in points) == list(range(1, 11))
+
+
+def test_random_sample_stays_in_bounds():
+    points = random_sample({"trade_size": (1000, 2000)}, n=100, seed=0)
+
+    assert all(1000 <= p["trade_size"] <= 2000 for p in points)
+
+
+def test_points_with_fast_not_below_slow_are_rejected():
+    assert valid_periods({"fast_period": 12, "slow_period": 26})
+    assert not valid_periods({"fast_period": 26, "slow_period": 26})
+    assert valid_periods({"trade_size": 5000})
+
+
+def test_data_cache_drops_the_least_recently_used_slice(monkeypatch):
+    loads = []
+    def load(cls, config, start=None, end=None):
+        loads.append(config.json())
+        return config.json()
+
+    monkeypatch.setattr(BacktestNode, "load_data_config", classmethod(load))
+    monkeypatch.setattr(CachedDataNode, "_data_cache", OrderedDict())
+    monkeypatch.setattr(CachedDataNode, "max_cached", 2)
+
+    for name in ["a", "b", "a", "c", "a", "b"]:
+        assert CachedDataNode.load_data_config(SimpleNamespace(json=lambda name=name: name)) == name
+
+    # "b" was the least recently used slice when "c" came in
+    assert loads == ["a", "b", "c", "b"]
+    assert list(CachedDataNode._data_cache) == [("a", None, None), ("b", None, None)]
@@ -0,0 +1,132 @@
+# tests/test_tickcache.py
+import numpy as np
+import pandas as pd
+import pytest
+from msgspec import structs
+
+from nautilus_trader.backtest.node import BacktestNode
+from nautilus_trader.config import LoggingConfig
+from nautilus_trader.model import QuoteTick
+from nautilus_trader.persistence.wranglers import QuoteTickDataWrangler
+from nautilus_trader.test_kit.providers import TestInstrumentProvider
+
+from catalog.tickcache import TickCache, TickCacheNode, build_tick_cache, stream_batches
+from configs.backtest import get_backtest_config
+from configs.parquet_data import ParquetConfig
+
+
+def quotes(instrument, start, periods, freq="1s", seed=0):
+    rng = np.random.default_rng(seed)
+    mid = 1.2 + np.round(np.cumsum(rng.normal(0, 0.00003, periods)), 5)
+    df = pd.DataFrame(
+        {"bid_price": mid - 0.00001, "ask_price": mid + 0.00001, "size": 1_000_000.0},
+        index=pd.date_range(start, periods=periods, freq=freq, tz="UTC"),
+    )
+    return QuoteTickDataWrangler(instrument).process(df)
+
+
+def fields(ticks):
+    # Ticks decoded by the catalog and by the Cython constructor don't share
+    # the Rust string interner, so compare values rather than objects
+    return [
+        (str(t.instrument_id), str(t.bid_price), str(t.ask_price), str(t.bid_size), str(t.ask_size), t.ts_event, t.ts_init)
+        for t in ticks
+    ]
+
+
+@pytest.fixture
+def eurusd():
+    return TestInstrumentProvider.default_fx_ccy("EUR/USD")
+
+
+@pytest.fixture
+def data(tmp_path, eurusd):
+    data = ParquetConfig(tmp_path, "data")
+    data.catalog.write_data([eurusd])
+    data.catalog.write_data(quotes(eurusd, "2020-01-01", 3000))
+    data.catalog.write_data(quotes(eurusd, "2020-01-01 01:00", 3000, seed=1))
+    return data
+
+
+def test_cache_round_trips_catalog_ticks(data, eurusd):
+    cache = TickCache(build_tick_cache(data.path, eurusd.id))
+
+    assert cache.rows == 6000
+    assert fields(cache.ticks(0, cache.rows)) == fields(data.catalog.query(QuoteTick, identifiers=[str(eurusd.id)]))
+
+
+def test_cache_is_rebuilt_when_catalog_changes(data, eurusd):
+    path = build_tick_cache(data.path, eurusd.id)
+    assert build_tick_cache(data.path, eurusd.id) == path
+    mtime = (path / "meta.json").stat().st_mtime_ns
+
+    data.catalog.write_data(quotes(eurusd, "2020-01-02", 100, seed=2))
+    cache = TickCache(build_tick_cache(data.path, eurusd.id))
+
+    assert cache.rows == 6100
+    assert (cache.path / "meta.json").stat().st_mtime_ns != mtime
+
+
+def test_batches_are_bounded_and_time_ordered(data, eurusd):
+    gbpusd = TestInstrumentProvider.default_fx_ccy("GBP/USD")
+    data.catalog.write_data([gbpusd])
+    data.catalog.write_data(quotes(gbpusd, "2020-01-01 00:00:00.500", 4000, freq="700ms"))
+    caches = [TickCache(build_tick_cache(data.path, i.id)) for i in (eurusd, gbpusd)]
+
+    start, end = "2020-01-01 00:10:00+00:00", "2020-01-01 01:20:00+00:00"
+    batches = list(stream_batches(caches, start, end, batch_size=500))
+    ticks = [t for batch in batches for t in batch]
+
+    assert all(len(batch) <= 2 * 500 for batch in batches)
+    assert max(max(t.ts_init for t in b) for b in batches[:-1]) <= min(t.ts_init for t in batches[-1])
+    for prev, nxt in zip(batches, batches[1:]):
+        assert max(t.ts_init for t in prev) < min(t.ts_init for t in nxt)
+    expected = data.catalog.query(QuoteTick, identifiers=[str(eurusd.id), str(gbpusd.id)], start=start, end=end)
+    assert sorted(fields(ticks), key=lambda f: (f[-1], f[0])) == sorted(fields(expected), key=lambda f: (f[-1], f[0]))
+
+
+def test_node_results_match_catalog_node(data, eurusd):
+    config = get_backtest_config(
+        data,
+        data,
+        strategy_config={"fast_period": 8, "slow_period": 21},
+        instrument_id=eurusd.id,
+        start_time="2020-01-01T00:20:00+00:00",
+        end_time=None,
+        logging=LoggingConfig(log_level="ERROR"),
+    )
+    results = []
+    for node_cls in (BacktestNode, TickCacheNode):
+        node = node_cls(configs=[config])
+        results.append(node.run()[0])
+        node.dispose()
+
+    assert results[0].iterations == results[1].iterations > 0
+    assert results[0].total_orders == results[1].total_orders > 0
+    assert results[0].stats_pnls == results[1].stats_pnls
+
+
+def test_node_merges_the_ticks_of_every_data_config(data, eurusd):
+    gbpusd = TestInstrumentProvider.default_fx_ccy("GBP/USD")
+    data.catalog.write_data([gbpusd])
+    data.catalog.write_data(quotes(gbpusd, "2020-01-01 00:00:00.500", 4000, freq="700ms"))
+    config = get_backtest_config(
+        data, data, instrument_id=eurusd.id, end_time=None, logging=LoggingConfig(log_level="ERROR")
+    )
+    config = structs.replace(
+        config, data=[config.data[0], structs.replace(config.data[0], instrument_id=gbpusd.id)], chunk_size=500
+    )
+
+    class Recorder(TickCacheNode):
+        clock = []
+
+        def on_batch(self, run_config_id, engine):
+            self.clock.append(engine.kernel.clock.timestamp_ns())
+
+    node = Recorder(configs=[config])
+    result = node.run()[0]
+    node.dispose()
+
+    assert result.iterations == 6000 + 4000
+    assert len(node.clock) > 10
+    assert node.clock == sorted(node.clock)
@@ -0,0 +1,58 @@
+# tests/test_walkforward.py
+import pandas as pd
+import pytest
+
+from backtests.walkforward import stitch_equity, walk_forward_windows
+
+DAY = pd.Timedelta("1D").value
+START = pd.Timestamp("2020-01-01", tz="UTC").value
+
+
+def test_rolling_windows_tile_the_test_range():
+    windows = walk_forward_windows(START, START + 5 * DAY, pd.Timedelta("2D"), pd.Timedelta("1D"))
+
+    # No window is left to test on `end` alone
+    assert len(windows) == 3
+    assert windows[0].train_start == START
+    assert windows[0].train_end == START + 2 * DAY - 1
+    assert windows[0].test_start == START + 2 * DAY
+    # Test windows neither overlap nor leave gaps
+    for prev, nxt in zip(windows, windows[1:]):
+        assert nxt.test_start == prev.test_end + 1
+        assert nxt.train_start == prev.train_start + DAY
+    assert windows[-1].test_end == START + 5 * DAY
+
+
+def test_anchored_windows_expand_from_start():
+    windows = walk_forward_windows(START, START + 6 * DAY, pd.Timedelta("2D"), pd.Timedelta("2D"), anchored=True)
+
+    assert [w.train_start for w in windows] == [START] * len(windows)
+    assert [w.test_start - START for w in windows] == [2 * DAY, 4 * DAY]
+    assert windows[-1].test_end == START + 6 * DAY
+
+
+def test_every_test_window_starts_before_end():
+    windows = walk_forward_windows(START, START + 5 * DAY + 1, pd.Timedelta("2D"), pd.Timedelta("1D"))
+
+    assert [w.test_start - START for w in windows] == [2 * DAY, 3 * DAY, 4 * DAY, 5 * DAY]
+    assert all(w.test_start < w.test_end for w in windows)
+    assert walk_forward_windows(START, START + 2 * DAY, pd.Timedelta("2D"), pd.Timedelta("1D")) == []
+
+
+def test_windows_reject_non_positive_lengths():
+    with pytest.raises(ValueError):
+        walk_forward_windows(START, START + DAY, pd.Timedelta(0), pd.Timedelta("1h"))
+
+
+def test_stitched_equity_chains_windows():
+    closed = pd.to_datetime(["2020-01-03 12:00", "2020-01-04 12:00", "2020-01-03 18:00"], utc=True)
+    positions = pd.DataFrame({
+        "realized_pnl": ["10.00 USD", "-4.00 USD", "5.00 USD"],
+        "ts_closed": closed,
+        "window": [0, 1, 0],
+    })
+
+    curve = stitch_equity(positions, 1000.0)
+
+    assert curve["equity"].tolist() == [1010.0, 1015.0, 1011.0]
+    assert curve["window"].tolist() == [0, 0, 1]